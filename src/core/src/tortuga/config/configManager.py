@@ -15,7 +15,9 @@
 import os
 import shlex
 import socket
-from typing import Union
+import threading
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple, Union
 
 from tortuga.objects.provisioningInfo import ProvisioningInfo
 
@@ -62,6 +64,23 @@ DEFAULT_TORTUGA_RELATIVE_KICKSTARTS_DIR = os.path.join(
     DEFAULT_TORTUGA_WWW_INTERNAL, 'kickstarts')
 DEFAULT_TORTUGA_ACTION_LOG = '/var/action-log'
 
+# Number of seconds events are kept in the event store
+DEFAULT_TORTUGA_EVENT_RETENTION = 7 * 24 * 60 * 60
+
+# Number of seconds a cluster update waits for further update requests,
+# and the maximum number of seconds a requested update may be deferred
+DEFAULT_TORTUGA_CLUSTER_UPDATE_DEBOUNCE = 5
+DEFAULT_TORTUGA_CLUSTER_UPDATE_MAX_DELAY = 60
+
+# Maximum number of connections to the web service kept open per host
+# by each process
+DEFAULT_TORTUGA_WSAPI_POOL_SIZE = 10
+
+# Maximum number of add host status requests waiting for new messages at
+# the same time in each web service process; further requests return
+# immediately
+DEFAULT_TORTUGA_ADDHOST_STATUS_WAITERS = 4
+
 DEFAULT_TORTUGA_PROFILE_NII_FILE = '/etc/profile.nii'
 DEFAULT_TORTUGA_RELEASE_FILE = os.path.join(
     DEFAULT_TORTUGA_ETC, 'tortuga-release')
@@ -71,6 +90,21 @@ DEFAULT_PROVISIONING_INFO = None
 # The most amount of data we will read when parsing provisioning info object
 MAX_PROVINFO_LENGTH = 50000
 
+# Files affecting host name resolution by getfqdn()
+HOST_NAME_FILES = ('/etc/hostname', '/etc/hosts', '/etc/resolv.conf')
+
+# Environment variables read by ConfigManager
+CONFIG_ENV_VARIABLES = (
+    'TORTUGA_ROOT', 'TORTUGA_REPO_CONFIG_FILE', 'TORTUGA_EVENT_RETENTION',
+    'TORTUGA_CLUSTER_UPDATE_DEBOUNCE', 'TORTUGA_CLUSTER_UPDATE_MAX_DELAY',
+    'TORTUGA_WSAPI_POOL_SIZE', 'TORTUGA_ADDHOST_STATUS_WAITERS',
+)
+
+# Process-wide configuration snapshot shared by all ConfigManager instances
+_config_snapshot: Optional[Mapping] = None
+_config_snapshot_key: Optional[Tuple] = None
+_config_snapshot_lock = threading.Lock()
+
 
 def get_default_dns_suffix() -> Union[str, None]:
     if not os.path.exists('/etc/resolv.conf'):
@@ -120,6 +154,66 @@ def lookup_ipaddress(fqdn: str) -> str:
     return aiInfo[0][4][0]
 
 
+def _get_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _get_config_snapshot_key() -> Tuple:
+    """
+    Return tuple identifying the state of all inputs to the configuration
+    snapshot. The snapshot is rebuilt whenever this changes.
+    """
+
+    files = (
+        DEFAULT_TORTUGA_PROFILE_NII_FILE,
+        DEFAULT_TORTUGA_DB_PASSWORD_FILE,
+        DEFAULT_TORTUGA_RELEASE_FILE,
+        DEFAULT_TORTUGA_CFM_SECRET_FILE,
+    ) + HOST_NAME_FILES
+
+    return (
+        os.getuid(),
+        tuple(os.environ.get(name) for name in CONFIG_ENV_VARIABLES),
+        tuple((path, _get_mtime(path)) for path in files),
+    )
+
+
+def get_config_snapshot() -> Mapping:
+    """
+    Return read-only process-wide configuration snapshot. The snapshot is
+    built once and only rebuilt when the modification time of any of the
+    underlying files (or the relevant environment) changes.
+    """
+
+    # pylint: disable=global-statement
+    global _config_snapshot, _config_snapshot_key
+
+    key = _get_config_snapshot_key()
+
+    with _config_snapshot_lock:
+        if _config_snapshot is None or _config_snapshot_key != key:
+            _config_snapshot = MappingProxyType(
+                ConfigManager.load_config())
+
+            _config_snapshot_key = key
+
+        return _config_snapshot
+
+
+def invalidate_config_snapshot():
+    """
+    Force configuration snapshot to be rebuilt on next access
+    """
+
+    global _config_snapshot  # pylint: disable=global-statement
+
+    with _config_snapshot_lock:
+        _config_snapshot = None
+
+
 class ConfigManager(dict): \
         # pylint: disable=too-many-public-methods
     """
@@ -129,6 +223,10 @@ class ConfigManager(dict): \
         TORTUGA_ROOT
         TORTUGA_REPO_CONFIG_FILE
 
+    Instances are initialized from a process-wide snapshot (see
+    get_config_snapshot()); setters only affect the instance they are
+    called on.
+
     Usage:
         from tortuga.config.configManager import ConfigManager
         cm = ConfigManager()
@@ -176,12 +274,41 @@ class ConfigManager(dict): \
         self['defaultProvisioningInfo'] = DEFAULT_PROVISIONING_INFO
         self['defaultKitConfigBase'] = DEFAULT_TORTUGA_CONFIG_BASE
         self['defaultActionLog'] = DEFAULT_TORTUGA_ACTION_LOG
+        self['defaultEventRetention'] = DEFAULT_TORTUGA_EVENT_RETENTION
+        self['defaultClusterUpdateDebounce'] = \
+            DEFAULT_TORTUGA_CLUSTER_UPDATE_DEBOUNCE
+        self['defaultClusterUpdateMaxDelay'] = \
+            DEFAULT_TORTUGA_CLUSTER_UPDATE_MAX_DELAY
+        self['defaultWsApiPoolSize'] = DEFAULT_TORTUGA_WSAPI_POOL_SIZE
+        self['defaultAddHostStatusWaiters'] = \
+            DEFAULT_TORTUGA_ADDHOST_STATUS_WAITERS
 
     def __init_from_env(self):
         # Settings that might come from environment variables.
         self.__setFromEnvVariable('root', 'TORTUGA_ROOT')
         self.__setFromEnvVariable(
             'repoConfigFile', 'TORTUGA_REPO_CONFIG_FILE')
+        self.__setFromEnvVariable(
+            'eventRetention', 'TORTUGA_EVENT_RETENTION')
+        if self.get('eventRetention'):
+            self['eventRetention'] = int(self['eventRetention'])
+        self.__setFromEnvVariable(
+            'clusterUpdateDebounce', 'TORTUGA_CLUSTER_UPDATE_DEBOUNCE')
+        if self.get('clusterUpdateDebounce'):
+            self['clusterUpdateDebounce'] = \
+                float(self['clusterUpdateDebounce'])
+        self.__setFromEnvVariable(
+            'clusterUpdateMaxDelay', 'TORTUGA_CLUSTER_UPDATE_MAX_DELAY')
+        if self.get('clusterUpdateMaxDelay'):
+            self['clusterUpdateMaxDelay'] = \
+                float(self['clusterUpdateMaxDelay'])
+        self.__setFromEnvVariable('wsApiPoolSize', 'TORTUGA_WSAPI_POOL_SIZE')
+        if self.get('wsApiPoolSize'):
+            self['wsApiPoolSize'] = int(self['wsApiPoolSize'])
+        self.__setFromEnvVariable(
+            'addHostStatusWaiters', 'TORTUGA_ADDHOST_STATUS_WAITERS')
+        if self.get('addHostStatusWaiters'):
+            self['addHostStatusWaiters'] = int(self['addHostStatusWaiters'])
 
     def __init_from_provinfo(self):
         # Initialize the ProvisioningInfo structure
@@ -213,9 +340,29 @@ class ConfigManager(dict): \
         self.__setFromVarFile(
             'cfmPassword', DEFAULT_TORTUGA_CFM_SECRET_FILE)
 
-    def __init__(self):
+    def __init__(self, *, load: bool = True):
         super(ConfigManager, self).__init__()
 
+        if load:
+            self.update(get_config_snapshot())
+
+    @classmethod
+    def load_config(cls) -> dict:
+        """
+        Read configuration from the environment, provisioning information
+        and variable files.
+
+        This is expensive; use ConfigManager() to get an instance
+        initialized from the shared configuration snapshot instead.
+        """
+
+        cm = cls(load=False)
+
+        cm.__load()
+
+        return dict(cm)
+
+    def __load(self):
         self.__init_system_user()
 
         self.__init_defaults()
@@ -538,6 +685,89 @@ class ConfigManager(dict): \
         """ Set internal webservice port. """
         self['intWebservicePort'] = intWebservicePort
 
+    def setEventRetention(self, eventRetention: int):
+        """
+        Set the number of seconds events are kept in the event store.
+
+        :param int eventRetention: the retention period, in seconds, or 0
+                                   to keep events indefinitely
+
+        """
+        self['eventRetention'] = eventRetention
+
+    def getEventRetention(self, default: str = '__internal__') -> int:
+        """
+        Get the number of seconds events are kept in the event store
+
+        """
+        return self.__getKeyValue('eventRetention', default)
+
+    def setClusterUpdateDebounce(self, clusterUpdateDebounce: float):
+        """
+        Set the number of seconds a scheduled cluster update waits for
+        further update requests before it runs.
+
+        """
+        self['clusterUpdateDebounce'] = clusterUpdateDebounce
+
+    def getClusterUpdateDebounce(self, default: str = '__internal__') \
+            -> float:
+        """
+        Get the number of seconds a scheduled cluster update waits for
+        further update requests before it runs
+
+        """
+        return self.__getKeyValue('clusterUpdateDebounce', default)
+
+    def setClusterUpdateMaxDelay(self, clusterUpdateMaxDelay: float):
+        """
+        Set the maximum number of seconds a requested cluster update may
+        be deferred by further update requests.
+
+        """
+        self['clusterUpdateMaxDelay'] = clusterUpdateMaxDelay
+
+    def getClusterUpdateMaxDelay(self, default: str = '__internal__') \
+            -> float:
+        """
+        Get the maximum number of seconds a requested cluster update may
+        be deferred by further update requests
+
+        """
+        return self.__getKeyValue('clusterUpdateMaxDelay', default)
+
+    def setWsApiPoolSize(self, wsApiPoolSize: int):
+        """
+        Set the maximum number of connections to the web service kept
+        open per host by each process.
+
+        """
+        self['wsApiPoolSize'] = wsApiPoolSize
+
+    def getWsApiPoolSize(self, default: str = '__internal__') -> int:
+        """
+        Get the maximum number of connections to the web service kept
+        open per host by each process
+
+        """
+        return self.__getKeyValue('wsApiPoolSize', default)
+
+    def setAddHostStatusWaiters(self, addHostStatusWaiters: int):
+        """
+        Set the maximum number of add host status requests waiting for
+        new messages at the same time in each web service process.
+
+        """
+        self['addHostStatusWaiters'] = addHostStatusWaiters
+
+    def getAddHostStatusWaiters(self, default: str = '__internal__') -> int:
+        """
+        Get the maximum number of add host status requests waiting for
+        new messages at the same time in each web service process
+
+        """
+        return self.__getKeyValue('addHostStatusWaiters', default)
+
     def getIntWebServicePort(self, default='__internal__'):
         """
         Get internal webservice port.
@@ -15,7 +15,7 @@
 # pylint: disable=no-member
 
 import sys
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional
 
 from tortuga.cli.tortugaCli import TortugaCli
 from tortuga.cli.utils import FilterTagsAction
@@ -147,42 +147,26 @@ class GetNodeStatus(TortugaCli): \
                         baseurl=self.getUrl(),
                         verify=self._verify)
 
+        filters = self.__get_filters(options)
+
         nodes: List[Dict[str, Any]] = [
             dict(x)
             for x in api.getNodeList(nodespec=options.nodeName,
-                                     tags=options.tags)]
-
-        if not nodes:
-            if options.nodeName:
-                print('No nodes matching nodespec [{}]\n'.format(
-                    options.nodeName))
+                                     tags=options.tags,
+                                     filters=filters)]
+
+        #
+        # Nodes excluded by the filters are not an error; only fail if the
+        # nodespec matches no nodes at all
+        #
+        if not nodes and options.nodeName and (
+                not filters or not api.getNodeList(
+                    nodespec=options.nodeName, tags=options.tags)):
+            print('No nodes matching nodespec [{}]\n'.format(
+                options.nodeName))
 
             sys.exit(1)
 
-        if options.bActiveNodesOnly:
-            nodes = self.__filter_nodes(nodes, 'isIdle', False)
-
-        if options.bIdleNodesOnly:
-            nodes = self.__filter_nodes(nodes, 'isIdle', True)
-
-        if options.bInstalled:
-            nodes = self.__filter_nodes(nodes, 'state', 'Installed')
-
-        if options.bNotInstalled:
-            nodes = self.__filter_nodes(nodes, 'state', 'Installed', True)
-
-        if options.state:
-            nodes = self.__filter_nodes(nodes, 'state', options.state)
-
-        if options.softwareProfile:
-            nodes = self.__filter_nodes(nodes, ['softwareprofile', 'name'], options.softwareProfile)
-
-        if options.hardwareProfile:
-            nodes = self.__filter_nodes(nodes, ['hardwareprofile', 'name'], options.hardwareProfile)
-
-        if not options.showAll:
-            nodes = self.__filter_nodes(nodes, 'state', 'Deleted', True)
-
         grouped: Dict[str, List[Dict[str, Any]]] = self.__group_nodes(nodes, options.bByHardwareProfile)
 
         if options.bShortOutput:
@@ -196,30 +180,45 @@ class GetNodeStatus(TortugaCli): \
             print(output)
 
     @staticmethod
-    def __filter_nodes(nodes: List[Dict[str, Any]], filter_key: Union[List[str], str], filter_value: Any,
-                       if_not: bool = False) -> List[Dict[str, Any]]:
+    def __get_filters(options) -> Dict[str, Any]:
         """
-        Filter from nodes list (list
-        is mutated, thus not returned).
+        Node filters, evaluated by the server, for the command-line
+        options.
 
-        :param nodes: List
-        :param filter_key: List or String
-        :param filter_value: Object
-        :param if_not: Boolean
-        :return: None
+        :param options: Namespace
+        :return: Dictionary
         """
-        filtered: list = []
+        filters: Dict[str, Any] = {}
+        excluded_states: List[str] = []
 
-        for node in nodes:
-            if type(filter_key) is str:
-                result: bool = node[filter_key] == filter_value
-            else:
-                result: bool = node[filter_key[0]][filter_key[1]] == filter_value
+        if options.bActiveNodesOnly:
+            filters['isIdle'] = False
+
+        if options.bIdleNodesOnly:
+            filters['isIdle'] = True
+
+        if options.bInstalled:
+            filters['state'] = 'Installed'
+
+        if options.bNotInstalled:
+            excluded_states.append('Installed')
+
+        if options.state:
+            filters['state'] = options.state
+
+        if options.softwareProfile:
+            filters['softwareprofile'] = options.softwareProfile
+
+        if options.hardwareProfile:
+            filters['hardwareprofile'] = options.hardwareProfile
+
+        if not options.showAll:
+            excluded_states.append('Deleted')
 
-            if not result == if_not:  # Switches based on `if_not`.
-                filtered.append(node)
+        if excluded_states:
+            filters['state__ne'] = excluded_states
 
-        return filtered
+        return filters
 
     @staticmethod
     def __group_nodes(nodes: List[Dict[str, Any]], by_hardware_profile: bool) -> Dict[str, List[Dict[str, Any]]]:
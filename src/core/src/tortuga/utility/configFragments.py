@@ -0,0 +1,246 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+import tempfile
+from typing import Callable, Dict, Iterable, Optional
+
+
+def write_file_atomic(path: str, content: str) -> bool:
+    """
+    Replace contents of 'path' with 'content', unless it already has
+    that content. The file is replaced atomically, so readers never see
+    a partially written file.
+
+    :return: True if the file was written, False if it was unchanged
+
+    """
+
+    try:
+        with open(path) as fp:
+            if fp.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+
+    dirname = os.path.dirname(path) or '.'
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=dirname, prefix='.{}.'.format(os.path.basename(path)))
+
+    try:
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(content)
+
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        else:
+            os.chmod(tmp_path, 0o644)
+
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+
+        raise
+
+    return True
+
+
+class ConfigFragments:
+    """
+    Configuration file including a directory of fragments, such as one
+    fragment per host.
+
+    The configuration file only contains an include directive per
+    fragment, so changing a fragment does not touch any other file, and
+    adding a fragment appends a single directive. The list of directives
+    is only rewritten when fragments are removed.
+
+    Fragments are only rewritten when their content changes, so callers
+    can use the return values to decide whether the service using the
+    file needs to be restarted.
+
+    :param fragment_dir:   directory containing the fragments
+    :param path:           the configuration file including the fragments
+    :param include_format: format of the include directive, with the
+                           path of the fragment as the only argument, for
+                           example 'include "{}";\\n'
+
+    """
+
+    _invalid_key_chars = re.compile(r'[^A-Za-z0-9_.:-]')
+
+    def __init__(self, fragment_dir: str, path: str, include_format: str):
+        self.fragment_dir = fragment_dir
+        self.path = path
+        self.include_format = include_format
+
+    def _get_fragment_name(self, key: str) -> str:
+        return self._invalid_key_chars.sub('_', key)
+
+    def _get_fragment_path(self, name: str) -> str:
+        return os.path.join(self.fragment_dir, name)
+
+    def _get_include(self, name: str) -> str:
+        return self.include_format.format(self._get_fragment_path(name))
+
+    def keys(self) -> Iterable[str]:
+        """
+        Return keys of all existing fragments
+
+        """
+
+        if not os.path.isdir(self.fragment_dir):
+            return []
+
+        return sorted(name for name in os.listdir(self.fragment_dir)
+                      if not name.startswith('.'))
+
+    def update(self, fragments: Dict[str, str],
+               remove: Optional[Iterable[str]] = None,
+               replace_all: bool = False) -> bool:
+        """
+        Write and remove fragments, and include them in the configuration
+        file.
+
+        :param fragments:   fragment content, keyed by fragment key
+        :param remove:      keys of fragments to remove
+        :param replace_all: remove all fragments not in 'fragments', and
+                            rewrite the include directives of all
+                            fragments
+
+        :return: True if any fragment was added, changed or removed
+
+        """
+
+        os.makedirs(self.fragment_dir, exist_ok=True)
+
+        changed = False
+
+        added = []
+
+        for key, content in fragments.items():
+            name = self._get_fragment_name(key)
+
+            fragment_path = self._get_fragment_path(name)
+
+            is_new = not os.path.exists(fragment_path)
+
+            if write_file_atomic(fragment_path, content):
+                changed = True
+
+                if is_new:
+                    added.append(name)
+
+        to_remove = {self._get_fragment_name(key) for key in remove or []}
+
+        if replace_all:
+            to_remove |= set(self.keys()) - {
+                self._get_fragment_name(key) for key in fragments}
+
+        to_remove = {
+            name for name in to_remove
+            if os.path.exists(self._get_fragment_path(name))
+        }
+
+        if replace_all or to_remove or not os.path.exists(self.path):
+            # Fragments are removed after their include directives, so
+            # the configuration file never includes a missing file
+            changed |= self.write_includes(exclude=to_remove)
+        elif added:
+            with open(self.path, 'a') as fp:
+                fp.write(''.join(self._get_include(name) for name in added))
+
+        for name in to_remove:
+            try:
+                os.unlink(self._get_fragment_path(name))
+            except FileNotFoundError:
+                pass
+
+            changed = True
+
+        return changed
+
+    def write_includes(self, exclude: Optional[Iterable[str]] = None) \
+            -> bool:
+        """
+        (Re)write the include directives of all fragments
+
+        :param exclude: names of fragments not to include
+
+        :return: True if the configuration file changed
+
+        """
+
+        exclude = set(exclude or [])
+
+        return write_file_atomic(self.path, ''.join(
+            self._get_include(name) for name in self.keys()
+            if name not in exclude))
+
+
+class PendingAction:
+    """
+    Marker file recording that an action, such as a service restart, is
+    outstanding. Used to defer the action until the end of a batch, even
+    if the batch spans several processes.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def set(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        with open(self.path, 'w'):
+            pass
+
+    def pop(self) -> bool:
+        """
+        Clear the marker
+
+        :return: True if the action was pending
+
+        """
+
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    def run(self, action: Callable[[], None]) -> bool:
+        """
+        Run 'action' if it is pending, and clear the marker. If the
+        action fails, the marker is set again, so that the action is
+        retried later.
+
+        :return: True if the action was run
+
+        """
+
+        if not self.pop():
+            return False
+
+        try:
+            action()
+        except Exception:
+            self.set()
+
+            raise
+
+        return True
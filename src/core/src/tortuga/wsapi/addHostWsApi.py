@@ -47,12 +47,14 @@ class AddHostWsApi(TortugaWsApi):
         except Exception as ex:
             raise TortugaException(exception=ex)
 
-    def getStatus(self, session=None, startMessage=0, getNodes=False):
+    def getStatus(self, session=None, startMessage=0, getNodes=False,
+                  wait=0):
         """
         Get the status of addhost...if session is non-none get info for that
         session only.  Startmessage controls the number of removed from
         the start of the server side message list.  If getNodes is true
-        also include the nodes for this session.
+        also include the nodes for this session.  If wait is non-zero,
+        the server waits up to that many seconds for new messages.
 
         Returns:
             AddHostStatus object
@@ -66,6 +68,9 @@ class AddHostWsApi(TortugaWsApi):
         url += '?startMessage={0}&getNodes={1}'.format(
             startMessage, str(getNodes))
 
+        if wait:
+            url += '&wait={}'.format(wait)
+
         try:
             responseDict = self.get(url)
 
@@ -13,16 +13,73 @@
 # limitations under the License.
 
 import json
+import logging
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
 from logging import getLogger
 from typing import Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from tortuga.config.configManager import ConfigManager
 
 
 logger = getLogger(__name__)
 
+#
+# HTTP adapter, and thereby connection pools, shared by all API clients
+# in this process
+#
+_adapter: Optional[HTTPAdapter] = None
+_adapter_pid: Optional[int] = None
+_adapter_lock = threading.Lock()
+
+
+def get_adapter() -> HTTPAdapter:
+    """
+    Returns the HTTP adapter shared by all API clients in this process.
+    Connections are kept alive and reused by subsequent requests. A new
+    adapter is created in forked child processes, so that connections are
+    never shared between processes.
+
+    """
+    global _adapter, _adapter_pid
+
+    with _adapter_lock:
+        if _adapter is None or _adapter_pid != os.getpid():
+            _adapter = HTTPAdapter(
+                pool_maxsize=ConfigManager().getWsApiPoolSize())
+            _adapter_pid = os.getpid()
+
+        return _adapter
+
+
+def new_session() -> requests.Session:
+    """
+    Returns a new HTTP session using the shared HTTP adapter. Cookies are
+    neither stored nor sent, so that the web service session of one API
+    client is never used by another.
+
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    adapter = get_adapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+def log_payload(label: str, data: Optional[Union[dict, list]]):
+    #
+    # Only serialize the payload when it is actually logged
+    #
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('{}: {}'.format(label, json.dumps(data)))
+
 
 class RequestError(Exception):
     """
@@ -55,7 +112,8 @@ class RestApiClient:
     def __init__(self, username: Optional[str] = None,
                  password: Optional[str] = None,
                  baseurl: Optional[str] = None,
-                 verify: bool = True):
+                 verify: bool = True,
+                 compress: bool = True):
 
         if baseurl.endswith('/'):
             baseurl = baseurl[:-1]
@@ -64,9 +122,13 @@ class RestApiClient:
         self.username = username
         self.password = password
         self.verify = verify
+        self.compress = compress
 
         self._requests_kwargs = None
 
+        self._session: Optional[requests.Session] = None
+        self._session_pid: Optional[int] = None
+
         if not verify:
             logger.warning('SSL verification turned off')
 
@@ -84,6 +146,13 @@ class RestApiClient:
                 'auth': (self.username, self.password)
             }
             #
+            # Compressed responses (decoded by requests)
+            #
+            self._requests_kwargs['headers'] = {
+                'Accept-Encoding':
+                    'gzip, deflate' if self.compress else 'identity',
+            }
+            #
             # SSL cert verification
             #
             if self.verify:
@@ -96,6 +165,17 @@ class RestApiClient:
 
         return self._requests_kwargs
 
+    @property
+    def session(self) -> requests.Session:
+        """
+        The HTTP session used for requests
+
+        """
+        if self._session is None or self._session_pid != os.getpid():
+            self._session, self._session_pid = new_session(), os.getpid()
+
+        return self._session
+
     def build_url(self, path: str) -> str:
         """
         Given a path, returns a fully qualified URL.
@@ -142,7 +222,7 @@ class RestApiClient:
         except Exception:
             pass
 
-        logger.debug('Response Payload: {}'.format(json.dumps(data)))
+        log_payload('Response Payload', data)
 
         return data
 
@@ -168,7 +248,7 @@ class RestApiClient:
         except Exception:
             pass
 
-        logger.debug('ERROR Payload: {}'.format(json.dumps(data)))
+        log_payload('ERROR Payload', data)
 
         raise RequestError(
             "ERROR: API Request Error {}".format(error_response.status_code),
@@ -189,7 +269,7 @@ class RestApiClient:
         url = self.build_url(path)
         logger.debug('GET: {}'.format(url))
 
-        result = requests.get(
+        result = self.session.get(
             url,
             **self.get_requests_kwargs()
         )
@@ -210,7 +290,7 @@ class RestApiClient:
         url = self.build_url(path)
         logger.debug('POST: {}'.format(url))
 
-        result = requests.post(
+        result = self.session.post(
             url,
             json=data,
             **self.get_requests_kwargs()
@@ -232,7 +312,7 @@ class RestApiClient:
         url = self.build_url(path)
         logger.debug('PUT: {}'.format(url))
 
-        result = requests.put(
+        result = self.session.put(
             url,
             json=data,
             **self.get_requests_kwargs()
@@ -252,7 +332,7 @@ class RestApiClient:
         url = self.build_url(path)
         logger.debug('DELETE: {}'.format(url))
 
-        result = requests.delete(
+        result = self.session.delete(
             url,
             **self.get_requests_kwargs()
         )
@@ -273,7 +353,7 @@ class RestApiClient:
         url = self.build_url(path)
         logger.debug('PATCH: {}'.format(url))
 
-        result = requests.patch(
+        result = self.session.patch(
             url,
             json=data,
             **self.get_requests_kwargs()
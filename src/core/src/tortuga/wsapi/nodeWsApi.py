@@ -17,7 +17,7 @@
 import urllib.error
 import urllib.parse
 import urllib.request
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import tortuga.objects.node
 import tortuga.objects.provisioningInfo
@@ -36,10 +36,16 @@ class NodeWsApi(TortugaWsApi):
 
     def getNodeList(self, nodespec: Optional[Union[str, None]] = None,
                     tags: Optional[Union[dict, None]] = None,
-                    addHostSession: Optional[Union[str, None]] = None):
+                    addHostSession: Optional[Union[str, None]] = None,
+                    filters: Optional[Dict[str, Any]] = None):
         """
         Get list of nodes
 
+        :param filters: node filters evaluated by the server, ie.
+                        {'state': 'Installed'} or
+                        {'state__ne': ['Deleted', 'Installed']}; see
+                        NodesDbHandler.build_node_filters()
+
             Returns:
                a list of nodes
             Throws:
@@ -48,25 +54,27 @@ class NodeWsApi(TortugaWsApi):
 
         url = 'nodes/'
 
+        params = []
+
         if nodespec:
-            url += '?name={}'.format(nodespec)
+            params.append(('name', nodespec))
 
         if addHostSession:
-            url += '?addHostSession={}'.format(addHostSession)
+            params.append(('addHostSession', addHostSession))
 
-        if tags:
-            params = []
+        for key, value in (tags or {}).items():
+            if value is None:
+                params.append(('tag', key))
+            else:
+                params.append(('tag', '{0}={1}'.format(key, value)))
 
-            for key, value in tags.items():
-                if value is None:
-                    params.append(urllib.parse.urlencode({'tag': key}))
-                else:
-                    params.append(
-                        urllib.parse.urlencode({'tag': '{0}={1}'.format(
-                            key, value)}))
+        for key, value in (filters or {}).items():
+            for item in value if isinstance(value, (list, tuple)) \
+                    else [value]:
+                params.append((key, str(item)))
 
-            if params:
-                url += '?' + '&'.join(params)
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
 
         try:
             responseDict = self.get(url)
@@ -229,6 +237,29 @@ class NodeWsApi(TortugaWsApi):
         except Exception as ex:
             raise TortugaException(exception=ex)
 
+    def updateNodesStatus(self, updates: List[dict]) -> dict:
+        """
+        Update the status of multiple nodes in a single request
+
+        :param updates: list of dicts containing the node 'name' and,
+                        optionally, 'state' and 'bootFrom'
+
+        :return: dict containing 'changed', a dict of node name to bool
+                 indicating whether the node changed, and 'notFound', a
+                 list of the names of nodes that were not found
+        """
+
+        url = 'node-status/'
+
+        try:
+            return self.put(url, {'nodes': updates})
+
+        except TortugaException:
+            raise
+
+        except Exception as ex:
+            raise TortugaException(exception=ex)
+
     def getProvisioningInfo(self, nodeName: str):
         """
         Get the provisioning information for a given provisioned address
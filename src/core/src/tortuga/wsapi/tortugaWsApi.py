@@ -37,7 +37,8 @@ class TortugaWsApi(RestApiClient):
     def __init__(self, username: Optional[str] = None,
                  password: Optional[str] = None,
                  baseurl: Optional[str] = None,
-                 verify: bool = True):
+                 verify: bool = True,
+                 compress: bool = True):
 
         self._cm = ConfigManager()
 
@@ -53,7 +54,7 @@ class TortugaWsApi(RestApiClient):
             username = self._cm.getCfmUser()
             password = self._cm.getCfmPassword()
 
-        super().__init__(username, password, baseurl, verify)
+        super().__init__(username, password, baseurl, verify, compress)
 
         self.baseurl = '{}/{}'.format(self.baseurl, WS_API_VERSION)
 
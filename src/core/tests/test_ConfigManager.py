@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import socket
 
+from tortuga.config import configManager
 from tortuga.config.configManager import ConfigManager, getfqdn
 
 
@@ -34,3 +36,33 @@ def test_getfqdn():
         assert fqdn == expected_fqdn
     else:
         assert fqdn.split('.', 1)[0] == expected_fqdn.split('.', 1)[0]
+
+
+def test_config_snapshot(monkeypatch, tmpdir):
+    release_file = tmpdir.join('tortuga-release')
+    release_file.write('Tortuga 1.0\n')
+
+    monkeypatch.setattr(configManager, 'DEFAULT_TORTUGA_RELEASE_FILE',
+                        str(release_file))
+
+    cm = ConfigManager()
+
+    assert cm.getTortugaRelease() == 'Tortuga 1.0'
+
+    # snapshot is shared while underlying files are unchanged
+    assert configManager.get_config_snapshot() is \
+        configManager.get_config_snapshot()
+
+    # setters only affect the instance
+    cm.setDepotDir('/tmp/depot')
+
+    assert ConfigManager().getDepotDir() != '/tmp/depot'
+
+    # modifying the file causes the snapshot to be rebuilt
+    release_file.write('Tortuga 2.0\n')
+
+    mtime = os.stat(str(release_file)).st_mtime
+
+    os.utime(str(release_file), (mtime + 10, mtime + 10))
+
+    assert ConfigManager().getTortugaRelease() == 'Tortuga 2.0'
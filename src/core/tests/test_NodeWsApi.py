@@ -12,10 +12,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
+from tortuga.wsapi import client
 from tortuga.wsapi.nodeWsApi import NodeWsApi
+from tortuga.wsapi.softwareProfileWsApi import SoftwareProfileWsApi
 
 
 def test_instantiation():
     obj = NodeWsApi()
 
     assert obj
+
+
+def test_shared_adapter(monkeypatch):
+    adapter = NodeWsApi().session.get_adapter('https://')
+
+    # Connections are shared by all clients in a process...
+    assert SoftwareProfileWsApi().session.get_adapter('https://') is adapter
+
+    # ...but not with forked processes
+    monkeypatch.setattr(client, '_adapter_pid', os.getpid() + 1)
+
+    assert NodeWsApi().session.get_adapter('https://') is not adapter
+
+
+def test_compression():
+    assert NodeWsApi().get_requests_kwargs()['headers'][
+        'Accept-Encoding'] == 'gzip, deflate'
+
+    assert NodeWsApi(compress=False).get_requests_kwargs()['headers'][
+        'Accept-Encoding'] == 'identity'
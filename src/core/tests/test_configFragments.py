@@ -0,0 +1,189 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import stat
+
+import pytest
+
+from tortuga.utility.configFragments import (ConfigFragments,
+                                             PendingAction,
+                                             write_file_atomic)
+
+
+def read(path):
+    with open(path) as fp:
+        return fp.read()
+
+
+def test_write_file_atomic(tmpdir):
+    path = str(tmpdir.join('file.conf'))
+
+    assert write_file_atomic(path, 'a\n')
+    assert read(path) == 'a\n'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+    # Unchanged content is not rewritten
+    mtime = os.stat(path).st_mtime_ns
+    assert not write_file_atomic(path, 'a\n')
+    assert os.stat(path).st_mtime_ns == mtime
+
+    # File mode is preserved, and no temporary files are left behind
+    os.chmod(path, 0o600)
+    assert write_file_atomic(path, 'b\n')
+    assert read(path) == 'b\n'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(str(tmpdir)) == ['file.conf']
+
+
+INCLUDE_FORMAT = 'include {}\n'
+
+
+def read_included(path):
+    """
+    Return the content of the fragments included by 'path'
+    """
+
+    content = ''
+
+    for line in read(path).splitlines():
+        assert line.startswith('include ')
+
+        content += read(line[len('include '):])
+
+    return content
+
+
+def test_config_fragments(tmpdir):
+    path = str(tmpdir.join('hosts.conf'))
+
+    fragments = ConfigFragments(
+        str(tmpdir.join('hosts.d')), path, INCLUDE_FORMAT)
+
+    # Add
+    assert fragments.update({'node-02': 'host 2\n', 'node-01': 'host 1\n'})
+    assert read_included(path) == 'host 1\nhost 2\n'
+    assert list(fragments.keys()) == ['node-01', 'node-02']
+
+    # Unchanged
+    assert not fragments.update({'node-01': 'host 1\n'})
+    assert not fragments.update({}, remove=['node-03'])
+
+    # Change and remove
+    assert fragments.update({'node-01': 'host 1a\n'}, remove=['node-02'])
+    assert read_included(path) == 'host 1a\n'
+    assert list(fragments.keys()) == ['node-01']
+
+    # Replace all
+    assert fragments.update(
+        {'node-03': 'host 3\n', 'node-04': 'host 4\n'}, replace_all=True)
+    assert read_included(path) == 'host 3\nhost 4\n'
+    assert list(fragments.keys()) == ['node-03', 'node-04']
+
+    assert not fragments.update(
+        {'node-03': 'host 3\n', 'node-04': 'host 4\n'}, replace_all=True)
+
+
+def test_config_fragments_incremental(tmpdir):
+    path = str(tmpdir.join('hosts.conf'))
+
+    fragments = ConfigFragments(
+        str(tmpdir.join('hosts.d')), path, INCLUDE_FORMAT)
+
+    fragments.update({'node-01': 'host 1\n', 'node-02': 'host 2\n'})
+
+    inode = os.stat(path).st_ino
+
+    # Adding a fragment appends its include directive
+    assert fragments.update({'node-03': 'host 3\n'})
+    assert os.stat(path).st_ino == inode
+    assert read_included(path) == 'host 1\nhost 2\nhost 3\n'
+
+    # Changing a fragment does not touch the configuration file
+    mtime = os.stat(path).st_mtime_ns
+    assert fragments.update({'node-02': 'host 2a\n'})
+    assert os.stat(path).st_mtime_ns == mtime
+    assert read_included(path) == 'host 1\nhost 2a\nhost 3\n'
+
+    # Removing a fragment removes its include directive
+    assert fragments.update({}, remove=['node-01'])
+    assert read_included(path) == 'host 2a\nhost 3\n'
+
+
+def test_config_fragments_key(tmpdir):
+    fragments = ConfigFragments(
+        str(tmpdir.join('hosts.d')), str(tmpdir.join('hosts.conf')),
+        INCLUDE_FORMAT)
+
+    # Keys cannot name files outside of the fragment directory
+    assert fragments.update({'racks/node-01': 'host 1\n'})
+    assert list(fragments.keys()) == ['racks_node-01']
+    assert sorted(os.listdir(str(tmpdir))) == ['hosts.conf', 'hosts.d']
+
+    assert fragments.update({}, remove=['racks/node-01'])
+    assert not list(fragments.keys())
+
+
+def test_config_fragments_missing_file(tmpdir):
+    path = str(tmpdir.join('hosts.conf'))
+
+    fragments = ConfigFragments(
+        str(tmpdir.join('hosts.d')), path, INCLUDE_FORMAT)
+
+    fragments.update({'node-01': 'host 1\n'})
+
+    # The configuration file is rewritten if it is missing, even if no
+    # fragment changed
+    os.unlink(path)
+
+    assert fragments.update({'node-01': 'host 1\n'})
+    assert read_included(path) == 'host 1\n'
+
+
+def test_pending_action(tmpdir):
+    action = PendingAction(str(tmpdir.join('pending', 'restart')))
+
+    assert not action.pop()
+
+    action.set()
+    action.set()
+
+    assert action.pop()
+    assert not action.pop()
+
+
+def test_pending_action_run(tmpdir):
+    action = PendingAction(str(tmpdir.join('pending', 'restart')))
+
+    calls = []
+
+    assert not action.run(lambda: calls.append(1))
+    assert not calls
+
+    action.set()
+
+    assert action.run(lambda: calls.append(1))
+    assert calls == [1]
+    assert not action.pop()
+
+    def fail():
+        raise RuntimeError('restart failed')
+
+    # A failed action stays pending
+    action.set()
+
+    with pytest.raises(RuntimeError):
+        action.run(fail)
+
+    assert action.pop()
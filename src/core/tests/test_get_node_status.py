@@ -0,0 +1,53 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import mock
+import pytest
+
+from tortuga.scripts import get_node_status
+
+
+def run(monkeypatch, args, results):
+    """
+    Runs get-node-status with a NodeWsApi returning 'results' from
+    successive getNodeList() calls
+
+    """
+    api = mock.Mock()
+    api.getNodeList.side_effect = results
+
+    monkeypatch.setattr(get_node_status, 'NodeWsApi', lambda **kwargs: api)
+    monkeypatch.setattr('sys.argv', ['get-node-status'] + args)
+
+    get_node_status.GetNodeStatus().runCommand()
+
+    return api
+
+
+def test_filters_exclude_all_nodes(monkeypatch, capsys):
+    node = {'name': 'compute-01', 'state': 'Deleted'}
+
+    # nodes excluded by filters are not an error
+    run(monkeypatch, ['--installed'], [[]])
+    run(monkeypatch, ['--node', 'compute-01', '--installed'], [[], [node]])
+
+    assert 'No nodes matching' not in capsys.readouterr().out
+
+
+def test_nodespec_matches_no_nodes(monkeypatch, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        run(monkeypatch, ['--node', 'compute-99', '--installed'], [[], []])
+
+    assert exc_info.value.code == 1
+    assert 'No nodes matching nodespec [compute-99]' in \
+        capsys.readouterr().out
@@ -0,0 +1,76 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from tortuga.wsapi.client import RestApiClient, get_adapter
+
+
+class CookieHandler(BaseHTTPRequestHandler):
+    """
+    Sets a session cookie, and returns the cookies sent by the client
+
+    """
+    def do_GET(self):
+        body = json.dumps(
+            {'cookie': self.headers.get('Cookie')}).encode()
+
+        self.send_response(200)
+        self.send_header('Set-Cookie', 'session_id=secret; Path=/')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(('127.0.0.1', 0), CookieHandler)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield 'http://127.0.0.1:{}'.format(server.server_port)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_clients_do_not_share_cookies(server_url):
+    admin = RestApiClient(
+        username='admin', password='secret', baseurl=server_url)
+    other = RestApiClient(
+        username='other', password='wrong', baseurl=server_url)
+
+    assert admin.get('/')['cookie'] is None
+
+    # the session cookie set for one client is not sent by another...
+    assert other.get('/')['cookie'] is None
+
+    # ...nor by the same client
+    assert admin.get('/')['cookie'] is None
+
+    assert admin.session is not other.session
+
+    # connection pools are shared
+    assert admin.session.get_adapter(server_url) is get_adapter()
+    assert other.session.get_adapter(server_url) is get_adapter()
@@ -15,11 +15,13 @@
 # pylint: disable=no-member,maybe-no-member
 
 import threading
+import time
 import uuid
 from typing import List, Optional
 
 from sqlalchemy.orm.session import Session
 
+from tortuga.config.configManager import ConfigManager
 from tortuga.db.hardwareProfilesDbHandler import HardwareProfilesDbHandler
 from tortuga.db.models.nodeTag import NodeTag
 from tortuga.db.nodeDbApi import NodeDbApi
@@ -29,13 +31,43 @@ from tortuga.exceptions.notFound import NotFound
 from tortuga.exceptions.resourceAdapterNotFound import ResourceAdapterNotFound
 from tortuga.kit.actions import KitActionsManager
 from tortuga.objects.addHostStatus import AddHostStatus
-from tortuga.objects.tortugaObject import TortugaObjectList
 from tortuga.objects.tortugaObjectManager import TortugaObjectManager
 from tortuga.objectstore.manager import ObjectStoreManager
 from tortuga.resourceAdapter import resourceAdapterFactory
 from tortuga.wsapi.syncWsApi import SyncWsApi
 
 
+#
+# Maximum time (in seconds) getStatus() waits for new messages
+#
+MAX_STATUS_WAIT = 10
+
+#
+# Number of seconds the progress messages of an add host session are
+# kept after the last message was added
+#
+STATUS_MESSAGES_TTL = 24 * 60 * 60
+
+#
+# Limits the number of getStatus() calls waiting at the same time in this
+# process (see ConfigManager.getAddHostStatusWaiters()), as each waiting
+# call holds a web service thread
+#
+_status_waiters: Optional[threading.BoundedSemaphore] = None
+_status_waiters_lock = threading.Lock()
+
+
+def _get_status_waiters() -> threading.BoundedSemaphore:
+    global _status_waiters
+
+    with _status_waiters_lock:
+        if _status_waiters is None:
+            _status_waiters = threading.BoundedSemaphore(
+                ConfigManager().getAddHostStatusWaiters())
+
+        return _status_waiters
+
+
 class AddHostManager(TagsDbApiMixin, TortugaObjectManager):
     tag_model = NodeTag
 
@@ -85,40 +117,49 @@ class AddHostManager(TagsDbApiMixin, TortugaObjectManager):
 
         resourceAdapter.session = session
 
-        # Call the start() method of the resource adapter
-        newNodes = resourceAdapter.start(
-            addHostRequest, session, dbHardwareProfile,
-            dbSoftwareProfile=dbSoftwareProfile)
+        bPostAddHost = False
+
+        try:
+            # Call the start() method of the resource adapter
+            newNodes = resourceAdapter.start(
+                addHostRequest, session, dbHardwareProfile,
+                dbSoftwareProfile=dbSoftwareProfile)
+
+            session.add_all(newNodes)
+            session.flush()
 
-        session.add_all(newNodes)
-        session.flush()
+            if 'tags' in addHostRequest and addHostRequest['tags']:
+                for node in newNodes:
+                    self._set_tags(node, addHostRequest['tags'])
 
-        if 'tags' in addHostRequest and addHostRequest['tags']:
-            for node in newNodes:
-                self._set_tags(node, addHostRequest['tags'])
+            # Commit new node(s) to database
+            session.commit()
 
-        # Commit new node(s) to database
-        session.commit()
+            # Only perform post-add operations if we actually added a node
+            if newNodes:
+                if dbSoftwareProfile and not dbSoftwareProfile.isIdle:
+                    self.getLogger().info(
+                        'Node(s) added to software profile [%s] and'
+                        ' hardware profile [%s]' % (
+                            dbSoftwareProfile.name
+                            if dbSoftwareProfile else 'None',
+                            dbHardwareProfile.name))
 
-        # Only perform post-add operations if we actually added a node
-        if newNodes:
-            if dbSoftwareProfile and not dbSoftwareProfile.isIdle:
-                self.getLogger().info(
-                    'Node(s) added to software profile [%s] and'
-                    ' hardware profile [%s]' % (
-                        dbSoftwareProfile.name
-                        if dbSoftwareProfile else 'None',
-                        dbHardwareProfile.name))
+                    newNodeNames = [tmpNode.name for tmpNode in newNodes]
 
-                newNodeNames = [tmpNode.name for tmpNode in newNodes]
+                    resourceAdapter.hookAction('add', newNodeNames)
 
-                resourceAdapter.hookAction('add', newNodeNames)
+                    self.postAddHost(
+                        session, dbHardwareProfile.name, softwareProfileName,
+                        addHostRequest['addHostSession'])
 
-                self.postAddHost(
-                    session, dbHardwareProfile.name, softwareProfileName,
-                    addHostRequest['addHostSession'])
+                    bPostAddHost = True
 
-                resourceAdapter.hookAction('start', newNodeNames)
+                    resourceAdapter.hookAction('start', newNodeNames)
+        finally:
+            if not bPostAddHost:
+                self.__abortAddHost(
+                    session, dbHardwareProfile.name, softwareProfileName)
 
         self.getLogger().debug('Add host workflow complete')
 
@@ -151,56 +192,122 @@ class AddHostManager(TagsDbApiMixin, TortugaObjectManager):
         # Always go over the web service for this call.
         SyncWsApi().scheduleClusterUpdate(updateReason='Node(s) added')
 
-    def updateStatus(self, addHostSession: str, msg: str) -> None:
-        self._addHostLock.acquire()
+    def __abortAddHost(self, session: Session, hardwareProfileName: str,
+                       softwareProfileName: Optional[str]) -> None:
+        """
+        Lets components clean up after pre add host operations, if the
+        post add host operations are not performed
+        """
+
+        mgr = KitActionsManager()
+        mgr.session = session
 
         try:
-            if not self._sessions.exists(addHostSession):
-                self.getLogger().warning(
-                    'updateStatus(): unknown session ID [%s]' % (
-                        addHostSession))
+            mgr.abort_add_host(hardwareProfileName, softwareProfileName)
+        except Exception:  # noqa pylint: disable=broad-except
+            self.getLogger().exception('Error aborting add host workflow')
+
+    def updateStatus(self, addHostSession: str, msg: str) -> None:
+        """
+        Appends a message to the session progress log, and notifies
+        clients waiting for new messages
+        """
 
-                return
+        if not self._sessions.exists(addHostSession):
+            self.getLogger().warning(
+                'updateStatus(): unknown session ID [%s]' % (
+                    addHostSession))
 
-            addHostStatus = AddHostStatus.getFromDict(
-                self._sessions.get(addHostSession)['status'])
+            return
 
-            addHostStatus.getMessageList().append(msg)
-        finally:
-            self._addHostLock.release()
+        key = self.__get_messages_key(addHostSession)
+
+        pipe = ObjectStoreManager.get_redis_client().pipeline()
+        pipe.rpush(key, msg)
+        pipe.expire(key, STATUS_MESSAGES_TTL)
+        pipe.publish(key, '1')
+        pipe.execute()
 
     def getStatus(self, db_session: Session, session: str,
-                  startMessage: int, getNodes: bool) -> AddHostStatus:
+                  startMessage: int, getNodes: bool,
+                  wait: float = 0) -> AddHostStatus:
         """
+        Returns session status, including the messages starting at
+        offset 'startMessage'. If there are no such messages, waits up to
+        'wait' seconds (at most MAX_STATUS_WAIT) for new messages. If the
+        maximum number of calls are already waiting (see
+        ConfigManager.getAddHostStatusWaiters()), returns immediately,
+        without messages.
+
+        'db_session' is only used after waiting, if 'getNodes' is True,
+        so callers should release its connection before calling with
+        'wait'.
+
         Raises:
             NotFound
         """
-        with self._addHostLock:
-            nodeList = self._nodeDbApi.getNodesByAddHostSession(
-                db_session, session) if getNodes else TortugaObjectList()
 
-            # Lock and copy for data consistency
-            if not self._sessions.exists(session):
-                raise NotFound('Invalid add host session ID [%s]' % (session))
+        if not self._sessions.exists(session):
+            raise NotFound('Invalid add host session ID [%s]' % (session))
 
-            session = self._sessions.get(session)
+        status = AddHostStatus.getFromDict(
+            self._sessions.get(session)['status'])
 
-            status_copy = AddHostStatus()
+        messages = self.__get_messages(session, startMessage)
 
-            # Copy simple data
-            status = AddHostStatus.getFromDict(session['status'])
-            for key in status.getKeys():
-                status_copy.set(key, status.get(key))
+        status_waiters = _get_status_waiters()
+
+        if not messages and wait > 0 and \
+                status_waiters.acquire(blocking=False):
+            try:
+                messages = self.__wait_for_messages(
+                    session, startMessage, min(wait, MAX_STATUS_WAIT))
+            finally:
+                status_waiters.release()
 
-            # Get slice of status messages
-            messages = status.getMessageList()[startMessage:]
+        status.setMessageList(messages)
 
-            status_copy.setMessageList(messages)
+        if getNodes:
+            status.getNodeList().extend(
+                self._nodeDbApi.getNodesByAddHostSession(
+                    db_session, session))
 
-            if nodeList:
-                status_copy.getNodeList().extend(nodeList)
+        return status
 
-            return status_copy
+    def __get_messages_key(self, session_id: str) -> str:
+        return '{}:messages'.format(self._sessions.get_key_name(session_id))
+
+    def __get_messages(self, session_id: str, start: int) -> List[str]:
+        return [
+            msg.decode() for msg in
+            ObjectStoreManager.get_redis_client().lrange(
+                self.__get_messages_key(session_id), start, -1)
+        ]
+
+    def __wait_for_messages(self, session_id: str, start: int,
+                            wait: float) -> List[str]:
+        key = self.__get_messages_key(session_id)
+
+        pubsub = ObjectStoreManager.get_redis_client().pubsub()
+        pubsub.subscribe(key)
+
+        try:
+            deadline = time.monotonic() + wait
+
+            while True:
+                # Check after subscribing, so that no message is missed
+                messages = self.__get_messages(session_id, start)
+                if messages:
+                    return messages
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+
+                pubsub.get_message(ignore_subscribe_messages=True,
+                                   timeout=remaining)
+        finally:
+            pubsub.close()
 
     def createNewSession(self) -> str:
         self.getLogger().debug('createNewSession()')
@@ -227,13 +334,18 @@ class AddHostManager(TagsDbApiMixin, TortugaObjectManager):
 
         self.getLogger().debug('delete_sessions()')
 
+        if not session_ids:
+            return
+
         with self._addHostLock:
-            for session_id in session_ids:
-                if self._sessions.exists(session_id):
-                    self.getLogger().debug(
-                        'Deleting session [{0}]'.format(session_id))
+            self.getLogger().debug(
+                'Deleting session(s) [{0}]'.format(', '.join(session_ids)))
+
+            self._sessions.delete_many(session_ids)
 
-                    self._sessions.delete(session_id)
+            ObjectStoreManager.get_redis_client().delete(
+                *[self.__get_messages_key(session_id)
+                  for session_id in session_ids])
 
     def update_session(
             self, session_id: str, running: Optional[bool] = None):
@@ -21,7 +21,9 @@ import random
 import re
 import string
 import threading
-from typing import List, Optional
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy.orm.session import Session
 
@@ -38,6 +40,8 @@ from tortuga.exceptions.networkNotFound import NetworkNotFound
 from tortuga.exceptions.nicNotFound import NicNotFound
 from tortuga.resourceAdapter.utility import get_provisioning_nics
 from tortuga.utility.tortugaApi import TortugaApi
+from .ipAllocator import IpAllocator
+from .slotAllocator import SlotAllocator
 
 
 session_nodes_lock = threading.RLock()
@@ -49,6 +53,19 @@ session_nodes: List[Node] = []
 # session.
 reservedIps: List[str] = []
 
+# Number of add nodes batches in progress (see allocation_batch()).
+# Allocators are only cached while a batch is in progress.
+allocationBatches = 0
+
+# IP allocators for provisioning networks, built on first use in an add
+# nodes batch and discarded when the batch ends
+ipAllocators: Dict[tuple, IpAllocator] = {}
+
+# Node number ('#N') allocators keyed by (name format with rack number
+# substituted, randomize), built on first use in an add nodes batch and
+# discarded when the batch ends
+nameSlotAllocators: Dict[Tuple[str, bool], SlotAllocator] = {}
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +74,31 @@ class AddHostServerLocal(TortugaApi):
         super(AddHostServerLocal, self).__init__()
         self._nodesDbHandler = NodesDbHandler()
 
+    @staticmethod
+    @contextmanager
+    def allocation_batch():
+        """
+        Cache IP address and node name allocators while adding a batch of
+        nodes. Allocators are built from the database on first use, and
+        are discarded when the last batch in progress ends, even if it
+        fails, so that the next batch sees nodes added by other processes.
+        """
+
+        global allocationBatches
+
+        with session_nodes_lock:
+            allocationBatches += 1
+
+        try:
+            yield
+        finally:
+            with session_nodes_lock:
+                allocationBatches -= 1
+
+                if not allocationBatches:
+                    ipAllocators.clear()
+                    nameSlotAllocators.clear()
+
     @staticmethod
     def clear_session_nodes(nodes: List[Node]) -> None:
         """Remove session entries for specified nodes"""
@@ -87,6 +129,17 @@ class AddHostServerLocal(TortugaApi):
 
                 session_nodes.remove(hostname)
 
+            # Make node number available again
+            for (base_name, randomize), allocator in \
+                    nameSlotAllocators.items():
+                slot = get_name_slot(
+                    base_name,
+                    strip_random_node_name_suffix(hostname)
+                    if randomize else hostname)
+
+                if slot is not None:
+                    allocator.release(slot)
+
             prov_nics = get_provisioning_nics(node)
 
             if prov_nics:
@@ -157,60 +210,110 @@ class AddHostServerLocal(TortugaApi):
             InvalidArgument
         '''
 
+        return self.generate_node_names(
+            session, nameFormat, 1, rackNumber=rackNumber,
+            randomize=randomize, dns_zone=dns_zone)[0]
+
+    def generate_node_names(self, session: Session, nameFormat: str,
+                            count: int,
+                            rackNumber: Optional[str] = None,
+                            randomize: bool = False,
+                            dns_zone: Optional[str] = None) -> List[str]:
+        '''
+        Generate 'count' unique node names for the specified nameFormat.
+
+        Raises:
+            InvalidArgument
+        '''
+
         try:
             base_name = nameFormat if rackNumber is None else \
                 self._substituteHashSpecifier(
                     nameFormat, '#R', rackNumber)
 
-            # Find all pre-existing nodes + nodes in the session
-            if not randomize:
-                nodes = self._nodesDbHandler.getNodesByNameFilter(
-                    session,
-                    self._substituteHashSpecifier(
-                        base_name, '#N', '_'))
+            names = []
 
-                # Get list of all existing nodes names
-                node_names = [get_host_name(tmpNode.name)
-                              for tmpNode in nodes]
-            else:
-                # Get all nodes matching name format WITH a random suffix
-                nodes = self._nodesDbHandler.getNodesByNameFilter(
-                    session,
-                    self._substituteHashSpecifier(base_name, '#N', '_') +
-                    '-_____')
+            with session_nodes_lock:
+                allocator = self._get_name_slot_allocator(
+                    session, base_name, randomize)
 
-                node_names = [
-                    strip_random_node_name_suffix(get_host_name(node.name))
-                    for node in nodes]
+                slots = allocator.allocate_many(count)
 
-            with session_nodes_lock:
-                # Build a list of all nodes in database and session
-                if randomize:
-                    all_session_nodes = node_names + \
-                        strip_random_node_name_suffixes(session_nodes)
-                else:
-                    all_session_nodes = node_names + session_nodes
+                try:
+                    for slot in slots:
+                        if slot > 1 and '#N' not in base_name:
+                            raise InvalidArgument(
+                                'Unable to generate unique host name')
 
-            for slot in itertools.count(1):
-                name = self._substituteHashSpecifier(
-                    base_name, '#N', slot)
+                        name = self._substituteHashSpecifier(
+                            base_name, '#N', slot)
 
-                if name not in all_session_nodes:
-                    break
+                        if randomize:
+                            # Add random 5 letter suffix to generated host
+                            # name
+                            name += '-%s' % (''.join(
+                                random.sample(string.ascii_lowercase, 5)))
 
-            if randomize:
-                # Add random 5 letter suffix to generated host name
-                name += '-%s' % (
-                    ''.join(random.sample(string.ascii_lowercase, 5)))
+                        names.append(name)
+                except InvalidArgument:
+                    # Make the node numbers available again
+                    for slot in slots:
+                        allocator.release(slot)
 
-            with session_nodes_lock:
-                # Add only host name to session_nodes cache
-                session_nodes.append(name)
+                    raise
+
+                # Add only host names to session_nodes cache
+                session_nodes.extend(names)
 
-            return '{}.{}'.format(name, dns_zone) if dns_zone else name
+            return ['{}.{}'.format(name, dns_zone) if dns_zone else name
+                    for name in names]
         except InvalidArgument as exc:
             raise InvalidArgument('%s (format=[%s])' % (exc, nameFormat))
 
+    def _get_name_slot_allocator(self, session: Session, base_name: str,
+                                 randomize: bool) -> SlotAllocator:
+        '''
+        Return node number allocator for the specified name format,
+        initialized with the node numbers of all pre-existing nodes and
+        nodes in the session. The allocator is cached for the rest of the
+        add nodes batch, if any. Must be called with session_nodes_lock
+        held.
+
+        '''
+
+        allocator = nameSlotAllocators.get((base_name, randomize))
+        if allocator is not None:
+            return allocator
+
+        name_filter = self._substituteHashSpecifier(base_name, '#N', '_')
+
+        # Find all pre-existing nodes + nodes in the session
+        if not randomize:
+            nodes = self._nodesDbHandler.getNodesByNameFilter(
+                session, name_filter)
+
+            node_names = [get_host_name(tmpNode.name)
+                          for tmpNode in nodes] + session_nodes
+        else:
+            # Get all nodes matching name format WITH a random suffix
+            nodes = self._nodesDbHandler.getNodesByNameFilter(
+                session, name_filter + '-_____')
+
+            node_names = [
+                strip_random_node_name_suffix(get_host_name(node.name))
+                for node in nodes] + \
+                strip_random_node_name_suffixes(session_nodes)
+
+        allocator = SlotAllocator(
+            slot for slot in (get_name_slot(base_name, node_name)
+                              for node_name in node_names)
+            if slot is not None)
+
+        if allocationBatches:
+            nameSlotAllocators[(base_name, randomize)] = allocator
+
+        return allocator
+
     def _substituteHashSpecifier(self, s, specifier, replacement):
         '''
         Replace the given specifier, '#R' or '#N', with the given
@@ -320,6 +423,10 @@ class AddHostServerLocal(TortugaApi):
                         nic_def['ip'], dbHardwareProfileNetwork.network)
 
                 dbNic.ip = nic_def['ip']
+
+                if dbHardwareProfileNetwork:
+                    self._reserve_ip_address(
+                        dbHardwareProfileNetwork.network, dbNic.ip)
             else:
                 if dbHardwareProfile.location == 'local' and \
                         not dbHardwareProfileNetwork:
@@ -434,6 +541,40 @@ class AddHostServerLocal(TortugaApi):
             #
             raise NetworkNotFound('IP address [{}] is invalid'.format(ip))
 
+    def _get_ip_allocator(self, network: Network) -> IpAllocator:
+        """
+        Return allocator for the specified network, initialized with the
+        addresses currently allocated on the network and reserved in this
+        add nodes session. The allocator is cached for the rest of the add
+        nodes batch, if any. Must be called with session_nodes_lock held.
+
+        """
+
+        key = (network.id, network.address, network.netmask,
+               network.startIp, network.increment)
+
+        allocator = ipAllocators.get(key)
+
+        if allocator is None:
+            allocator = IpAllocator(
+                ipaddress.IPv4Network(
+                    '%s/%s' % (network.address, network.netmask)),
+                start_ip=network.startIp,
+                increment=network.increment,
+                used_ips=[dbNic.ip for dbNic in network.nics
+                          if dbNic and dbNic.ip] + reservedIps)
+
+            if allocationBatches:
+                ipAllocators[key] = allocator
+
+        return allocator
+
+    def _reserve_ip_address(self, network: Network, ip: str) -> None:
+        with session_nodes_lock:
+            for key, allocator in ipAllocators.items():
+                if key[0] == network.id:
+                    allocator.reserve(ip)
+
     def generate_provisioning_ip_address(self, network):
         """
         Raises:
@@ -445,52 +586,37 @@ class AddHostServerLocal(TortugaApi):
             # (we do not assign the IP address for this hardwareProfile.)
             return None
 
-        n = ipaddress.IPv4Network(
-            '%s/%s' % (network.address, network.netmask))
+        with session_nodes_lock:
+            allocator = self._get_ip_allocator(network)
 
-        # Get list of all currently allocated IPs on this network
-        ips = [
-            ipaddress.IPv4Address(str(dbNic.ip))
-            for dbNic in network.nics if dbNic and dbNic.ip]
+            ip = allocator.allocate()
 
-        with session_nodes_lock:
-            # Include reserved IPs
-            ips.extend([ipaddress.IPv4Address(str(ip))
-                        for ip in reservedIps])
+            reservedIps.append(ip)
 
-            if not network.startIp:
-                # Assume the starting IP address is the first IP address in
-                # the subnet
-                try:
-                    ip = n[1]
-                except IndexError:
-                    raise InvalidArgument('IP address space exhausted')
-            else:
-                ip = ipaddress.IPv4Address(str(network.startIp))
+        self.getLogger().debug(
+            'Assigning IP address [%s] on network [%s]' % (
+                ip, str(allocator.network)))
 
-            # Ensure there's a valid increment if none is defined in the
-            # network object.
-            inc = network.increment if network.increment else 1
+        return ip
 
-            for _ in range(n.num_addresses):
-                if ip not in ips:
-                    # Found available IP address within address space
-                    break
+    def generate_provisioning_ip_addresses(self, network: Network,
+                                           count: int) -> List[str]:
+        """
+        Reserve 'count' IP addresses on the specified network at once.
 
-                ip += int(inc)
-            else:
-                raise InvalidArgument('IP address space exhausted')
+        Raises:
+            InvalidArgument
+        """
 
-            if ip == n.broadcast_address:
-                raise InvalidArgument('IP address space exhausted')
+        if not network or network.usingDhcp:
+            return []
 
-            reservedIps.append(ip.exploded)
+        with session_nodes_lock:
+            ips = self._get_ip_allocator(network).allocate_many(count)
 
-        self.getLogger().debug(
-            'Assigning IP address [%s] on network [%s]' % (
-                ip.exploded, str(n)))
+            reservedIps.extend(ips)
 
-        return ip.exploded
+        return ips
 
 
 def strip_random_node_name_suffix(name):
@@ -505,3 +631,34 @@ def strip_random_node_name_suffixes(names):
 def get_host_name(name):
     # Extract host name component from FQDN
     return name.split('.', 1)[0]
+
+
+@lru_cache(maxsize=128)
+def _get_name_slot_regex(base_name: str):
+    idx = base_name.find('#N')
+    if idx < 0:
+        return re.compile(re.escape(base_name) + '()')
+
+    width = 1
+    while base_name[idx + width + 1:idx + width + 2] == 'N':
+        width += 1
+
+    return re.compile('{}([0-9]{{{}}}){}'.format(
+        re.escape(base_name[:idx]), width,
+        re.escape(base_name[idx + width + 1:])))
+
+
+def get_name_slot(base_name: str, host_name: str) -> Optional[int]:
+    """
+    Return the node number ('#N') of 'host_name' generated from the name
+    format 'base_name', or None if it does not match the name format.
+    Host names matching a name format without a node number specifier
+    occupy node number 1.
+
+    """
+
+    match = _get_name_slot_regex(base_name).fullmatch(host_name)
+    if not match:
+        return None
+
+    return int(match.group(1)) if match.group(1) else 1
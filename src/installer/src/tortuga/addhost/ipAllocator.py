@@ -0,0 +1,152 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ipaddress
+from typing import Iterable, List, Optional, Union
+
+from tortuga.exceptions.invalidArgument import InvalidArgument
+
+
+IpAddress = Union[str, ipaddress.IPv4Address]
+
+
+class IpAllocator:
+    """
+    Allocates IP addresses on a network.
+
+    Candidate addresses start at 'start_ip' (or the first host address of
+    the network) and are spaced 'increment' addresses apart, up to, but
+    not including, the broadcast address. A bitmap (one byte per
+    candidate) records which candidates are in use, and allocation
+    resumes from the lowest candidate that might be free, so allocating
+    consecutive addresses is O(1) amortised.
+
+    :param network:   the network
+    :param start_ip:  the first candidate address, defaults to the first
+                      host address of the network
+    :param increment: the distance between candidate addresses
+    :param used_ips:  addresses that are already in use
+
+    """
+    FREE = 0
+    USED = 1
+
+    def __init__(self, network: ipaddress.IPv4Network,
+                 start_ip: Optional[IpAddress] = None,
+                 increment: int = 1,
+                 used_ips: Optional[Iterable[IpAddress]] = None):
+        self.network = network
+        self.increment = int(increment) if increment else 1
+
+        if start_ip:
+            self._start = int(ipaddress.IPv4Address(str(start_ip)))
+        else:
+            self._start = int(network.network_address) + 1
+
+        end = int(network.broadcast_address)
+
+        if self._start >= end or \
+                ipaddress.IPv4Address(self._start) not in network:
+            num_slots = 0
+        else:
+            num_slots = (end - 1 - self._start) // self.increment + 1
+
+        self._slots = bytearray(num_slots)
+
+        # Lowest slot that may be free
+        self._next = 0
+
+        for ip in used_ips or []:
+            self.reserve(ip)
+
+    def _get_slot(self, ip: IpAddress) -> Optional[int]:
+        """
+        Return the slot for the specified address, or None if it is not
+        a candidate address.
+
+        """
+        offset = int(ipaddress.IPv4Address(str(ip))) - self._start
+
+        if offset < 0 or offset % self.increment:
+            return None
+
+        slot = offset // self.increment
+
+        return slot if slot < len(self._slots) else None
+
+    def _get_ip(self, slot: int) -> str:
+        return ipaddress.IPv4Address(
+            self._start + slot * self.increment).exploded
+
+    def reserve(self, ip: IpAddress) -> None:
+        """
+        Mark the specified address as used. Addresses that are not
+        candidates for allocation are ignored.
+
+        """
+        slot = self._get_slot(ip)
+
+        if slot is not None:
+            self._slots[slot] = self.USED
+
+    def release(self, ip: IpAddress) -> None:
+        """
+        Mark the specified address as free.
+
+        """
+        slot = self._get_slot(ip)
+
+        if slot is not None:
+            self._slots[slot] = self.FREE
+
+            self._next = min(self._next, slot)
+
+    def is_used(self, ip: IpAddress) -> bool:
+        slot = self._get_slot(ip)
+
+        return slot is not None and self._slots[slot] == self.USED
+
+    def allocate(self) -> str:
+        """
+        Allocate the next free address.
+
+        Raises:
+            InvalidArgument
+        """
+
+        slot = self._slots.find(self.FREE, self._next)
+        if slot == -1:
+            self._next = len(self._slots)
+
+            raise InvalidArgument('IP address space exhausted')
+
+        self._slots[slot] = self.USED
+
+        self._next = slot + 1
+
+        return self._get_ip(slot)
+
+    def allocate_many(self, count: int) -> List[str]:
+        """
+        Allocate 'count' free addresses. Either all or none of the
+        addresses are allocated.
+
+        Raises:
+            InvalidArgument
+        """
+
+        if self._slots.count(self.FREE, self._next) < count:
+            raise InvalidArgument('IP address space exhausted')
+
+        return [self.allocate() for _ in range(count)]
@@ -0,0 +1,70 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Iterable, List, Optional
+
+
+class SlotAllocator:
+    """
+    Allocates the lowest unused positive integer slot, such as the node
+    number substituted for '#N' in a hardware profile name format.
+
+    Allocation resumes from the lowest slot that may be free, so
+    allocating consecutive slots is O(1) amortised.
+
+    :param used_slots: slots that are already in use
+
+    """
+
+    def __init__(self, used_slots: Optional[Iterable[int]] = None):
+        self._used = set(used_slots or [])
+
+        # Lowest slot that may be free
+        self._next = 1
+
+    def reserve(self, slot: int) -> None:
+        self._used.add(slot)
+
+    def release(self, slot: int) -> None:
+        self._used.discard(slot)
+
+        self._next = min(self._next, slot)
+
+    def is_used(self, slot: int) -> bool:
+        return slot in self._used
+
+    def allocate(self) -> int:
+        """
+        Allocate the lowest free slot.
+
+        """
+
+        while self._next in self._used:
+            self._next += 1
+
+        slot = self._next
+
+        self._used.add(slot)
+
+        self._next += 1
+
+        return slot
+
+    def allocate_many(self, count: int) -> List[int]:
+        """
+        Allocate the 'count' lowest free slots.
+
+        """
+
+        return [self.allocate() for _ in range(count)]
@@ -14,6 +14,7 @@
 
 # pylint: disable=no-member
 
+import json
 from typing import Any, Dict
 
 from sqlalchemy.orm.session import Session
@@ -22,6 +23,8 @@ from tortuga.db.hardwareProfilesDbHandler import HardwareProfilesDbHandler
 from tortuga.db.models.hardwareProfile import HardwareProfile
 from tortuga.db.models.node import Node
 from tortuga.db.models.softwareProfile import SoftwareProfile
+from tortuga.db.nodeRequestsDbHandler import NodeRequestsDbHandler
+from tortuga.db.nodesDbHandler import NodesDbHandler
 from tortuga.db.softwareProfilesDbHandler import SoftwareProfilesDbHandler
 from tortuga.exceptions.invalidArgument import InvalidArgument
 from tortuga.exceptions.nodeAlreadyExists import NodeAlreadyExists
@@ -108,7 +111,13 @@ def validate_addnodes_request(session: Session, addNodesRequest: Dict[str, Any])
     if 'hardwareProfile' not in addNodesRequest:
         addNodesRequest['hardwareProfile'] = hp.name
 
-    swprofile_node_count = len(sp.nodes)
+    swprofile_node_count = NodesDbHandler().getNodeCountsBySoftwareProfile(
+        session, [sp.id], lock=sp.maxNodes > 0)[sp.id]
+
+    if sp.maxNodes > 0:
+        # Nodes of pending add nodes requests have not been added yet,
+        # but count towards the limit
+        swprofile_node_count += get_pending_node_count(session, sp.name)
 
     # Validate 'nodeDetails'
 
@@ -145,11 +154,13 @@ def validate_addnodes_request(session: Session, addNodesRequest: Dict[str, Any])
                 )
 
     # ensure adding nodes does not exceed imposed limits
+    requestedNodeCount = get_requested_node_count(addNodesRequest)
+
     if sp.maxNodes > 0 and \
-            (swprofile_node_count + nodeCount) > sp.maxNodes:
+            (swprofile_node_count + requestedNodeCount) > sp.maxNodes:
         raise OperationFailed(
             'Request to add {} node(s) exceeds software profile'
-            ' limit of {} nodes'.format(nodeCount, sp.maxNodes)
+            ' limit of {} nodes'.format(requestedNodeCount, sp.maxNodes)
         )
 
     # Prohibit running add-host against installer
@@ -199,3 +210,34 @@ def validate_hwprofile(hp: HardwareProfile) -> None:
             raise InvalidArgument(
                 'Nodes cannot be added to Tortuga installer'
                 ' hardware/software profiles')
+
+
+def get_requested_node_count(addNodesRequest: Dict[str, Any]) -> int:
+    """
+    Returns the number of nodes requested by an add nodes request
+    """
+
+    return int(addNodesRequest.get('count', 0)) or \
+        len(addNodesRequest.get('nodeDetails', []))
+
+
+def get_pending_node_count(session: Session,
+                           softwareProfileName: str) -> int:
+    """
+    Returns the number of nodes requested by the queued or in progress
+    add nodes requests for the software profile
+    """
+
+    count = 0
+
+    for req in NodeRequestsDbHandler().get_by_action_and_state(
+            session, 'ADD', 'pending'):
+        try:
+            addNodesRequest = json.loads(req.request)
+        except ValueError:
+            continue
+
+        if addNodesRequest.get('softwareProfile') == softwareProfileName:
+            count += get_requested_node_count(addNodesRequest)
+
+    return count
@@ -68,7 +68,7 @@ class AdminManager(TortugaObjectManager):
         self._adminDbApi.addAdmin(
             session, name, password, realname, description)
 
-        AuthManager(session=session).reloadPrincipals()
+        AuthManager(session=session).invalidatePrincipals()
 
     def _generate_random_password(self) -> str:
         """
@@ -86,7 +86,7 @@ class AdminManager(TortugaObjectManager):
     def deleteAdmin(self, session: Session, admin):
         self._adminDbApi.deleteAdmin(session, admin)
 
-        AuthManager(session=session).reloadPrincipals()
+        AuthManager(session=session).invalidatePrincipals()
 
     def updateAdmin(self, session: Session, adminObject, isCrypted):
         if adminObject.getPassword() is not None:
@@ -98,4 +98,4 @@ class AdminManager(TortugaObjectManager):
 
         self._adminDbApi.updateAdmin(session, adminObject)
 
-        AuthManager(session=session).reloadPrincipals()
+        AuthManager(session=session).invalidatePrincipals()
@@ -0,0 +1,116 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+
+class CredentialCache:
+    """
+    Bounded cache of successful username/password verifications.
+
+    Cleartext passwords are never stored; entries are keyed by username
+    and a SHA-256 digest of the password and remember the password hash
+    of the principal they were verified against, so an entry is ignored
+    as soon as the principal's password changes.
+
+    :param max_size: maximum number of cached verifications
+    :param ttl:      number of seconds a verification remains valid
+
+    """
+    DEFAULT_MAX_SIZE = 1024
+    DEFAULT_TTL = 300
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE,
+                 ttl: int = DEFAULT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(username: str, password: str) -> Tuple[str, str]:
+        return username, hashlib.sha256(password.encode()).hexdigest()
+
+    def lookup(self, username: str, password: str,
+               password_hash: str) -> bool:
+        """
+        Return True if the username/password combination was previously
+        verified against 'password_hash' and the entry has not expired.
+
+        """
+        key = self._get_key(username, password)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                expires, cached_hash = entry
+
+                if expires > time.monotonic() and \
+                        cached_hash == password_hash:
+                    self._entries.move_to_end(key)
+
+                    self.hits += 1
+
+                    return True
+
+                del self._entries[key]
+
+            self.misses += 1
+
+            return False
+
+    def add(self, username: str, password: str, password_hash: str):
+        """
+        Record a successful verification of username/password against
+        'password_hash'
+
+        """
+        key = self._get_key(username, password)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, password_hash)
+
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all cached verifications
+
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Return dict containing cache size and hit/miss counters
+
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
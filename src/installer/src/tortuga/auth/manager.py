@@ -12,15 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+from typing import Dict, Optional
+
 from passlib.hash import pbkdf2_sha256
 
 from sqlalchemy.orm.session import Session
 from tortuga.config.configManager import ConfigManager
 from tortuga.objects.tortugaObjectManager import TortugaObjectManager
 
+from .cache import CredentialCache
 from .principal import AuthPrincipal
 
 
+#
+# Process-wide principal registry. The registry is loaded on first use
+# and invalidated when admins are added, updated or deleted.
+#
+_principals: Dict[str, AuthPrincipal] = {}
+_principals_loaded = False
+_principals_lock = threading.RLock()
+
+#
+# Process-wide cache of successful password verifications
+#
+credential_cache = CredentialCache()
+
+
 class AuthManager(TortugaObjectManager):
     def __init__(self, *, session: Session):
         super(AuthManager, self).__init__()
@@ -29,10 +47,6 @@ class AuthManager(TortugaObjectManager):
 
         self._configManager = ConfigManager()
 
-        self.__principals = {}
-
-        self.__loadPrincipals()
-
     def cryptPassword(self, cleartext): \
             # pylint: disable=no-self-use
         """
@@ -46,9 +60,24 @@ class AuthManager(TortugaObjectManager):
         This is used to reload the principals in auth manager
         """
 
-        self.__principals.clear()
+        with _principals_lock:
+            self.__loadPrincipals()
+
+    def invalidatePrincipals(self): \
+            # pylint: disable=no-self-use
+        """
+        Discard the principal registry and all cached password
+        verifications. The registry is reloaded on next lookup.
+        """
+
+        global _principals_loaded  # pylint: disable=global-statement
+
+        with _principals_lock:
+            _principals.clear()
 
-        self.__loadPrincipals()
+            _principals_loaded = False
+
+        credential_cache.clear()
 
     def __loadPrincipals(self):
         """
@@ -56,6 +85,10 @@ class AuthManager(TortugaObjectManager):
         """
         from tortuga.admin.api import AdminApi
 
+        global _principals_loaded  # pylint: disable=global-statement
+
+        principals = {}
+
         # Create built-in cfm principal
         cfmUser = AuthPrincipal(
             self._configManager.getCfmUser(),
@@ -63,16 +96,21 @@ class AuthManager(TortugaObjectManager):
             {'roles': 'cfm'})
 
         # Add cfm user
-        self.__principals[cfmUser.get_name()] = cfmUser
+        principals[cfmUser.get_name()] = cfmUser
 
         # Add users from DB
         if self._configManager.isInstaller():
             for admin in AdminApi().getAdminList(self.session):
-                self.__principals[admin.getUsername()] = AuthPrincipal(
+                principals[admin.getUsername()] = AuthPrincipal(
                     admin.getUsername(), admin.getPassword(),
                     attributes={'id': admin.getId()})
 
-    def get_principal(self, username: str) -> AuthPrincipal:
+        _principals.clear()
+        _principals.update(principals)
+
+        _principals_loaded = True
+
+    def get_principal(self, username: str) -> Optional[AuthPrincipal]:
         """
         Get a principal by username.
 
@@ -81,8 +119,33 @@ class AuthManager(TortugaObjectManager):
         :return AuthPrincipal: the principal, if found, otherwise None
 
         """
-        principal: AuthPrincipal = self.__principals.get(username)
-        if not principal:
-            principal = None
+        with _principals_lock:
+            if not _principals_loaded:
+                self.__loadPrincipals()
+
+            return _principals.get(username)
+
+    def verify_password(self, principal: AuthPrincipal,
+                        password: str) -> bool: \
+            # pylint: disable=no-self-use
+        """
+        Verify password of principal. Successful verifications are cached
+        to avoid repeated (expensive) password hashing.
+
+        :param AuthPrincipal principal: the principal to verify
+        :param str password:            the cleartext password
+
+        :return bool: True if password matches
+
+        """
+        if credential_cache.lookup(principal.get_name(), password,
+                                   principal.get_password()):
+            return True
+
+        if not pbkdf2_sha256.verify(password, principal.get_password()):
+            return False
+
+        credential_cache.add(
+            principal.get_name(), password, principal.get_password())
 
-        return principal
+        return True
@@ -17,8 +17,6 @@ import os
 from logging import getLogger
 from typing import List
 
-from passlib.hash import pbkdf2_sha256
-
 from oic.oic import Client
 from oic.oic.message import RegistrationResponse
 from oic.utils.authn.client import CLIENT_AUTHN_METHOD
@@ -203,7 +201,7 @@ class UsernamePasswordAuthenticationMethod(AuthenticationMethod):
             if not principal:
                 raise AuthenticationFailed()
 
-            if pbkdf2_sha256.verify(password, principal.get_password()):
+            if auth_manager.verify_password(principal, password):
                 return username
 
             raise AuthenticationFailed()
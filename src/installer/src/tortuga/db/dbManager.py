@@ -13,28 +13,48 @@
 # limitations under the License.
 
 # pylint: disable=multiple-statements,no-member,no-name-in-module
-# pylint: disable=not-callable
+# pylint: disable=not-callable,unused-argument
 
 import configparser
 from logging import getLogger
 import os
+import threading
 
 import sqlalchemy
 import sqlalchemy.orm
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from tortuga.config.configManager import ConfigManager
 from tortuga.exceptions.dbError import DbError
 from tortuga.kit.registry import get_all_kit_installers
+from tortuga.node.changeCounter import track_node_changes
 from tortuga.objects.tortugaObjectManager import TortugaObjectManager
 # from .tables import get_all_table_mappers
 from .sessionContextManager import SessionContextManager
 from .models.base import ModelBase
+from .schemaUpgrade import upgrade_schema
 
 from . import models  # noqa pylint: disable=unused-import
 
 
 logger = getLogger(__name__)
 
+#
+# Default connection pool settings for server databases (MySQL). These
+# can be overridden in the [database] section of tortuga.ini.
+#
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_OVERFLOW = 20
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 3600
+
+#
+# Kit database models are imported once per process (see _map_db_tables())
+#
+_tables_mapped = False
+_tables_mapped_lock = threading.Lock()
+
 
 class DbManager(TortugaObjectManager):
     """
@@ -65,30 +85,102 @@ class DbManager(TortugaObjectManager):
 
                 os.close(fd)
 
-            self._engine = sqlalchemy.create_engine(engineURI)
+            self._engine = sqlalchemy.create_engine(
+                engineURI, **self.__getEngineOptions())
+
+            if self._dbConfig['engine'] == 'sqlite' and \
+                    self._dbConfig['journal_mode']:
+                # ie. "wal" to allow readers while writing
+                self.__set_journal_mode(self._dbConfig['journal_mode'])
         else:
             self._engine = engine
 
-        self.Session = sqlalchemy.orm.scoped_session(
-            sqlalchemy.orm.sessionmaker(bind=self.engine))
+        self._pool_stats = {
+            'connects': 0,
+            'checkouts': 0,
+            'checkins': 0,
+            'invalidations': 0,
+        }
 
-    def _map_db_tables(self):
-        #
-        # Make sure all kit table mappers have been registered
-        #
-        for kit_installer_class in get_all_kit_installers():
-            kit_installer = kit_installer_class()
-            kit_installer.register_database_table_mappers()
-        #
-        # Map all tables that haven't yet been mapped
-        #
-        # for table_mapper in get_all_table_mappers():
-        #     key = table_mapper.__name__
-        #     if key not in self._mapped_tables.keys():
-        #         logger.debug('Mapping table: {}'.format(key))
-        #         self._mapped_tables[key] = table_mapper()
-        #         self._mapped_tables[key].map(self)
-        pass
+        self.__track_pool_stats()
+
+        session_factory = sqlalchemy.orm.sessionmaker(bind=self.engine)
+
+        track_node_changes(session_factory)
+
+        self.Session = sqlalchemy.orm.scoped_session(session_factory)
+
+    def _map_db_tables(self, force: bool = False):
+        """
+        Import the database models of all kits. This is done once per
+        process, or again if 'force' is set (ie. after installing a kit).
+
+        """
+        global _tables_mapped
+
+        if _tables_mapped and not force:
+            return
+
+        with _tables_mapped_lock:
+            if _tables_mapped and not force:
+                return
+
+            #
+            # Make sure all kit table mappers have been registered
+            #
+            for kit_installer_class in get_all_kit_installers():
+                kit_installer = kit_installer_class()
+                kit_installer.register_database_table_mappers()
+
+            _tables_mapped = True
+
+    def __track_pool_stats(self):
+        def on_connect(dbapi_connection, connection_record):
+            self._pool_stats['connects'] += 1
+
+        def on_checkout(dbapi_connection, connection_record,
+                        connection_proxy):
+            self._pool_stats['checkouts'] += 1
+
+        def on_checkin(dbapi_connection, connection_record):
+            self._pool_stats['checkins'] += 1
+
+        def on_invalidate(dbapi_connection, connection_record,
+                          exception):
+            self._pool_stats['invalidations'] += 1
+
+        event.listen(self._engine, 'connect', on_connect)
+        event.listen(self._engine, 'checkout', on_checkout)
+        event.listen(self._engine, 'checkin', on_checkin)
+        event.listen(self._engine, 'invalidate', on_invalidate)
+
+    def get_pool_status(self) -> dict:
+        """
+        Return connection pool statistics, for diagnostics.
+
+        :return dict: the pool class and its current status, and the
+                      number of connections opened, checked out, checked
+                      in and invalidated since the engine was created
+
+        """
+        pool = self._engine.pool
+
+        status = {
+            'pool': pool.__class__.__name__,
+            'status': pool.status(),
+        }
+
+        if isinstance(pool, QueuePool):
+            status.update({
+                'size': pool.size(),
+                'checkedin': pool.checkedin(),
+                'checkedout': pool.checkedout(),
+                'overflow': pool.overflow(),
+            })
+
+        status.update(self._pool_stats)
+
+        return status
 
     @property
     def engine(self):
@@ -108,13 +200,30 @@ class DbManager(TortugaObjectManager):
         #
         # Create tables
         #
-        self._map_db_tables()
+        self._map_db_tables(force=True)
         try:
             ModelBase.metadata.create_all(self.engine)
+
+            #
+            # Add columns and indexes missing from existing tables
+            #
+            upgrade_schema(self.engine)
         except Exception:
             self.getLogger().exception('SQLAlchemy raised exception')
             raise DbError('Check database settings or credentials')
 
+    def upgrade_database(self):
+        """
+        Add columns and indexes missing from existing tables. Called when
+        the web service and Celery workers start, so that an upgraded
+        installation works before the database is initialized again.
+        """
+        try:
+            upgrade_schema(self.engine)
+        except Exception:
+            self.getLogger().exception('Unable to upgrade database schema')
+            raise DbError('Unable to upgrade database schema')
+
     @property
     def metadata(self):
         return self._metadata
@@ -152,6 +261,40 @@ class DbManager(TortugaObjectManager):
 
         return engineURI
 
+    def __getEngineOptions(self) -> dict:
+        """
+        Return keyword arguments for sqlalchemy.create_engine()
+        """
+
+        options = {
+            'pool_pre_ping': self._dbConfig['pool_pre_ping'],
+        }
+
+        if self._dbConfig['engine'] == 'sqlite':
+            if self._dbConfig['static_pool']:
+                # Single connection shared by all threads
+                options['poolclass'] = StaticPool
+                options['connect_args'] = {'check_same_thread': False}
+
+            return options
+
+        options.update({
+            'pool_size': self._dbConfig['pool_size'],
+            'max_overflow': self._dbConfig['max_overflow'],
+            'pool_timeout': self._dbConfig['pool_timeout'],
+            'pool_recycle': self._dbConfig['pool_recycle'],
+        })
+
+        return options
+
+    def __set_journal_mode(self, journal_mode: str):
+        def on_connect(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute('PRAGMA journal_mode={}'.format(journal_mode))
+            cursor.close()
+
+        event.listen(self._engine, 'connect', on_connect)
+
     def _getDefaultDbEngine(self): \
             # pylint: disable=no-self-use
         return 'sqlite'
@@ -231,6 +374,32 @@ class DbManager(TortugaObjectManager):
 
         dbConfig['password'] = val
 
+        # Connection pool
+        is_sqlite = dbConfig['engine'] == 'sqlite'
+
+        dbConfig['pool_size'] = cfg.getint(
+            'database', 'pool_size', fallback=DEFAULT_POOL_SIZE)
+
+        dbConfig['max_overflow'] = cfg.getint(
+            'database', 'max_overflow', fallback=DEFAULT_MAX_OVERFLOW)
+
+        dbConfig['pool_timeout'] = cfg.getint(
+            'database', 'pool_timeout', fallback=DEFAULT_POOL_TIMEOUT)
+
+        dbConfig['pool_recycle'] = cfg.getint(
+            'database', 'pool_recycle', fallback=DEFAULT_POOL_RECYCLE)
+
+        # Test connections for liveness before use (not needed for SQLite)
+        dbConfig['pool_pre_ping'] = cfg.getboolean(
+            'database', 'pool_pre_ping', fallback=not is_sqlite)
+
+        # SQLite only
+        dbConfig['static_pool'] = cfg.getboolean(
+            'database', 'static_pool', fallback=False)
+
+        dbConfig['journal_mode'] = cfg.get(
+            'database', 'journal_mode', fallback=None)
+
         return dbConfig
 
     def get_backend_opts(self): \
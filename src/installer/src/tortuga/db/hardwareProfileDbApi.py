@@ -144,18 +144,19 @@ class HardwareProfileDbApi(TagsDbApiMixin, TortugaDbApi):
         """
 
         try:
+            options = get_default_relations(optionDict)
+            options['hardwareprofilenetworks'] = True
+
             dbHardwareProfileList = \
                 self._hardwareProfilesDbHandler.getHardwareProfileList(
-                    session, tags=tags)
+                    session, tags=tags,
+                    options=self.getLoaderOptions(
+                        HardwareProfileModel, options))
 
             hardwareProfileList = TortugaObjectList()
 
             for dbHardwareProfile in dbHardwareProfileList:
-                options = dict.copy(optionDict or {})
-                options['hardwareprofilenetworks'] = True
-
-                self.loadRelations(
-                    dbHardwareProfile, get_default_relations(options))
+                self.loadRelations(dbHardwareProfile, options)
 
                 hardwareProfileList.append(
                     HardwareProfile.getFromDbDict(
@@ -13,10 +13,11 @@
 # limitations under the License.
 
 # pylint: disable=not-callable,multiple-statements,no-member
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from sqlalchemy import and_, or_
 from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy.orm.strategy_options import Load
 
 from tortuga.db.tortugaDbObjectHandler import TortugaDbObjectHandler
 from tortuga.exceptions.hardwareProfileNotFound import HardwareProfileNotFound
@@ -65,9 +66,12 @@ class HardwareProfilesDbHandler(TortugaDbObjectHandler):
         return dbHardwareProfile
 
     def getHardwareProfileList(self, session,
-                               tags: Optional[Tags] = None):
+                               tags: Optional[Tags] = None,
+                               options: Optional[List[Load]] = None):
         """
         Get list of hardwareProfiles from the db.
+
+        :param options: optional list of SQLAlchemy loader options
         """
 
         self.getLogger().debug('Retrieving hardware profile list')
@@ -90,8 +94,9 @@ class HardwareProfilesDbHandler(TortugaDbObjectHandler):
                     #
                     searchspec.append(HardwareProfile.tags.any(name=name))
 
-        return session.query(HardwareProfile).filter(
-            or_(*searchspec)).order_by(HardwareProfile.name).all()
+        return session.query(HardwareProfile).options(
+            *(options or [])).filter(
+                or_(*searchspec)).order_by(HardwareProfile.name).all()
 
     def setIdleSoftwareProfile(self, dbHardwareProfile,
                                dbSoftwareProfile=None): \
@@ -26,6 +26,8 @@ from tortuga.objects.kit import Kit
 from tortuga.objects.kitSource import KitSource
 from tortuga.objects.tortugaObject import TortugaObjectList
 
+from .models.kit import Kit as KitModel
+
 
 class KitDbApi(TortugaDbApi):
     """
@@ -114,9 +116,12 @@ class KitDbApi(TortugaDbApi):
         try:
             kits = []
 
+            options = {'components': True}
+
             for kit in self._kitsDbHandler.getKitList(
-                    session, os_kits_only=os_kits_only):
-                self.loadRelations(kit, {'components': True})
+                    session, os_kits_only=os_kits_only,
+                    options=self.getLoaderOptions(KitModel, options)):
+                self.loadRelations(kit, options)
 
                 kits.append(Kit.getFromDbDict(kit.__dict__))
 
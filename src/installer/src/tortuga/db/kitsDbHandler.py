@@ -15,11 +15,12 @@
 # pylint: disable=not-callable,multiple-statements,no-member,no-self-use
 # pylint; disable=no-name-in-module
 
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 from sqlalchemy import and_
 from sqlalchemy.orm.exc import MultipleResultsFound, NoResultFound
 from sqlalchemy.orm.session import Session
+from sqlalchemy.orm.strategy_options import Load
 
 from tortuga.config.configManager import ConfigManager
 from tortuga.db.tortugaDbObjectHandler import TortugaDbObjectHandler
@@ -97,19 +98,24 @@ class KitsDbHandler(TortugaDbObjectHandler):
                 ' iteration')
 
     def getKitList(self, session: Session,
-                   os_kits_only: Optional[bool] = False):
+                   os_kits_only: Optional[bool] = False,
+                   options: Optional[List[Load]] = None):
         """
         Get list of kits from the db.
+
+        :param options: optional list of SQLAlchemy loader options
         """
 
+        q = session.query(Kit).options(*(options or []))
+
         if os_kits_only:
             self.getLogger().debug('Retrieving OS kits only')
 
-            return session.query(Kit).filter(Kit.isOs == True).all()
+            return q.filter(Kit.isOs == True).all()
 
         self.getLogger().debug('Retrieving all available kits')
 
-        return session.query(Kit).all()
+        return q.all()
 
     def _getOsFamilyInfo(self, session, osFamilyName, osFamilyVersion,
                          osFamilyArch):
@@ -14,18 +14,44 @@
 
 # pylint: disable=too-few-public-methods
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from typing import Optional
+
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String
 from sqlalchemy.ext.indexable import index_property
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 from .base import ModelBase
 
 
+def get_short_name(name: Optional[str]) -> Optional[str]:
+    """
+    Return the normalized (lowercase) host name part of a node name
+    """
+
+    return name.split('.', 1)[0].lower() if name else None
+
+
 class Node(ModelBase):
     __tablename__ = 'nodes'
+    __table_args__ = (
+        #
+        # Node lists are sorted by name, so include it to avoid sorting
+        # the selected nodes
+        #
+        Index('ix_nodes_state', 'state', 'name'),
+        Index('ix_nodes_addHostSession', 'addHostSession', 'name'),
+        #
+        # Transfer candidates are selected by profile and lock state
+        #
+        Index('ix_nodes_hardwareProfileId_lockedState',
+              'hardwareProfileId', 'lockedState'),
+        Index('ix_nodes_softwareProfileId_lockedState',
+              'softwareProfileId', 'lockedState'),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String(255), unique=True, nullable=False)
+    short_name = Column(String(255), index=True)
     public_hostname = Column(String(255), unique=True, nullable=True)
     state = Column(String(255), default='Discovered')
     bootFrom = Column(Integer, default=0)
@@ -55,5 +81,12 @@ class Node(ModelBase):
         'InstanceMapping', uselist=False, back_populates='node',
         cascade='all,delete-orphan')
 
+    @validates('name')
+    def _validate_name(self, key, name):  # pylint: disable=unused-argument
+        # Keep the indexed short name in sync with the node name
+        self.short_name = get_short_name(name)
+
+        return name
+
     def __repr__(self):
         return 'Node(name={})'.format(self.name)
@@ -28,7 +28,7 @@ class NodeRequest(ModelBase):
     timestamp = Column(DateTime)
     last_update = Column(DateTime)
     state = Column(String(255), nullable=False, default='pending')
-    addHostSession = Column(String(36))
+    addHostSession = Column(String(36), index=True)
     message = Column(Text)
     admin_id = Column(Integer, ForeignKey('admins.id'))
     action = Column(String(255), nullable=False)
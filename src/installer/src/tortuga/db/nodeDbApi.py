@@ -62,7 +62,9 @@ class NodeDbApi(TagsDbApiMixin, TortugaDbApi):
 
         try:
             return self.__convert_nodes_to_TortugaObjectList(
-                [self._nodesDbHandler.getNode(session, name)],
+                [self._nodesDbHandler.getNode(
+                    session, name,
+                    options=self.__get_loader_options(optionDict))],
                 optionDict=optionDict)[0]
         except TortugaException:
             raise
@@ -80,7 +82,9 @@ class NodeDbApi(TagsDbApiMixin, TortugaDbApi):
         try:
             return self.__convert_nodes_to_TortugaObjectList(
                 self._nodesDbHandler.getNodesByAddHostSession(
-                    session, ahSession), optionDict=optionDict)
+                    session, ahSession,
+                    options=self.__get_loader_options(optionDict)),
+                optionDict=optionDict)
         except TortugaException:
             raise
         except Exception as ex:
@@ -101,7 +105,8 @@ class NodeDbApi(TagsDbApiMixin, TortugaDbApi):
                 self._nodesDbHandler.expand_nodespec(
                     session,
                     nodespec,
-                    include_installer=include_installer),
+                    include_installer=include_installer,
+                    options=self.__get_loader_options(optionDict)),
                 optionDict=optionDict)
         except Exception as ex:
             if not isinstance(ex, TortugaException):
@@ -146,7 +151,9 @@ class NodeDbApi(TagsDbApiMixin, TortugaDbApi):
         try:
             return self.__convert_nodes_to_TortugaObjectList(
                 [self._nodesDbHandler.getNodeById(
-                    session, nodeId)], optionDict=optionDict)[0]
+                    session, nodeId,
+                    options=self.__get_loader_options(optionDict))],
+                optionDict=optionDict)[0]
         except TortugaException:
             raise
         except Exception as ex:
@@ -162,23 +169,45 @@ class NodeDbApi(TagsDbApiMixin, TortugaDbApi):
         try:
             return self.__convert_nodes_to_TortugaObjectList(
                 [self._nodesDbHandler.getNodeByIp(
-                    session, ip)], optionDict=optionDict)[0]
+                    session, ip,
+                    options=self.__get_loader_options(optionDict))],
+                optionDict=optionDict)[0]
         except TortugaException:
             raise
         except Exception as ex:
             self.getLogger().exception('%s' % ex)
             raise
 
+    def __get_loader_options(
+            self, optionDict: Optional[OptionsDict] = None,
+            resource_adapter: bool = True) -> list:
+        """
+        Return loader options for the relations requested in 'optionDict'
+        in addition to those always required to serialize a node.
+        """
+
+        options = dict.copy(optionDict or {})
+
+        # 'resourceadapter' is always required to serialize a node. This
+        # one is special since it's a relationship inside of a
+        # relationship. It needs to be explicitly defined.
+        if resource_adapter:
+            options['hardwareprofile.resourceadapter'] = True
+
+        return self.getLoaderOptions(NodeModel, options)
+
     def __convert_nodes_to_TortugaObjectList(
             self, nodes: List[NodeModel],
-            optionDict: Optional[OptionsDict] = None) -> TortugaObjectList:
+            optionDict: Optional[OptionsDict] = None,
+            resource_adapter: bool = True) -> TortugaObjectList:
         """
         Return TortugaObjectList of nodes with relations populated
 
-        :param nodes:      list of Node objects
+        :param nodes:            list of Node objects
         :param optionDict:
-        :param deleting:   whether or not to include nodes in the deleting
-                           state
+        :param resource_adapter: whether or not to load the resource
+                                 adapter (and hardware profile) of the
+                                 nodes
 
         :return: TortugaObjectList
 
@@ -186,22 +215,35 @@ class NodeDbApi(TagsDbApiMixin, TortugaDbApi):
         nodeList = TortugaObjectList()
 
         for node in nodes:
+            # relations are normally eager loaded by the query using the
+            # options returned by __get_loader_options(); this is a no-op
+            # unless the node was retrieved by other means
             self.loadRelations(node, optionDict)
 
-            # ensure 'resourceadapter' relation is always loaded. This one
-            # is special since it's a relationship inside of a relationship.
-            # It needs to be explicitly defined.
-            self.loadRelation(node.hardwareprofile, 'resourceadapter')
+            if resource_adapter:
+                self.loadRelation(node, 'hardwareprofile.resourceadapter')
 
             nodeList.append(Node.getFromDbDict(node.__dict__))
 
         return nodeList
 
     def getNodeList(self, session, tags: Optional[Tags] = None,
-                    optionDict: OptionsDict = None) -> TortugaObjectList:
+                    optionDict: OptionsDict = None,
+                    limit: Optional[int] = None,
+                    after: Optional[str] = None,
+                    resource_adapter: bool = True,
+                    filters: Optional[dict] = None) -> TortugaObjectList:
         """
         Get list of all available nodes from the db.
 
+        :param limit:            maximum number of nodes to return
+        :param after:            only return nodes sorted after the node
+                                 with this name
+        :param resource_adapter: whether or not to load the hardware
+                                 profile and resource adapter of the nodes
+        :param filters:          node filters, see
+                                 NodesDbHandler.build_node_filters()
+
             Returns:
                 [node]
             Throws:
@@ -210,8 +252,13 @@ class NodeDbApi(TagsDbApiMixin, TortugaDbApi):
 
         try:
             return self.__convert_nodes_to_TortugaObjectList(
-                self._nodesDbHandler.getNodeList(session, tags=tags),
-                optionDict=optionDict
+                self._nodesDbHandler.getNodeList(
+                    session, tags=tags,
+                    options=self.__get_loader_options(
+                        optionDict, resource_adapter=resource_adapter),
+                    limit=limit, after=after, filters=filters),
+                optionDict=optionDict,
+                resource_adapter=resource_adapter
             )
         except TortugaException:
             raise
@@ -293,7 +340,9 @@ class NodeDbApi(TagsDbApiMixin, TortugaDbApi):
         try:
             return self.__convert_nodes_to_TortugaObjectList(
                 self._nodesDbHandler.getNodesByNodeState(
-                    session, node_state), optionDict=optionDict)
+                    session, node_state,
+                    options=self.__get_loader_options(optionDict)),
+                optionDict=optionDict)
         except TortugaException:
             raise
         except Exception as ex:
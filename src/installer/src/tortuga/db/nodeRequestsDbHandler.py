@@ -38,6 +38,13 @@ class NodeRequestsDbHandler(TortugaDbObjectHandler):
         return session.query(NodeRequest).filter(
             NodeRequest.state == state).first()
 
+    def get_by_action_and_state(self, session: Session, action: str,
+                                state: str): \
+            # pylint: disable=no-self-use
+        return session.query(NodeRequest).filter(
+            NodeRequest.action == action,
+            NodeRequest.state == state).all()
+
     def get_by_addHostSession(self, session: Session,
                               add_host_session: str): \
             # pylint: disable=no-self-use
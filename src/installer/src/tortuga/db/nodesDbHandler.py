@@ -14,22 +14,80 @@
 
 # pylint: disable=not-callable,no-member,multiple-statements,no-self-use
 
-from typing import Dict, List, Optional, Tuple, Union
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from sqlalchemy import and_, func, or_
+from sqlalchemy import and_, func, not_, or_
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.session import Session
+from sqlalchemy.orm.strategy_options import Load
 from tortuga.config.configManager import getfqdn
 from tortuga.db.softwareProfilesDbHandler import SoftwareProfilesDbHandler
 from tortuga.db.tortugaDbObjectHandler import TortugaDbObjectHandler
+from tortuga.exceptions.invalidArgument import InvalidArgument
 from tortuga.exceptions.nodeNotFound import NodeNotFound
 
 from .models.nic import Nic
-from .models.node import Node
+from .models.node import Node, get_short_name
+from .models.hardwareProfile import HardwareProfile
 from .models.softwareProfile import SoftwareProfile
+from .models.softwareUsesHardware import SoftwareUsesHardware
 
 
 Tags = Dict[str, Optional[str]]
+LoaderOptions = Optional[List[Load]]
+
+#
+# Node attributes that may be used in node list filters
+#
+NODE_FILTERS = (
+    'name', 'state', 'softwareprofile', 'hardwareprofile', 'lockedState',
+    'isIdle', 'addHostSession',
+)
+
+
+_wildcards = re.compile('[%_]')
+
+
+def _get_name_criterion(pattern: str):
+    """
+    Return SQL criterion matching node names against SQL "LIKE" pattern
+    'pattern', using the indexed short host name where possible.
+
+    Patterns without a domain also match any domain. Host names without
+    wildcards (ie. "hostname-01") are matched on the short host name;
+    host names starting with a literal prefix (ie. "hostname-%") are
+    matched as a range of short host names.
+    """
+
+    host, _, domain = pattern.partition('.')
+
+    wildcard = _wildcards.search(host)
+
+    if wildcard is None:
+        criterion = Node.short_name == host.lower()
+
+        if not domain:
+            return criterion
+
+        return and_(criterion, Node.name.like(pattern))
+
+    name_criterion = Node.name.like(pattern) if domain else \
+        or_(Node.name.like(pattern), Node.name.like(pattern + '.%'))
+
+    prefix = host[:wildcard.start()].lower()
+    if not prefix:
+        return name_criterion
+
+    criterion = and_(
+        Node.short_name >= prefix,
+        Node.short_name < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+    if not domain and host[wildcard.start():] == '%':
+        # Pattern is a plain host name prefix
+        return criterion
+
+    return and_(criterion, name_criterion)
 
 
 class NodesDbHandler(TortugaDbObjectHandler):
@@ -42,25 +100,29 @@ class NodesDbHandler(TortugaDbObjectHandler):
 
         self._softwareProfilesDbHandler = SoftwareProfilesDbHandler()
 
-    def getNode(self, session: Session, name: str) -> Node:
+    def getNode(self, session: Session, name: str,
+                options: LoaderOptions = None) -> Node:
         """
         Return node.
 
+        :param options: optional list of SQLAlchemy loader options
+
         Raises:
             NodeNotFound
         """
 
+        q = session.query(Node).options(*(options or []))
+
         try:
             if '.' in name:
                 # Attempt exact match on fully-qualfied name
-                return session.query(Node).filter(
+                return q.filter(
+                    Node.short_name == get_short_name(name),
                     func.lower(Node.name) == name.lower()).one()
 
-            # 'name' is short host name; attempt to match on either short
-            # host name or any host starting with same host name
-            return session.query(Node).filter(
-                or_(func.lower(Node.name) == name.lower(),
-                    func.lower(Node.name).like(name.lower() + '.%'))).one()
+            # 'name' is short host name; match on the short host name of
+            # all nodes
+            return q.filter(Node.short_name == name.lower()).one()
         except NoResultFound:
             raise NodeNotFound("Node [%s] not found" % (name))
 
@@ -128,7 +190,8 @@ class NodesDbHandler(TortugaDbObjectHandler):
 
         return session.query(Node).filter(or_(*searchspec)).all()
 
-    def getNodesByAddHostSession(self, session: Session, ahSession: str) \
+    def getNodesByAddHostSession(self, session: Session, ahSession: str,
+                                 options: LoaderOptions = None) \
             -> List[Node]:
         """
         Get nodes by add host session
@@ -138,14 +201,15 @@ class NodesDbHandler(TortugaDbObjectHandler):
         self.getLogger().debug(
             'getNodesByAddHostSession(): ahSession [%s]' % (ahSession))
 
-        return session.query(Node).filter(
+        return session.query(Node).options(*(options or [])).filter(
             Node.addHostSession == ahSession).order_by(Node.name).all()
 
     def getNodesByNameFilter(
             self,
             session: Session,
             filter_spec: Union[str, list],
-            include_installer: Optional[bool] = True) -> List[Node]:
+            include_installer: Optional[bool] = True,
+            options: LoaderOptions = None) -> List[Node]:
         """
         Filter follows SQL "LIKE" semantics (ie. "something%")
 
@@ -155,38 +219,82 @@ class NodesDbHandler(TortugaDbObjectHandler):
         Returns a list of Node
         """
 
-        filter_spec_list = [filter_spec] \
-            if not isinstance(filter_spec, list) else filter_spec
-
-        node_filter = []
+        node_filter = self.__get_name_criteria(filter_spec)
 
-        for filter_spec_item in filter_spec_list:
-            if '.' not in filter_spec_item:
-                # Match exactly (ie. "hostname-01")
-                node_filter.append(Node.name.like(filter_spec_item))
-
-                # Match host name only (ie. "hostname-01.%")
-                node_filter.append(Node.name.like(filter_spec_item + '.%'))
-
-                continue
-
-            # Match fully-qualified node names exactly
-            # (ie. "hostname-01.domain")
-            node_filter.append(Node.name.like(filter_spec_item))
+        q = session.query(Node).options(*(options or []))
 
         if not include_installer:
             installer_fqdn = getfqdn()
 
-            return session.query(Node).filter(
+            return q.filter(
                 and_(
                     Node.name != installer_fqdn,
                     or_(*node_filter)
                 )
             ).all()
 
-        return session.query(Node).filter(or_(*node_filter)).all()
+        return q.filter(or_(*node_filter)).all()
 
-    def getNodeById(self, session: Session, _id: int) -> Node:
+    @staticmethod
+    def __get_name_criteria(filter_spec: Union[str, list]) -> list:
+        """
+        Return list of SQL criteria matching node names in 'filter_spec'
+        """
+
+        filter_spec_list = [filter_spec] \
+            if not isinstance(filter_spec, list) else filter_spec
+
+        return [_get_name_criterion(filter_spec_item)
+                for filter_spec_item in filter_spec_list]
+
+    def build_node_filters(self, filters: Dict[str, Any]) -> list:
+        """
+        Translate node list filters into SQL criteria. Filters look like
+        this:
+
+            attr=value
+            attr__ne=value
+
+        Where attr is one of NODE_FILTERS. The value may be a list, in
+        which case nodes matching any (or, with "__ne", none) of the
+        values are selected. The "name" filter takes a nodespec.
+
+        :raises InvalidArgument:
+
+        """
+        criteria = []
+
+        for key, value in filters.items():
+            attr, _, comparator = key.partition('__')
+
+            if attr not in NODE_FILTERS or comparator not in ('', 'ne'):
+                raise InvalidArgument(
+                    'Invalid node filter: {}'.format(key))
+
+            values = value if isinstance(value, (list, tuple)) else [value]
+
+            if attr == 'name':
+                clause = or_(*self.__get_name_criteria(
+                    [item for nodespec in values
+                     for item in self.build_node_filterspec(nodespec)]))
+            elif attr == 'softwareprofile':
+                clause = Node.softwareprofile.has(
+                    SoftwareProfile.name.in_(values))
+            elif attr == 'hardwareprofile':
+                clause = Node.hardwareprofile.has(
+                    HardwareProfile.name.in_(values))
+            else:
+                column = getattr(Node, attr)
+
+                clause = column == values[0] if len(values) == 1 \
+                    else column.in_(values)
+
+            criteria.append(not_(clause) if comparator == 'ne' else clause)
+
+        return criteria
+
+    def getNodeById(self, session: Session, _id: int,
+                    options: LoaderOptions = None) -> Node:
         """
         Return node.
 
@@ -196,14 +304,15 @@ class NodesDbHandler(TortugaDbObjectHandler):
 
         self.getLogger().debug('Retrieving node by ID [%s]' % (_id))
 
-        dbNode = session.query(Node).get(_id)
+        dbNode = session.query(Node).options(*(options or [])).get(_id)
 
         if not dbNode:
             raise NodeNotFound('Node ID [%s] not found.' % (_id))
 
         return dbNode
 
-    def getNodeByIp(self, session: Session, ip: str) -> Node:
+    def getNodeByIp(self, session: Session, ip: str,
+                    options: LoaderOptions = None) -> Node:
         """
         Raises:
             NodeNotFound
@@ -212,29 +321,47 @@ class NodesDbHandler(TortugaDbObjectHandler):
         self.getLogger().debug('Retrieving node by IP [%s]' % (ip))
 
         try:
-            return session.query(Node).join(Nic).filter(Nic.ip == ip).one()
+            return session.query(Node).options(*(options or [])).join(
+                Nic).filter(Nic.ip == ip).one()
         except NoResultFound:
             raise NodeNotFound(
                 'Node with IP address [%s] not found.' % (ip))
 
     def getNodeList(self, session: Session,
                     softwareProfile: Optional[str] = None,
-                    tags: Optional[Tags] = None) -> List[Node]:
+                    tags: Optional[Tags] = None,
+                    options: LoaderOptions = None,
+                    limit: Optional[int] = None,
+                    after: Optional[str] = None,
+                    filters: Optional[Dict[str, Any]] = None) -> List[Node]:
         """
         Get sorted list of nodes from the db.
 
+        :param options: optional list of SQLAlchemy loader options
+        :param limit:   maximum number of nodes to return
+        :param after:   only return nodes sorted after the node with this
+                        name (keyset pagination)
+        :param filters: node filters (see build_node_filters())
+
         Raises:
             SoftwareProfileNotFound
+            InvalidArgument
         """
 
         self.getLogger().debug('getNodeList()')
 
+        q = session.query(Node).options(*(options or []))
+
+        if filters:
+            q = q.filter(*self.build_node_filters(filters))
+
         if softwareProfile:
             dbSoftwareProfile = \
                 self._softwareProfilesDbHandler.getSoftwareProfile(
                     session, softwareProfile)
 
-            return dbSoftwareProfile.nodes
+            return q.filter(
+                Node.softwareProfileId == dbSoftwareProfile.id).all()
 
         searchspec = []
 
@@ -254,8 +381,17 @@ class NodesDbHandler(TortugaDbObjectHandler):
                     #
                     searchspec.append(Node.tags.any(name=name))
 
-        return session.query(Node).filter(
-            or_(*searchspec)).order_by(Node.name).all()
+        q = q.filter(or_(*searchspec))
+
+        if after:
+            q = q.filter(Node.name > after)
+
+        q = q.order_by(Node.name)
+
+        if limit:
+            q = q.limit(limit)
+
+        return q.all()
 
     def getNodeListByNodeStateAndSoftwareProfileName(
             self, session: Session, nodeState: str,
@@ -272,8 +408,90 @@ class NodesDbHandler(TortugaDbObjectHandler):
             SoftwareProfile.name == softwareProfileName,
             Node.state == nodeState)).all()
 
-    def getNodesByNodeState(self, session: Session, state: str) -> List[Node]:
-        return session.query(Node).filter(Node.state == state).all()
+    def getNodesByNodeState(self, session: Session, state: str,
+                            options: LoaderOptions = None) -> List[Node]:
+        return session.query(Node).options(*(options or [])).filter(
+            Node.state == state).all()
+
+    def getTransferCandidates(
+            self, session: Session, dstSoftwareProfile: SoftwareProfile,
+            srcSoftwareProfile: Optional[SoftwareProfile] = None,
+            lockedState: str = 'Unlocked',
+            state: Optional[str] = None,
+            limit: Optional[int] = None) -> List[Node]:
+        """
+        Get nodes that may be transferred to 'dstSoftwareProfile', ordered
+        by node id.
+
+        Candidates are in a hardware profile mapped to the destination
+        software profile, in software profile 'srcSoftwareProfile' if
+        specified, and otherwise in any software profile other than the
+        destination software profile.
+
+        :param lockedState: only return nodes with this lock state
+        :param state:       only return nodes in this state, if specified
+        :param limit:       maximum number of nodes to return
+        """
+
+        q = session.query(Node).filter(
+            Node.lockedState == lockedState,
+            Node.hardwareProfileId.in_(
+                session.query(SoftwareUsesHardware.hardwareProfileId).filter(
+                    SoftwareUsesHardware.softwareProfileId ==
+                    dstSoftwareProfile.id)))
+
+        if srcSoftwareProfile is not None:
+            q = q.filter(Node.softwareProfileId == srcSoftwareProfile.id)
+        else:
+            q = q.filter(or_(
+                Node.softwareProfileId.is_(None),
+                Node.softwareProfileId != dstSoftwareProfile.id))
+
+        if state is not None:
+            q = q.filter(Node.state == state)
+
+        q = q.order_by(Node.id)
+
+        if limit is not None:
+            q = q.limit(limit)
+
+        return q.all()
+
+    def getNodeCountsBySoftwareProfile(
+            self, session: Session, softwareProfileIds: List[int],
+            lock: bool = False) -> Dict[int, int]:
+        """
+        Get the number of nodes in each software profile, without loading
+        the nodes.
+
+        :param softwareProfileIds: the ids of the software profiles
+        :param lock:               lock the software profile rows until
+                                   the end of the transaction, so that
+                                   concurrent requests checking node limits
+                                   of the same software profiles are
+                                   serialized
+
+        :return: a dict of {software profile id: number of nodes}
+        """
+
+        if not softwareProfileIds:
+            return {}
+
+        if lock:
+            session.query(SoftwareProfile.id).filter(
+                SoftwareProfile.id.in_(softwareProfileIds)).order_by(
+                    SoftwareProfile.id).with_for_update().all()
+
+        counts = dict(
+            session.query(
+                Node.softwareProfileId, func.count(Node.id)).filter(
+                    Node.softwareProfileId.in_(softwareProfileIds)).group_by(
+                        Node.softwareProfileId))
+
+        return {
+            softwareProfileId: counts.get(softwareProfileId, 0)
+            for softwareProfileId in softwareProfileIds
+        }
 
     def getNodesByMac(self, session: Session, usedMacList: List[str]) \
             -> List[Node]:
@@ -306,8 +524,8 @@ class NodesDbHandler(TortugaDbObjectHandler):
         return filter_spec
 
     def expand_nodespec(self, session: Session, nodespec: str,
-                        include_installer: Optional[bool] = True) \
-            -> List[Node]:
+                        include_installer: Optional[bool] = True,
+                        options: LoaderOptions = None) -> List[Node]:
         """
         Expand command-line nodespec (ie. "compute*") to list of nodes
         """
@@ -315,5 +533,6 @@ class NodesDbHandler(TortugaDbObjectHandler):
         return self.getNodesByNameFilter(
             session,
             self.build_node_filterspec(nodespec),
-            include_installer=include_installer
+            include_installer=include_installer,
+            options=options
         )
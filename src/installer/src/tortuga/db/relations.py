@@ -0,0 +1,81 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.strategy_options import Load
+
+from tortuga.exceptions.invalidDbRelation import InvalidDbRelation
+
+
+OptionDict = Dict[str, bool]
+
+
+def get_loader_options(model, optionDict: Optional[OptionDict] = None) \
+        -> List[Load]:
+    """
+    Convert an 'optionDict' into SQLAlchemy loader options suitable for
+    passing to Query.options().
+
+    Keys of 'optionDict' are relation names of 'model' or dotted paths
+    of relation names (ie. 'hardwareprofile.resourceadapter'). Scalar
+    (many-to-one) relations are loaded using a JOIN, collections are
+    loaded using a single "SELECT ... IN" per relation, so the number of
+    round trips is independent of the number of rows returned.
+
+    :param model:      SQLAlchemy mapped class being queried
+    :param optionDict: dict of relation name/path and boolean flag
+
+    :return: list of loader options
+
+    :raises InvalidDbRelation:
+
+    """
+
+    if not optionDict:
+        return []
+
+    return [
+        _get_loader_option(model, path)
+        for path, enabled in optionDict.items() if enabled
+    ]
+
+
+def _get_loader_option(model, path: str) -> Load:
+    loader = None
+
+    cls = model
+
+    for name in path.split('.'):
+        relationship = inspect(cls).relationships.get(name)
+
+        if relationship is None:
+            raise InvalidDbRelation(
+                'Relation %s not valid for class %s' % (
+                    name, cls.__name__))
+
+        attr = getattr(cls, name)
+
+        if relationship.uselist:
+            loader = loader.selectinload(attr) \
+                if loader is not None else selectinload(attr)
+        else:
+            loader = loader.joinedload(attr) \
+                if loader is not None else joinedload(attr)
+
+        cls = relationship.mapper.class_
+
+    return loader
@@ -0,0 +1,138 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Brings the schema of an existing database up to date with the models.
+
+metadata.create_all() only creates missing tables; columns and indexes
+added to existing tables are created here. All steps are idempotent, and
+are run every time the database is initialized and whenever the web
+service or a Celery worker starts, possibly by several processes at the
+same time.
+
+"""
+
+from logging import getLogger
+
+import sqlalchemy
+from sqlalchemy.engine import Engine
+
+from .models.base import ModelBase
+from .models.node import Node, get_short_name
+
+
+logger = getLogger(__name__)
+
+#
+# Number of rows updated per statement when backfilling columns
+#
+BACKFILL_BATCH_SIZE = 500
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """
+    Add missing columns and indexes to existing tables
+
+    """
+
+    _add_node_short_name(engine)
+
+    _create_missing_indexes(engine)
+
+
+def _get_column_names(engine: Engine, table_name: str) -> set:
+    inspector = sqlalchemy.inspect(engine)
+
+    return {column['name'] for column in inspector.get_columns(table_name)}
+
+
+def _add_node_short_name(engine: Engine) -> None:
+    table = Node.__table__
+
+    if not engine.has_table(table.name):
+        # database not initialized yet
+        return
+
+    if 'short_name' not in _get_column_names(engine, table.name):
+        logger.info('Adding column {}.short_name'.format(table.name))
+
+        try:
+            engine.execute(
+                'ALTER TABLE {} ADD COLUMN short_name VARCHAR(255)'.format(
+                    table.name))
+        except sqlalchemy.exc.DBAPIError:
+            # added by another process in the meantime
+            if 'short_name' not in _get_column_names(engine, table.name):
+                raise
+
+    with engine.begin() as conn:
+        rows = conn.execute(
+            sqlalchemy.select([table.c.id, table.c.name]).where(
+                table.c.short_name.is_(None))).fetchall()
+
+        if rows:
+            logger.info(
+                'Backfilling short names of {} node(s)'.format(len(rows)))
+
+        stmt = table.update().where(
+            table.c.id == sqlalchemy.bindparam('node_id')).values(
+                short_name=sqlalchemy.bindparam('node_short_name'))
+
+        for idx in range(0, len(rows), BACKFILL_BATCH_SIZE):
+            conn.execute(stmt, [
+                {
+                    'node_id': row.id,
+                    'node_short_name': get_short_name(row.name),
+                } for row in rows[idx:idx + BACKFILL_BATCH_SIZE]
+            ])
+
+
+def _create_missing_indexes(engine: Engine) -> None:
+    inspector = sqlalchemy.inspect(engine)
+
+    existing_tables = set(inspector.get_table_names())
+
+    for table in ModelBase.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_indexes = {
+            index['name'] for index in inspector.get_indexes(table.name)}
+
+        existing_columns = {
+            column['name'] for column in inspector.get_columns(table.name)}
+
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+
+            if any(column.name not in existing_columns
+                   for column in index.columns):
+                logger.warning(
+                    'Unable to create index {}: missing column(s)'.format(
+                        index.name))
+
+                continue
+
+            logger.info('Creating index {}'.format(index.name))
+
+            try:
+                index.create(bind=engine)
+            except sqlalchemy.exc.DBAPIError:
+                # created by another process in the meantime
+                if index.name not in {
+                        index_['name'] for index_ in
+                        sqlalchemy.inspect(engine).get_indexes(
+                            table.name)}:
+                    raise
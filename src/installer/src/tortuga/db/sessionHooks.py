@@ -0,0 +1,67 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Callable, List, Union
+
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session
+from sqlalchemy.orm.session import Session, SessionTransaction
+
+
+CALLBACKS_KEY = 'tortuga.after_transaction'
+
+
+def call_after_transaction(session: Union[Session, scoped_session],
+                           callback: Callable[[], None]) -> None:
+    """
+    Calls 'callback' when the current transaction of 'session' ends,
+    whether it is committed or rolled back. Each callback is called at
+    most once per transaction.
+
+    :param session:  a database session, or a scoped session, in which
+                     case the session of the calling thread is used
+    :param callback: a function taking no arguments
+
+    """
+    if isinstance(session, scoped_session):
+        # listening on a scoped session would listen on the sessions of
+        # all threads
+        session = session()
+
+    callbacks: List[Callable[[], None]] = session.info.get(CALLBACKS_KEY)
+
+    if callbacks is None:
+        callbacks = session.info[CALLBACKS_KEY] = []
+
+        event.listen(session, 'after_transaction_end', _after_transaction_end)
+
+    if callback not in callbacks:
+        callbacks.append(callback)
+
+
+def _after_transaction_end(session: Session,
+                           transaction: SessionTransaction) -> None:
+    # ignore the end of subtransactions and savepoints
+    if transaction.parent is not None:
+        return
+
+    callbacks = session.info.get(CALLBACKS_KEY)
+    if not callbacks:
+        return
+
+    pending = list(callbacks)
+    del callbacks[:]
+
+    for callback in pending:
+        callback()
@@ -144,22 +144,27 @@ class SoftwareProfileDbApi(TagsDbApiMixin, TortugaDbApi):
                 DbError
         """
 
+        options = {
+            'components': True,
+            'partitions': True,
+            'hardwareprofiles': True,
+            'tags': True,
+        }
+
         try:
             dbSoftwareProfileList = \
                 self._softwareProfilesDbHandler.getSoftwareProfileList(
-                    session, tags=tags)
+                    session, tags=tags,
+                    options=self.getLoaderOptions(
+                        SoftwareProfileModel,
+                        dict(options, **{'components.kit': True})))
 
             softwareProfileList = TortugaObjectList()
 
             for dbSoftwareProfile in dbSoftwareProfileList:
                 softwareProfileList.append(
                     self.__get_software_profile_obj(
-                        dbSoftwareProfile, options={
-                            'components': True,
-                            'partitions': True,
-                            'hardwareprofiles': True,
-                            'tags': True,
-                        }))
+                        dbSoftwareProfile, options=options))
 
             return softwareProfileList
         except TortugaException:
@@ -19,6 +19,7 @@ from typing import Dict, List, Optional
 from sqlalchemy import and_, or_
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.session import Session
+from sqlalchemy.orm.strategy_options import Load
 
 from tortuga.db.componentsDbHandler import ComponentsDbHandler
 from tortuga.db.tortugaDbObjectHandler import TortugaDbObjectHandler
@@ -97,14 +98,17 @@ class SoftwareProfilesDbHandler(TortugaDbObjectHandler):
 
     def getSoftwareProfileList(
             self, session, tags: Optional[Tags] = None,
-            profile_type: Optional[str] = None) -> List[SoftwareProfile]:
+            profile_type: Optional[str] = None,
+            options: Optional[List[Load]] = None) -> List[SoftwareProfile]:
         """
         Get list of softwareProfiles from the db.
 
+        :param options: optional list of SQLAlchemy loader options
+
         """
         self.getLogger().debug('Retrieving software profile list')
 
-        q = session.query(SoftwareProfile)
+        q = session.query(SoftwareProfile).options(*(options or []))
 
         if profile_type:
             # filter by profile type
@@ -13,11 +13,15 @@
 # limitations under the License.
 
 import logging
-from typing import Dict
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm.strategy_options import Load
 
 from tortuga.exceptions.invalidDbRelation import InvalidDbRelation
 from tortuga.objects.tortugaObject import TortugaObjectList
 
+from .relations import get_loader_options
+
 
 class TortugaDbApi:
     """
@@ -34,18 +38,36 @@ class TortugaDbApi:
 
     def loadRelation(self, dbObject, relationName): \
             # pylint: disable=no-self-use
-        if relationName not in dir(dbObject):
-            raise InvalidDbRelation(
-                'Relation %s not valid for class %s' % (
-                    relationName, dbObject.__class__.__name__))
+        """
+        Load relation 'relationName' of 'dbObject'. 'relationName' may be
+        a dotted path of relations (ie. 'hardwareprofile.resourceadapter').
+        """
+
+        o = dbObject
 
-        o = None
+        for name in relationName.split('.'):
+            if o is None:
+                break
 
-        # pylint: disable=exec-used
-        exec('o = dbObject.%s' % (relationName))
+            if not hasattr(o, name):
+                raise InvalidDbRelation(
+                    'Relation %s not valid for class %s' % (
+                        name, o.__class__.__name__))
+
+            o = getattr(o, name)
 
         return o
 
+    def getLoaderOptions(self, model,
+                         optionDict: Optional[Dict[str, bool]] = None) \
+            -> List[Load]:  # pylint: disable=no-self-use
+        """
+        Return SQLAlchemy loader options for eager loading the relations
+        requested in 'optionDict' when querying 'model'.
+        """
+
+        return get_loader_options(model, optionDict)
+
     def loadRelations(self, dbObject,
                       optionDict: Dict[str, bool] = None) -> None:
         if optionDict:
@@ -0,0 +1,121 @@
+# Copyright 2008-2018 Univa Corporation
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Dispatches events to the Celery workers that run their listeners.
+Dispatch tasks are routed to a dedicated queue (see tortuga.tasks.celery).
+
+Each fired event is sent to the workers in a single task (one per
+distinct listener countdown), rather than in one task per listener.
+Events fired inside a batch() block are sent together when the block
+exits.
+
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from .listeners import get_all_listener_classes
+from .types import BaseEvent
+
+
+#
+# Maximum number of events sent in a single task
+#
+MAX_BATCH_SIZE = 100
+
+_batch = threading.local()
+
+
+def get_listener_groups(event: BaseEvent) -> Dict[Optional[int], List[str]]:
+    """
+    Gets the names of the listeners that should run for an event, grouped
+    by listener countdown.
+
+    :param BaseEvent event: the event
+
+    :return Dict[Optional[int], List[str]]: the listener names, keyed by
+                                            countdown
+
+    """
+    groups: Dict[Optional[int], List[str]] = {}
+
+    for listener_class in get_all_listener_classes():
+        if listener_class.should_run(event):
+            groups.setdefault(
+                listener_class.countdown, []).append(listener_class.name)
+
+    return groups
+
+
+def dispatch(event: BaseEvent):
+    """
+    Schedules the listeners of an event to run.
+
+    :param BaseEvent event: the event
+
+    """
+    groups = get_listener_groups(event)
+    if not groups:
+        return
+
+    event_dict = event.schema().dump(event).data
+
+    pending: Optional[dict] = getattr(_batch, 'pending', None)
+
+    for countdown, listener_names in groups.items():
+        item = {'event': event_dict, 'listeners': listener_names}
+
+        if pending is not None:
+            pending.setdefault(countdown, []).append(item)
+        else:
+            _send([item], countdown)
+
+
+@contextmanager
+def batch():
+    """
+    Context manager that sends the events fired in the block in as few
+    tasks as possible when the block exits. Listener countdowns start
+    when the block exits.
+
+    """
+    if getattr(_batch, 'pending', None) is not None:
+        #
+        # Nested; the outermost block sends the events
+        #
+        yield
+
+        return
+
+    _batch.pending = {}
+
+    try:
+        yield
+    finally:
+        pending, _batch.pending = _batch.pending, None
+
+        for countdown, items in pending.items():
+            for idx in range(0, len(items), MAX_BATCH_SIZE):
+                _send(items[idx:idx + MAX_BATCH_SIZE], countdown)
+
+
+def _send(items: List[dict], countdown: Optional[int]):
+    from .tasks import dispatch_events
+
+    kwargs = {}
+    if countdown is not None:
+        kwargs['countdown'] = countdown
+
+    dispatch_events.apply_async(args=[items], **kwargs)
@@ -115,7 +115,7 @@ class BaseListener(metaclass=ListenerMeta):
             if isinstance(event, event_type):
                 return True
 
-            return False
+        return False
 
     def run_if_required(self, event: BaseEvent):
         """
@@ -127,6 +127,31 @@ class BaseListener(metaclass=ListenerMeta):
         if self.should_run(event):
             self.run(event)
 
+    def run_batch_if_required(self, events: List[BaseEvent]):
+        """
+        Run the event listener for a batch of events, if required.
+
+        :param List[BaseEvent] events: the events to respond to, if
+                                       required
+
+        """
+        events = [event for event in events if self.should_run(event)]
+        if events:
+            self.run_batch(events)
+
+    def run_batch(self, events: List[BaseEvent]):
+        """
+        Run the listener for a batch of events, such as the events fired
+        in a dispatcher batch() block. By default, the listener is run for
+        each event in turn. Override this in implementations that can
+        handle many events more efficiently at once.
+
+        :param List[BaseEvent] events: the events to run this listener for
+
+        """
+        for event in events:
+            self.run(event)
+
     def run(self, event: BaseEvent):
         """
         Run the listener for the specified event. Override this in your
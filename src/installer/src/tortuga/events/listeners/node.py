@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import List
+
 from tortuga.node import state
 from .base import BaseListener
 from ..types import NodeStateChanged
@@ -38,28 +40,38 @@ class NodeProvisioningListener(BaseListener):
         # This listener should only run if the node state is
         # provisioned
         #
-        return event.node['state'] == 'Provisioned'
+        return event.node['state'] == 'Provisioned' and \
+            bool(event.node['name'])
 
     def run(self, event: NodeStateChanged):
-        if not event.node['name']:
-            return
+        self.run_batch([event])
+
+    def run_batch(self, events: List[NodeStateChanged]):
+        #
+        # The nodes of all events are checked, and marked unresponsive,
+        # at once
+        #
+        node_names = [event.node['name'] for event in events]
 
+        from tortuga.db.models.node import Node
         from tortuga.node.nodeManager import NodeManager
         from tortuga.tasks.celery import app
-        from tortuga.exceptions.nodeNotFound import NodeNotFound
 
         with app.dbm.session() as session:
-            manager: NodeManager = NodeManager()
+            #
+            # Nodes that have been deleted are not found; nothing to do
+            #
+            unresponsive_node_names = [
+                name for name, node_state in session.query(
+                    Node.name, Node.state).filter(
+                        Node.name.in_(node_names))
+                if node_state != state.NODE_STATE_INSTALLED
+            ]
 
-            try:
-                node = manager.getNode(session, event.node['name'])
+            if not unresponsive_node_names:
+                return
 
-                if node.getState() != state.NODE_STATE_INSTALLED:
-                    manager.updateNodeStatus(
-                        session,
-                        node.getName(),
-                        state.NODE_STATE_UNRESPONSIVE
-                    )
-            except NodeNotFound:
-                # node has been deleted; nothing to do
-                pass
+            NodeManager().updateNodesStatus(session, [
+                {'name': name, 'state': state.NODE_STATE_UNRESPONSIVE}
+                for name in unresponsive_node_names
+            ])
@@ -15,9 +15,10 @@
 from redis import Redis
 
 
+from tortuga.config.configManager import ConfigManager
 from tortuga.objectstore.manager import ObjectStoreManager
 from .pubsub import EventPubSub, RedisEventPubSub
-from .store import EventStore, ObjectStoreEventStore
+from .store import EventStore, RedisEventStore
 
 
 class EventStoreManager:
@@ -36,8 +37,10 @@ class EventStoreManager:
 
         """
         if not cls._event_store:
-            object_store = ObjectStoreManager.get('events')
-            cls._event_store = ObjectStoreEventStore(object_store)
+            cls._event_store = RedisEventStore(
+                ObjectStoreManager.get_redis_client(),
+                retention=ConfigManager().getEventRetention()
+            )
         return cls._event_store
 
 
@@ -50,10 +50,13 @@ class EventPubSub:
         """
         raise NotImplementedError()
 
-    def get_message(self) -> Optional[BaseEvent]:
+    def get_message(self, timeout: float = 0) -> Optional[BaseEvent]:
         """
         Get the next event in the queue if any.
 
+        :param float timeout: number of seconds to block waiting for an
+                              event; by default, return immediately
+
         :returns Optional[BaseEvent]: the next event, or None
 
         """
@@ -114,17 +117,20 @@ class RedisEventPubSub(EventPubSub):
         self._pubsub.unsubscribe()
         self._pubsub = None
 
-    def get_message(self) -> Optional[BaseEvent]:
+    def get_message(self, timeout: float = 0) -> Optional[BaseEvent]:
         """
         See superclass.
 
+        :param float timeout:
+
         :return Optional[BaseEvent]:
 
         """
         if not self._pubsub:
             raise Exception('No subscription')
 
-        msg = self._pubsub.get_message(ignore_subscribe_messages=True)
+        msg = self._pubsub.get_message(ignore_subscribe_messages=True,
+                                       timeout=timeout)
 
         if not msg:
             return None
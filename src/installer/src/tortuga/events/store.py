@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 from logging import getLogger
-from typing import Iterator, Optional
+from typing import Iterator, List, Optional, Tuple
 
 from tortuga.objectstore.base import matches_filters, ObjectStore
+from tortuga.objectstore.redis import deserialize, serialize
 from .types import BaseEvent, get_event_class
 
 
@@ -27,6 +29,11 @@ class EventStore:
     Base class for the event storage back-end.
 
     """
+    #
+    # Whether list() accepts a cursor, and get_cursor() is implemented
+    #
+    supports_cursor: bool = False
+
     def save(self, event: BaseEvent):
         """
         Saves the event to the event store.
@@ -53,6 +60,7 @@ class EventStore:
             order_desc: bool = False,
             order_alpha: bool = False,
             limit: Optional[int] = None,
+            cursor: Optional[str] = None,
             **filters) -> Iterator[BaseEvent]:
         """
         Gets a iterator of events from the event store.
@@ -62,6 +70,9 @@ class EventStore:
         :param bool order_alpha: order alphabetically (instead of numerically)
         :param int limit:        the number of objects to limit in the
                                  iterator
+        :param str cursor:       only return events after the event this
+                                 cursor was obtained from (see get_cursor()),
+                                 if supports_cursor is True
         :param filters:          one or more filters to apply to the list
 
         :return: an iterator of events
@@ -69,6 +80,19 @@ class EventStore:
         """
         raise NotImplementedError()
 
+    def get_cursor(self, event: BaseEvent) -> str:
+        """
+        Gets a cursor that can be passed to list() to continue listing
+        after the specified event. Only implemented if supports_cursor is
+        True.
+
+        :param BaseEvent event: the last event of a page of results
+
+        :return str: the cursor
+
+        """
+        raise NotImplementedError()
+
 
 class ObjectStoreEventStore(EventStore):
     """
@@ -122,6 +146,7 @@ class ObjectStoreEventStore(EventStore):
             order_desc: bool = False,
             order_alpha: bool = False,
             limit: Optional[int] = None,
+            cursor: Optional[str] = None,
             **filters) -> Iterator[BaseEvent]:
         """
         See superclass.
@@ -129,6 +154,9 @@ class ObjectStoreEventStore(EventStore):
         :return Iterator[BaseEvent]:
 
         """
+        if cursor is not None:
+            raise Exception('Cursor pagination is not supported')
+
         logger.debug(
             'list(order_by={}, order_desc={}, limit, filters={}) -> ...'.format(
                 order_by, order_desc, limit, filters
@@ -147,3 +175,321 @@ class ObjectStoreEventStore(EventStore):
                     return
 
                 yield obj
+
+
+class RedisEventStore(EventStore):
+    """
+    An implementation of the event store that saves events in Redis.
+
+    Each event is stored as a hash, and is added to sorted set indexes,
+    scored by the event timestamp, for all events, events of the same name
+    and events for the same node. Listing events is a range query on the
+    most specific index, continuing from a cursor, with the event hashes
+    fetched in a single pipelined round trip per page.
+
+    """
+    supports_cursor = True
+
+    #
+    # Number of events fetched from Redis per round trip when listing
+    #
+    PAGE_SIZE = 100
+
+    #
+    # Maximum number of expired events deleted when an event is saved
+    #
+    TRIM_SIZE = 100
+
+    def __init__(self, redis_client, namespace: str = 'events',
+                 retention: Optional[int] = None):
+        """
+        Initializer.
+
+        :param Redis redis_client: the (initialized) redis client to use
+        :param str namespace:      the namespace to use for storing events
+        :param int retention:      the number of seconds events are kept,
+                                   or None to keep events indefinitely
+
+        """
+        self._redis = redis_client
+        self._namespace = namespace
+        self.retention = retention
+
+    def _get_key_name(self, event_id: str) -> str:
+        return '{}:{}'.format(self._namespace, event_id)
+
+    def _get_index_key_name(self, *parts: str) -> str:
+        return ':'.join((self._namespace, 'INDEX') + parts)
+
+    def _get_index_key_names(self, event_dict: dict) -> List[str]:
+        """
+        Gets the names of all the indexes an event belongs to.
+
+        :param dict event_dict: the marshalled event
+
+        :return List[str]: the index key names
+
+        """
+        keys = [
+            self._get_index_key_name('timestamp'),
+            self._get_index_key_name('name', event_dict['name']),
+        ]
+
+        node = event_dict.get('node')
+        if isinstance(node, dict) and node.get('id') is not None:
+            keys.append(self._get_index_key_name('node', str(node['id'])))
+
+        return keys
+
+    @staticmethod
+    def _get_score(event: BaseEvent) -> float:
+        return event.timestamp.timestamp()
+
+    def save(self, event: BaseEvent):
+        """
+        See superclass.
+
+        :param BaseEvent event:
+
+        """
+        event_dict = event.schema().dump(event).data
+        score = self._get_score(event)
+
+        pipeline = self._redis.pipeline()
+        pipeline.hmset(self._get_key_name(event.id), serialize(event_dict))
+        for index_key in self._get_index_key_names(event_dict):
+            pipeline.zadd(index_key, {event.id: score})
+        pipeline.execute()
+
+        if self.retention:
+            self.trim(time.time() - self.retention)
+
+    def trim(self, before: float, max_events: Optional[int] = None) -> int:
+        """
+        Deletes events older than the specified time.
+
+        :param float before:   the cutoff, in seconds since the epoch
+        :param int max_events: the maximum number of events to delete,
+                               defaults to TRIM_SIZE
+
+        :return int: the number of events deleted
+
+        """
+        event_ids = [
+            event_id.decode() if isinstance(event_id, bytes) else event_id
+            for event_id in self._redis.zrangebyscore(
+                self._get_index_key_name('timestamp'), '-inf',
+                '({}'.format(before), start=0,
+                num=max_events or self.TRIM_SIZE)
+        ]
+
+        if not event_ids:
+            return 0
+
+        pipeline = self._redis.pipeline()
+        for event_id in event_ids:
+            pipeline.hgetall(self._get_key_name(event_id))
+        hashes = pipeline.execute()
+
+        pipeline = self._redis.pipeline()
+        for event_id, hsh in zip(event_ids, hashes):
+            if hsh:
+                index_keys = self._get_index_key_names(deserialize(hsh))
+            else:
+                index_keys = [self._get_index_key_name('timestamp')]
+
+            for index_key in index_keys:
+                pipeline.zrem(index_key, event_id)
+            pipeline.delete(self._get_key_name(event_id))
+        pipeline.execute()
+
+        logger.debug('trim({}) -> {} events deleted'.format(
+            before, len(event_ids)))
+
+        return len(event_ids)
+
+    def get(self, event_id: str) -> Optional[BaseEvent]:
+        """
+        See superclass.
+
+        :param str event_id:
+
+        :return BaseEvent:
+
+        """
+        hsh = self._redis.hgetall(self._get_key_name(event_id))
+        if not hsh:
+            return None
+        return self._unmarshall(deserialize(hsh))
+
+    def _unmarshall(self, event_dict: dict) -> BaseEvent:
+        """
+        Unmarshalls an event dict into an event class instance.
+
+        :param dict event_dict:
+        :return BaseEvent: the unmarshalled base event
+
+        """
+        event_class = get_event_class(event_dict['name'])
+        unmarshalled = event_class.schema().load(event_dict)
+        return event_class(**unmarshalled.data)
+
+    def get_cursor(self, event: BaseEvent) -> str:
+        """
+        See superclass.
+
+        :param BaseEvent event:
+
+        :return str:
+
+        """
+        return '{!r}:{}'.format(self._get_score(event), event.id)
+
+    def _parse_cursor(self, cursor: str) -> Tuple[float, str]:
+        try:
+            score, event_id = cursor.split(':', 1)
+            return float(score), event_id
+
+        except ValueError:
+            raise Exception('Invalid cursor: {}'.format(cursor))
+
+    def list(
+            self,
+            order_by: Optional[str] = None,
+            order_desc: bool = False,
+            order_alpha: bool = False,
+            limit: Optional[int] = None,
+            cursor: Optional[str] = None,
+            **filters) -> Iterator[BaseEvent]:
+        """
+        See superclass.
+
+        Events are returned in timestamp order. Filtering by event name or
+        node id (node__id) uses the respective index; any other filters are
+        applied as the events are read. Ordering by anything other than the
+        timestamp requires all matching events to be read and sorted, and
+        cannot be combined with a cursor.
+
+        :return Iterator[BaseEvent]:
+
+        """
+        logger.debug(
+            'list(order_by={}, order_desc={}, limit={}, cursor={}, '
+            'filters={}) -> ...'.format(
+                order_by, order_desc, limit, cursor, filters
+            )
+        )
+
+        if order_by and order_by != 'timestamp':
+            if cursor is not None:
+                raise Exception(
+                    'Cursor pagination requires events to be ordered by'
+                    ' timestamp')
+
+            events = sorted(self._list(False, None, None, filters),
+                            key=lambda event: getattr(event, order_by),
+                            reverse=order_desc)
+
+            yield from events[:limit] if limit else events
+
+            return
+
+        yield from self._list(order_desc, limit, cursor, filters)
+
+    def _list(self, order_desc: bool, limit: Optional[int],
+              cursor: Optional[str], filters: dict) -> Iterator[BaseEvent]:
+        filters = dict(filters)
+
+        if 'name' in filters:
+            index_key = self._get_index_key_name(
+                'name', str(filters.pop('name')))
+        elif 'node__id' in filters:
+            index_key = self._get_index_key_name(
+                'node', str(filters.pop('node__id')))
+        else:
+            index_key = self._get_index_key_name('timestamp')
+
+        position = self._parse_cursor(cursor) if cursor else None
+
+        count = 0
+        while True:
+            entries, exhausted = self._get_range(
+                index_key, position, order_desc)
+
+            pipeline = self._redis.pipeline()
+            for event_id, _ in entries:
+                pipeline.hgetall(self._get_key_name(event_id))
+            hashes = pipeline.execute() if entries else []
+
+            for (event_id, score), hsh in zip(entries, hashes):
+                position = (score, event_id)
+
+                #
+                # The event may have been trimmed since the index was read
+                #
+                if not hsh:
+                    continue
+
+                event = self._unmarshall(deserialize(hsh))
+                if not matches_filters(event, filters):
+                    continue
+
+                yield event
+
+                count += 1
+                if limit and count >= limit:
+                    return
+
+            if exhausted:
+                return
+
+    def _get_range(self, index_key: str,
+                   position: Optional[Tuple[float, str]],
+                   order_desc: bool) \
+            -> Tuple[List[Tuple[str, float]], bool]:
+        """
+        Reads the next page of (event id, score) tuples from an index,
+        following the specified position.
+
+        :return: the page, and whether or not the index is exhausted
+
+        """
+        if order_desc:
+            range_func = self._redis.zrevrangebyscore
+            start, end = '+inf', '-inf'
+        else:
+            range_func = self._redis.zrangebyscore
+            start, end = '-inf', '+inf'
+
+        if position is not None:
+            start = position[0]
+
+        offset = 0
+        while True:
+            raw = [
+                (event_id.decode() if isinstance(event_id, bytes)
+                 else event_id, float(score))
+                for event_id, score in range_func(
+                    index_key, start, end, start=offset,
+                    num=self.PAGE_SIZE, withscores=True)
+            ]
+            exhausted = len(raw) < self.PAGE_SIZE
+
+            if position is None:
+                return raw, exhausted
+
+            #
+            # Events sharing the score of the position are ordered by id,
+            # so skip over those up to and including the position itself
+            #
+            entries = [
+                (event_id, score) for event_id, score in raw
+                if score != position[0] or (
+                    event_id < position[1] if order_desc
+                    else event_id > position[1])
+            ]
+
+            if entries or exhausted:
+                return entries, exhausted
+
+            offset += len(raw)
@@ -11,7 +11,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Type
+from logging import getLogger
+from typing import Dict, List, Type
 
 from tortuga.events.types import BaseEvent, get_event_class
 from tortuga.tasks.celery import app
@@ -19,29 +20,78 @@ from tortuga.tasks.celery import app
 from .listeners import get_listnener_class, BaseListener
 
 
+logger = getLogger(__name__)
+
+#
+# Listener instances, keyed on listener class, reused by all tasks run by
+# this worker process
+#
+_listeners: Dict[Type[BaseListener], BaseListener] = {}
+
+
+def _get_listener(listener_name: str) -> BaseListener:
+    listener_class: Type[BaseListener] = get_listnener_class(listener_name)
+
+    listener = _listeners.get(listener_class)
+    if listener is None:
+        listener = listener_class(app.app)
+        _listeners[listener_class] = listener
+
+    return listener
+
+
+def _load_event(event_dict: dict) -> BaseEvent:
+    event_class = get_event_class(event_dict['name'])
+    unmarshalled = event_class.schema().load(event_dict)
+
+    return event_class(**unmarshalled.data)
+
+
+@app.task()
+def dispatch_events(items: List[dict]):
+    """
+    A celery task that runs the listeners for a batch of events. Each
+    listener is run once, for all of its events (see
+    BaseListener.run_batch()). Errors raised by a listener are logged, and
+    do not prevent other listeners from running.
+
+    :param List[dict] items: the events, as dicts containing the 'event',
+                             serialized as a dict, and the names of the
+                             'listeners' to run
+
+    """
+    listener_events: Dict[str, List[BaseEvent]] = {}
+
+    for item in items:
+        try:
+            event = _load_event(item['event'])
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Unable to load event: {}'.format(
+                item['event']))
+
+            continue
+
+        for listener_name in item['listeners']:
+            listener_events.setdefault(listener_name, []).append(event)
+
+    for listener_name, events in listener_events.items():
+        try:
+            _get_listener(listener_name).run_batch_if_required(events)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                'Event listener {} failed for event(s) {}'.format(
+                    listener_name, ', '.join(event.id for event in events)))
+
+
 @app.task()
 def run_event_listener(listener_name: str, event_dict: dict):
     """
     A celery task that runs the event listener for the specified event.
+    Events are now dispatched by dispatch_events(); this task is kept for
+    tasks queued before the upgrade.
 
     :param str listener_name: the listener name
     :param dict event_dict:   the event, serialized as a dict
 
     """
-    #
-    # Load the event listener
-    #
-    listener_class: Type[BaseListener] = get_listnener_class(listener_name)
-    listener: BaseListener = listener_class(app.app)
-
-    #
-    # Unmarshall the event
-    #
-    event_class = get_event_class(event_dict['name'])
-    unmarshalled = event_class.schema().load(event_dict)
-    event: BaseEvent = event_class(**unmarshalled.data)
-
-    #
-    # Run the event listener
-    #
-    listener.run_if_required(event)
+    _get_listener(listener_name).run_if_required(_load_event(event_dict))
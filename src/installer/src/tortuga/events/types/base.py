@@ -167,16 +167,6 @@ class BaseEvent(metaclass=EventMeta):
         :param BaseEvent event:
 
         """
-        from ..listeners import get_all_listener_classes
-        from ..tasks import run_event_listener
-
-        event_dict = event.schema().dump(event).data
-        for listener_class in get_all_listener_classes():
-            if listener_class.should_run(event):
-                kwargs = {}
-                if listener_class.countdown is not None:
-                    kwargs['countdown'] = listener_class.countdown
-                run_event_listener.apply_async(
-                    args=[listener_class.name, event_dict],
-                    **kwargs
-                )
+        from ..dispatcher import dispatch
+
+        dispatch(event)
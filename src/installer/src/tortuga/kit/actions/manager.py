@@ -14,9 +14,10 @@
 
 # pylint: disable=no-name-in-module,no-member
 
-from typing import List
+from typing import List, Optional
 
 from tortuga.kit.registry import get_all_kit_installers
+from . import registry
 from tortuga.objects.node import Node
 from tortuga.objects.tortugaObjectManager import TortugaObjectManager
 
@@ -93,6 +94,28 @@ class KitActionsManager(TortugaObjectManager):
             'add_host'
         )
 
+    def abort_add_host(
+            self, hardware_profile_name: str,
+            software_profile_name: Optional[str]) -> None:
+        """
+        Called on the installer node when the add host workflow ends
+        without post add host processing.
+        """
+
+        self.getLogger().debug(
+            'abort_add_host: {}, {}'.format(
+                hardware_profile_name, software_profile_name
+            )
+        )
+
+        for component_installer in self._get_enabled_component_installers(
+                self._get_all_component_installers()):
+            component_installer.run_action(
+                'abort_add_host',
+                hardware_profile_name,
+                software_profile_name
+            )
+
     def refresh(self, software_profile_list, *args, **kwargs):
         self.getLogger().debug('refresh: {} {} kargs {}'.format(software_profile_list,
                                                       args, kwargs))
@@ -176,25 +199,17 @@ class KitActionsManager(TortugaObjectManager):
     def _get_all_component_installers(self, base_kit_order='first'):
         all_components = []
         for kit_installer_class in self._load_kits(base_kit_order):
-            kit_installer = kit_installer_class()
-            kit_installer.session = self.session
+            kit_installer = registry.get_kit_installer(
+                self.session, kit_installer_class)
             all_components.extend(
                 kit_installer.get_all_component_installers())
         return all_components
 
     def _get_enabled_component_installers(self, component_list):
-        from tortuga.db.softwareProfileDbApi import SoftwareProfileDbApi
-
-        enabled_components = []
-        api = SoftwareProfileDbApi()
-
-        db_enabled_components = api.getAllEnabledComponentList(self.session)
-        for component in component_list:
-            for db_component in db_enabled_components:
-                if component.name == db_component.getName():
-                    enabled_components.append(component)
-                    break
-        return enabled_components
+        enabled_names = registry.get_enabled_component_names(self.session)
+
+        return [component for component in component_list
+                if component.name in enabled_names]
 
     def _run_action_with_node_list(self, component_installer_list,
                                    hardware_profile_name,
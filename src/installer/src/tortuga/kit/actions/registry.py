@@ -0,0 +1,158 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Process-level registry of kit installer and component installer
+instances, and of the components enabled on each software profile.
+
+Kit and component installers are bound to a database session, so
+instances are shared by all callers in the same thread and rebound to
+the caller's session. The index of enabled components is shared by all
+threads, and is invalidated in all processes by invalidate(), which must
+be called whenever kits are installed or deleted, or components are
+enabled or disabled. Pass the session making the change, so that the
+registry is invalidated again once the change is committed.
+
+"""
+
+import threading
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from tortuga.objectstore.generation import Generation
+
+
+GENERATION_KEY = 'kits:generation'
+
+_generation = Generation(GENERATION_KEY, 'kit registry')
+
+_thread_data = threading.local()
+
+#
+# (generation, {software profile id: component names}); the None key
+# holds the names of components enabled on any software profile
+#
+_enabled_components: Optional[Tuple[Tuple[int, int], Dict]] = None
+_enabled_components_lock = threading.Lock()
+
+
+def invalidate(session: Optional[Session] = None):
+    """
+    Invalidates the registry in all processes.
+
+    :param session: the database session making the change, if any. The
+                    registry is invalidated again when its transaction
+                    ends, as other sessions may rebuild the index from
+                    the uncommitted state in the meantime.
+
+    """
+    _generation.invalidate(session)
+
+
+def get_generation() -> Optional[Tuple[int, int]]:
+    """
+    :return: the current generation, or None if it cannot be determined
+
+    """
+    return _generation.get()
+
+
+def get_kit_installer(session: Session, kit_installer_class):
+    """
+    Gets the kit installer instance for 'kit_installer_class', bound to
+    'session'. Component installers loaded by the kit installer are
+    cached along with it.
+
+    :param session:             a database session
+    :param kit_installer_class: a subclass of KitInstallerBase
+
+    :return: a kit installer instance
+
+    """
+    generation = get_generation()
+
+    if generation is None:
+        #
+        # Changes made by other processes cannot be detected
+        #
+        kit_installer = kit_installer_class()
+        kit_installer.session = session
+
+        return kit_installer
+
+    if getattr(_thread_data, 'generation', None) != generation:
+        _thread_data.kit_installers = {}
+        _thread_data.generation = generation
+
+    kit_installer = _thread_data.kit_installers.get(kit_installer_class)
+
+    if kit_installer is None:
+        kit_installer = kit_installer_class()
+
+        _thread_data.kit_installers[kit_installer_class] = kit_installer
+
+    kit_installer.session = session
+
+    return kit_installer
+
+
+def _load_enabled_components(session: Session) -> Dict:
+    from tortuga.db.models.component import Component
+    from tortuga.db.models.softwareProfileComponent import \
+        SoftwareProfileComponent
+
+    index: Dict[Optional[int], set] = {None: set()}
+
+    for software_profile_id, component_name in session.query(
+            SoftwareProfileComponent.softwareProfileId,
+            Component.name).join(
+                Component,
+                Component.id == SoftwareProfileComponent.componentId):
+        index.setdefault(software_profile_id, set()).add(component_name)
+        index[None].add(component_name)
+
+    return {key: frozenset(value) for key, value in index.items()}
+
+
+def get_enabled_component_names(
+        session: Session,
+        software_profile_id: Optional[int] = None) -> FrozenSet[str]:
+    """
+    Gets the names of the components enabled on a software profile.
+
+    :param session:             a database session
+    :param software_profile_id: the software profile id, or None for
+                                components enabled on any software profile
+
+    :return: a set of component names
+
+    """
+    global _enabled_components
+
+    generation = get_generation()
+
+    with _enabled_components_lock:
+        if generation is not None and _enabled_components is not None and \
+                _enabled_components[0] == generation:
+            return _enabled_components[1].get(
+                software_profile_id, frozenset())
+
+    index = _load_enabled_components(session)
+
+    if generation is not None:
+        with _enabled_components_lock:
+            _enabled_components = generation, index
+
+    return index.get(software_profile_id, frozenset())
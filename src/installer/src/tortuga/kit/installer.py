@@ -198,6 +198,13 @@ class KitInstallerBase(ConfigurableMixin, metaclass=KitInstallerMeta):
     puppet_modules = []
     task_modules = []
 
+    #
+    # Set if action_get_metadata() returns data that may change without
+    # kits, components or software profiles changing; the metadata of
+    # other kits is cached
+    #
+    metadata_volatile = False
+
     def __init__(self):
         self.config_manager = ConfigManager()
 
@@ -233,6 +240,20 @@ class KitInstallerBase(ConfigurableMixin, metaclass=KitInstallerMeta):
 
         self.session = None
 
+    @property
+    def session(self):
+        return self._session
+
+    @session.setter
+    def session(self, value):
+        #
+        # Component installers share the session of their kit installer
+        #
+        self._session = value
+
+        for comp_inst in self._component_installers.values():
+            comp_inst.session = value
+
     def get_config_base(self):
         return self.config_manager.getKitConfigBase()
 
@@ -674,6 +695,22 @@ class ComponentInstallerBase(ConfigurableMixin):
                 self.kit_installer.puppet_modules[0].split('-')[-1]
         return '{}::{}'.format(default_module, self.name.lower())
 
+    def action_abort_add_host(self, hardware_profile_name,
+                              software_profile_name, *args, **kwargs):
+        """
+        This hook is invoked on the installer when adding hosts failed,
+        or ended without invoking the add_host hook, for example because
+        the hosts were added idle. The pre_add_host hook may have been
+        invoked for some of the hosts.
+
+        :param hardware_profile_name: the name of the hosts hardware profile
+        :param software_profile_name: the name of the hosts software profile
+        :param args:
+        :param kwargs:
+
+        """
+        pass
+
     def action_add_host(self, hardware_profile_name, software_profile_name,
                         nodes, *args, **kwargs):
         """
@@ -38,6 +38,7 @@ from tortuga.exceptions.softwareProfileComponentAlreadyExists import \
 from tortuga.exceptions.unrecognizedKitMedia import UnrecognizedKitMedia
 from tortuga.helper import osHelper
 from tortuga.kit import utils
+from tortuga.kit.actions import registry as kit_actions_registry
 from tortuga.kit.mountManager import MountManager
 from tortuga.kit.utils import format_kit_descriptor
 from tortuga.objects.component import Component
@@ -262,6 +263,8 @@ class KitManager(TortugaObjectManager):
                         installer.spec, time.ctime())
                 )
 
+            kit_actions_registry.invalidate(session)
+
             return kit
 
     def _check_if_kit_exists(self, session: Session, kit):
@@ -674,6 +677,8 @@ class KitManager(TortugaObjectManager):
         else:
             self._delete_kit(session, kit, force)
 
+        kit_actions_registry.invalidate(session)
+
         self.getLogger().info('Deleted kit: {}'.format(kit))
 
     def _delete_kit(self, session, kit, force):
@@ -24,6 +24,7 @@ from tortuga.exceptions.resourceAdapterAlreadyExists import \
 from tortuga.hardwareprofile.hardwareProfileFactory import \
     getHardwareProfileApi
 from tortuga.kit.installer import ComponentInstallerBase
+from tortuga.resourceAdapter import resourceAdapterFactory
 from ..utils import pip_install_requirements
 
 
@@ -34,6 +35,12 @@ class ResourceAdapterMixin:
     config_files = []
     resource_adapter_name = None
 
+    #
+    # The ResourceAdapter subclass provided by the kit. If not set, the
+    # resource adapter packages are scanned again when it is registered.
+    #
+    resource_adapter_class = None
+
     def _get_kit_id(self, session):
         for kit in KitDbApi().getKitList(session):
             if kit.getName() == self.name:
@@ -59,11 +66,20 @@ class ResourceAdapterMixin:
             #
             logger.info('Resource adapter already registered, skipping')
 
+        if self.resource_adapter_class:
+            resourceAdapterFactory.register_resourceadapter_class(
+                self.resource_adapter_class)
+        else:
+            resourceAdapterFactory.refresh()
+
     def unregister_resource_adapter(self, session):
         resource_adapter_api = ResourceAdapterDbApi()
         resource_adapter_api.deleteResourceAdapter(
             session, self.resource_adapter_name)
 
+        resourceAdapterFactory.unregister_resourceadapter_class(
+            self.resource_adapter_name)
+
     def action_post_install(self, *args, **kwargs):
         super().action_post_install(*args, **kwargs)
         #
@@ -0,0 +1,124 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from tortuga.db.models.hardwareProfile import HardwareProfile
+from tortuga.db.models.instanceMapping import InstanceMapping
+from tortuga.db.models.nic import Nic
+from tortuga.db.models.node import Node
+from tortuga.db.models.nodeTag import NodeTag
+from tortuga.db.models.softwareProfile import SoftwareProfile
+from tortuga.objectstore.manager import ObjectStoreManager
+
+
+logger = logging.getLogger(__name__)
+
+
+#
+# Models included in the serialized representation of a node
+#
+NODE_MODELS = (
+    Node, Nic, NodeTag, InstanceMapping, HardwareProfile, SoftwareProfile,
+)
+
+COUNTER_KEY = 'nodes:generation'
+
+
+def get_node_generation() -> Optional[int]:
+    """
+    Gets the cluster-wide node generation, a number that changes whenever
+    a node is added, changed or deleted.
+
+    :return int: the node generation, or None if it is not available
+
+    """
+    try:
+        redis_client = ObjectStoreManager.get_redis_client()
+
+        #
+        # The counter is seeded with the current time, so that it does not
+        # repeat values handed out before the key was lost
+        #
+        pipe = redis_client.pipeline()
+        pipe.set(COUNTER_KEY, int(time.time() * 1000), nx=True)
+        pipe.get(COUNTER_KEY)
+
+        return int(pipe.execute()[1])
+    except Exception as ex:
+        logger.warning('Unable to get node generation: {}'.format(ex))
+
+        return None
+
+
+def increment_node_generation():
+    """
+    Records that nodes have been changed.
+
+    """
+    try:
+        redis_client = ObjectStoreManager.get_redis_client()
+
+        pipe = redis_client.pipeline()
+        pipe.set(COUNTER_KEY, int(time.time() * 1000), nx=True)
+        pipe.incr(COUNTER_KEY)
+        pipe.execute()
+    except Exception as ex:
+        logger.warning('Unable to update node generation: {}'.format(ex))
+
+
+def _after_flush(session: Session, flush_context):
+    if session.info.get('nodes_changed'):
+        return
+
+    for obj in set(session.new) | set(session.dirty) | set(session.deleted):
+        if isinstance(obj, NODE_MODELS):
+            session.info['nodes_changed'] = True
+
+            break
+
+
+def _after_bulk_operation(context):
+    if context.mapper.class_ in NODE_MODELS:
+        context.session.info['nodes_changed'] = True
+
+
+def _after_commit(session: Session):
+    if session.info.pop('nodes_changed', False):
+        increment_node_generation()
+
+
+def _after_rollback(session: Session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop('nodes_changed', None)
+
+
+def track_node_changes(session_factory):
+    """
+    Increments the node generation whenever a session created by
+    'session_factory' commits changes to nodes.
+
+    :param session_factory: a sessionmaker
+
+    """
+    event.listen(session_factory, 'after_flush', _after_flush)
+    event.listen(session_factory, 'after_bulk_update', _after_bulk_operation)
+    event.listen(session_factory, 'after_bulk_delete', _after_bulk_operation)
+    event.listen(session_factory, 'after_commit', _after_commit)
+    event.listen(session_factory, 'after_soft_rollback', _after_rollback)
@@ -14,7 +14,7 @@
 
 # pylint: disable=no-member,too-many-public-methods,try-except-raise
 
-from typing import List, Optional, Union, Dict, Tuple
+from typing import Any, List, Optional, Union, Dict, Tuple
 
 from sqlalchemy.orm.session import Session
 
@@ -60,7 +60,13 @@ class NodeApi(TortugaApi):
             raise TortugaException(exception=ex)
 
     def getNodeList(self, session,
-                    tags: Optional[Tags] = None) -> TortugaObjectList:
+                    tags: Optional[Tags] = None,
+                    limit: Optional[int] = None,
+                    after: Optional[str] = None,
+                    fields: Optional[List[str]] = None,
+                    filters: Optional[dict] = None,
+                    optionDict: Optional[OptionDict] = None) \
+            -> TortugaObjectList:
         """
         Get node list..
 
@@ -70,7 +76,9 @@ class NodeApi(TortugaApi):
                 TortugaException
         """
         try:
-            return self._nodeManager.getNodeList(session, tags=tags)
+            return self._nodeManager.getNodeList(
+                session, tags=tags, limit=limit, after=after, fields=fields,
+                filters=filters, optionDict=optionDict)
         except TortugaException:
             raise
         except Exception as ex:
@@ -193,6 +201,18 @@ class NodeApi(TortugaApi):
 
             raise TortugaException(exception=ex)
 
+    def updateNodesStatus(self, session: Session,
+                          updates: List[Dict[str, Any]]) \
+            -> Dict[str, Optional[bool]]:
+        try:
+            return self._nodeManager.updateNodesStatus(session, updates)
+        except TortugaException:
+            raise
+        except Exception as ex:
+            self.getLogger().exception('Fatal error updating node status')
+
+            raise TortugaException(exception=ex)
+
     def transferNodes(self, session: Session,
                       dstSoftwareProfile: str,
                       *,
@@ -27,7 +27,7 @@ from tortuga.addhost.addHostServerLocal import AddHostServerLocal
 from tortuga.config.configManager import ConfigManager
 from tortuga.db.models.hardwareProfile import \
     HardwareProfile as HardwareProfileModel
-from tortuga.db.models.node import Node as NodeModel
+from tortuga.db.models.node import Node as NodeModel, get_short_name
 from tortuga.db.models.nodeRequest import NodeRequest
 from tortuga.db.models.softwareProfile import \
     SoftwareProfile as SoftwareProfileModel
@@ -59,6 +59,11 @@ from . import state
 
 OptionDict = Dict[str, bool]
 
+#
+# Maximum number of node names per query when looking up nodes by name
+#
+NODE_NAME_BATCH_SIZE = 500
+
 
 class NodeManager(TortugaObjectManager): \
         # pylint: disable=too-many-public-methods
@@ -202,17 +207,42 @@ class NodeManager(TortugaObjectManager): \
                 optionDict=get_default_relations(optionDict))])[0]
 
     def getNodeList(self, session, tags=None,
-                    optionDict: Optional[OptionDict] = None) -> List[Node]:
+                    optionDict: Optional[OptionDict] = None,
+                    limit: Optional[int] = None,
+                    after: Optional[str] = None,
+                    fields: Optional[List[str]] = None,
+                    filters: Optional[Dict[str, Any]] = None) -> List[Node]:
         """
         Return all nodes
 
+        :param limit:   maximum number of nodes to return
+        :param after:   only return nodes sorted after the node with this
+                        name
+        :param fields:  node attributes required by the caller; relations
+                        not listed are not loaded. Defaults to all.
+        :param filters: node filters, evaluated by the database (see
+                        NodesDbHandler.build_node_filters())
+
         """
+        relations = get_default_relations(optionDict)
+
+        if fields is not None:
+            relations = {
+                key: value for key, value in relations.items()
+                if key.split('.', 1)[0] in fields
+            }
+
         return self.__populate_nodes(
             session,
             self._nodeDbApi.getNodeList(
                 session,
                 tags=tags,
-                optionDict=get_default_relations(optionDict)
+                optionDict=relations,
+                limit=limit,
+                after=after,
+                filters=filters,
+                resource_adapter=fields is None or
+                'hardwareprofile' in fields
             )
         )
 
@@ -397,6 +427,155 @@ class NodeManager(TortugaObjectManager): \
 
         return result
 
+    def updateNodesStatus(self, session: Session,
+                          updates: List[Dict[str, Any]]) \
+            -> Dict[str, Optional[bool]]:
+        """Update status of multiple nodes
+
+        'updates' is a list of dicts containing the node 'name' and,
+        optionally, 'state' and 'bootFrom', as in updateNodeStatus(). All
+        nodes are loaded by a single query and updated in a single
+        transaction. PXE files are only rewritten for nodes whose
+        'bootFrom' changed, and the NodeStateChanged events of all nodes
+        whose state changed are dispatched together.
+
+        Returns:
+            dict of node name to bool indicating whether state and/or
+            bootFrom differed from current value, or None if the node
+            was not found
+        """
+
+        result: Dict[str, Optional[bool]] = {}
+
+        if not updates:
+            return result
+
+        dbNodes = self.__get_nodes_by_name(
+            session, [update['name'] for update in updates])
+
+        lastUpdate = time.strftime(
+            '%Y-%m-%d %H:%M:%S', time.localtime(time.time()))
+
+        pxe_nodes: List[NodeModel] = []
+        state_changes: List[dict] = []
+
+        for update in updates:
+            dbNode = dbNodes.get(update['name'])
+            if dbNode is None:
+                self.getLogger().warning(
+                    'Node [%s] not found' % (update['name']))
+
+                result[update['name']] = None
+
+                continue
+
+            node_state = update.get('state')
+            bootFrom = update.get('bootFrom')
+
+            previous_state = dbNode.state
+
+            changed = False
+
+            if node_state is not None and node_state != dbNode.state:
+                self.getLogger().info(
+                    'Node [%s] state change: state: [%s] -> [%s]' % (
+                        dbNode.name, dbNode.state, node_state))
+
+                dbNode.state = node_state
+
+                state_changes.append({
+                    'node': dbNode,
+                    'previous_state': previous_state,
+                })
+
+                changed = True
+
+            if bootFrom is not None and bootFrom != dbNode.bootFrom:
+                self.getLogger().info(
+                    'Node [%s] state change: bootFrom: [%d] -> [%d]' % (
+                        dbNode.name, dbNode.bootFrom, bootFrom))
+
+                dbNode.bootFrom = bootFrom
+
+                # Only change local boot configuration if the hardware
+                # profile is not marked as 'remote' and we're not acting
+                # on the installer node.
+                if dbNode.softwareprofile and \
+                        dbNode.softwareprofile.type != 'installer' and \
+                        dbNode.hardwareprofile.location != 'remote' and \
+                        dbNode not in pxe_nodes:
+                    pxe_nodes.append(dbNode)
+
+                changed = True
+
+            dbNode.lastUpdate = lastUpdate
+
+            result[update['name']] = \
+                result.get(update['name']) or changed
+
+        if pxe_nodes:
+            # update local boot configuration for on-premise nodes
+            self._bhm.writePXEFiles(session, pxe_nodes)
+
+        #
+        # Capture node data in dict form for the event before the node
+        # objects are expired by the commit
+        #
+        events = [
+            {
+                'node': Node.getFromDbDict(
+                    change['node'].__dict__).getCleanDict(),
+                'previous_state': change['previous_state'],
+            } for change in state_changes
+        ]
+
+        session.commit()
+
+        if events:
+            from tortuga.events.dispatcher import batch
+
+            with batch():
+                for event in events:
+                    NodeStateChanged.fire(
+                        node=event['node'],
+                        previous_state=event['previous_state'])
+
+            self.__scheduleUpdate()
+
+        return result
+
+    def __get_nodes_by_name(self, session: Session, names: List[str]) \
+            -> Dict[str, NodeModel]:
+        """
+        Returns dict of name to node for all names matching exactly one
+        node. Names are matched as in NodesDbHandler.getNode().
+        """
+
+        short_names = sorted({get_short_name(name) for name in names})
+
+        nodes_by_short_name: Dict[str, List[NodeModel]] = defaultdict(list)
+
+        for idx in range(0, len(short_names), NODE_NAME_BATCH_SIZE):
+            for dbNode in session.query(NodeModel).filter(
+                    NodeModel.short_name.in_(
+                        short_names[idx:idx + NODE_NAME_BATCH_SIZE])):
+                nodes_by_short_name[dbNode.short_name].append(dbNode)
+
+        result: Dict[str, NodeModel] = {}
+
+        for name in names:
+            dbNodes = nodes_by_short_name.get(get_short_name(name), [])
+
+            if '.' in name:
+                # Exact match on fully-qualified name
+                dbNodes = [dbNode for dbNode in dbNodes
+                           if dbNode.name.lower() == name.lower()]
+
+            if len(dbNodes) == 1:
+                result[name] = dbNodes[0]
+
+        return result
+
     def __process_nodeErrorDict(self, nodeErrorDict):
         result = {}
         nodes_deleted = []
@@ -438,7 +617,7 @@ class NodeManager(TortugaObjectManager): \
                 raise NodeNotFound(
                     'No nodes matching nodespec [%s]' % (nodespec))
 
-            self.__validate_delete_nodes_request(nodes, force)
+            self.__validate_delete_nodes_request(session, nodes, force)
 
             self.__preDeleteHost(kitmgr, nodes)
 
@@ -467,11 +646,6 @@ class NodeManager(TortugaObjectManager): \
                 self._addHostManager.delete_sessions(addHostSessions)
 
             for nodeName in result['NodesDeleted']:
-                # Remove the Puppet cert
-                self._bhm.deletePuppetNodeCert(nodeName)
-
-                self._bhm.nodeCleanup(nodeName)
-
                 self.getLogger().info('Node [%s] deleted' % (nodeName))
 
             # Schedule a cluster update
@@ -483,7 +657,8 @@ class NodeManager(TortugaObjectManager): \
 
             raise
 
-    def __validate_delete_nodes_request(self, nodes: List[NodeModel],
+    def __validate_delete_nodes_request(self, session: Session,
+                                        nodes: List[NodeModel],
                                         force: bool):
         """
         Raises:
@@ -498,6 +673,13 @@ class NodeManager(TortugaObjectManager): \
 
             swprofile_distribution[node.softwareprofile] += 1
 
+        node_counts = self._nodesDbHandler.getNodeCountsBySoftwareProfile(
+            session,
+            [software_profile.id
+             for software_profile in swprofile_distribution.keys()
+             if software_profile.minNodes],
+            lock=True)
+
         errors: List[str] = []
 
         for software_profile, num_nodes_deleted in \
@@ -511,7 +693,7 @@ class NodeManager(TortugaObjectManager): \
                 continue
 
             if software_profile.minNodes and \
-                    len(software_profile.nodes) - num_nodes_deleted < \
+                    node_counts[software_profile.id] - num_nodes_deleted < \
                         software_profile.minNodes:
                 if force and software_profile.lockedState == 'SoftLocked':
                     # allow deletion of nodes when force is set and profile
@@ -571,6 +753,7 @@ class NodeManager(TortugaObjectManager): \
 
             dbNode.state = state.NODE_STATE_DELETED
             event_data['node']['state'] = 'Deleted'
+            events_to_fire.append(event_data)
 
             if dbNode.hardwareprofile not in nodes:
                 nodes[dbNode.hardwareprofile] = [dbNode]
@@ -582,47 +765,94 @@ class NodeManager(TortugaObjectManager): \
         #
         # Fire node state change events
         #
-        for event in events_to_fire:
-            NodeStateChanged.fire(node=event['node'],
-                                  previous_state=event['previous_state'])
+        from tortuga.events.dispatcher import batch
+
+        with batch():
+            for event in events_to_fire:
+                NodeStateChanged.fire(node=event['node'],
+                                      previous_state=event['previous_state'])
 
         #
-        # Call resource adapter with batch(es) of node lists keyed on
-        # hardware profile.
+        # Call resource adapters with batch(es) of node lists keyed on
+        # hardware profile. Adapters share the session, so they are
+        # called one at a time; each adapter may delete its nodes
+        # concurrently (see ResourceAdapter._async_delete_nodes()).
         #
-        for hwprofile, hwprofile_nodes in nodes.items():
-            # Get the ResourceAdapter
-            adapter = self.__get_resource_adapter(session, hwprofile)
+        adapters = {
+            hwprofile: self.__get_resource_adapter(session, hwprofile)
+            for hwprofile in nodes
+        }
 
-            # Call the resource adapter
-            adapter.deleteNode(hwprofile_nodes)
+        deleted_nodes: List[NodeModel] = []
+        local_nodes: List[NodeModel] = []
 
-            # Iterate over all nodes in hardware profile, completing the
-            # delete operation.
-            for dbNode in hwprofile_nodes:
-                # Remove PXE boot file and remove lease from dhcp server
+        for hwprofile, adapter in adapters.items():
+            failures = self.__delete_hwprofile_nodes(
+                hwprofile, nodes[hwprofile], adapter)
+
+            for dbNode in nodes[hwprofile]:
+                if failures.get(dbNode.name):
+                    result['DeleteNodeFailed'].append(dbNode)
+
+                    continue
+
+                deleted_nodes.append(dbNode)
+
+                # Only attempt to remove local boot configuration for
+                # nodes that are marked as 'local'
                 if hwprofile.location == 'local':
-                    # Only attempt to remove local boot configuration for
-                    # nodes that are marked as 'local'
+                    local_nodes.append(dbNode)
+
+        #
+        # Remove PXE boot files, Puppet certificates and node directories,
+        # and remove leases from dhcp server, in a single pass each
+        #
+        if deleted_nodes:
+            self._bhm.removeDeletedNodeFiles(deleted_nodes)
 
-                    self._bhm.rmPXEFile(dbNode)
-                    self._bhm.removeDhcpLease(dbNode)
+        if local_nodes:
+            self._bhm.removeDhcpLeases(local_nodes)
 
-                for tag in dbNode.tags:
-                    if len(tag.nodes) == 1 and \
-                            not tag.softwareprofiles and \
-                            not tag.hardwareprofiles:
-                        session.delete(tag)
+        # Complete the delete operation
+        for dbNode in deleted_nodes:
+            for tag in dbNode.tags:
+                if len(tag.nodes) == 1 and \
+                        not tag.softwareprofiles and \
+                        not tag.hardwareprofiles:
+                    session.delete(tag)
 
-                # Delete the Node
-                self.getLogger().debug('Deleting node [%s]' % (dbNode.name))
+            # Delete the Node
+            self.getLogger().debug('Deleting node [%s]' % (dbNode.name))
 
-                session.delete(dbNode)
+            session.delete(dbNode)
 
-                result['NodesDeleted'].append(dbNode)
+            result['NodesDeleted'].append(dbNode)
 
         return result
 
+    def __delete_hwprofile_nodes(self, hwprofile: HardwareProfileModel,
+                                 dbNodes: List[NodeModel], adapter) \
+            -> Dict[str, Optional[Exception]]:
+        """
+        Deletes nodes using the resource adapter and returns the per-node
+        failures it reports. If the call fails, all nodes are considered
+        failed.
+        """
+
+        try:
+            failures = adapter.deleteNode(dbNodes)
+        except Exception as exc:  # pylint: disable=broad-except
+            self.getLogger().error(
+                'Error deleting nodes in hardware profile [%s]: %s' % (
+                    hwprofile.name, exc))
+
+            return {dbNode.name: exc for dbNode in dbNodes}
+
+        if not isinstance(failures, dict):
+            return {}
+
+        return failures
+
     def __get_resource_adapter(self, session: Session,
                                hardwareProfile: HardwareProfileModel):
         """
@@ -673,11 +903,21 @@ class NodeManager(TortugaObjectManager): \
             '__preDeleteHost(): nodes=[%s]' % (
                 ' '.join([node.name for node in nodes])))
 
+        #
+        # Components are called once per hardware/software profile,
+        # rather than once per node, so that they can coalesce service
+        # restarts
+        #
+        nodes_by_profile = defaultdict(list)
+
         for node in nodes:
-            kitmgr.pre_delete_host(
+            nodes_by_profile[(
                 node.hardwareprofile.name,
                 node.softwareprofile.name if node.softwareprofile else None,
-                nodes=[node.name])
+            )].append(node.name)
+
+        for (hwprofile, swprofile), node_names in nodes_by_profile.items():
+            kitmgr.pre_delete_host(hwprofile, swprofile, nodes=node_names)
 
     def __postDeleteHost(self, kitmgr, nodes_deleted):
         # 'nodes_deleted' is a list of dicts of the following format:
@@ -699,12 +939,16 @@ class NodeManager(TortugaObjectManager): \
 
             return
 
+        nodes_by_profile = defaultdict(list)
+
         for node_dict in nodes_deleted:
-            kitmgr.post_delete_host(
+            nodes_by_profile[(
                 node_dict['hardwareprofile'],
-                node_dict['softwareprofile']
-                if 'softwareprofile' in node_dict else None,
-                nodes=[node_dict['name']])
+                node_dict.get('softwareprofile'),
+            )].append(node_dict['name'])
+
+        for (hwprofile, swprofile), node_names in nodes_by_profile.items():
+            kitmgr.post_delete_host(hwprofile, swprofile, nodes=node_names)
 
     def __scheduleUpdate(self):
         self._syncApi.scheduleClusterUpdate()
@@ -918,9 +1162,9 @@ class NodeManager(TortugaObjectManager): \
             raise NodeTransferNotValid(
                 'Source and destination software profiles are the same')
 
-        # Get list of Unlocked nodes
+        # Get list of Unlocked nodes, up to the requested count
         dbUnlockedNodeList = self.__getTransferrableNodes(
-            dbSrcSoftwareProfile, dbDstSoftwareProfile)
+            session, dbSrcSoftwareProfile, dbDstSoftwareProfile, count)
 
         # If the source software profile is specified, only use nodes from
         # it, otherwise get list of nodes for compatible hardware profile.
@@ -931,7 +1175,8 @@ class NodeManager(TortugaObjectManager): \
             # Not enough nodes available, include SoftLocked nodes as well.
 
             dbSoftLockedNodes = self.__getSoftLockedNodes(
-                dbSrcSoftwareProfile, dbDstSoftwareProfile)
+                session, dbSrcSoftwareProfile, dbDstSoftwareProfile,
+                count - nUnlockedNodes)
 
             nSoftLockedNodes = len(dbSoftLockedNodes)
 
@@ -965,7 +1210,7 @@ class NodeManager(TortugaObjectManager): \
             dbNodeList = dbUnlockedNodeList + \
                 dbSoftLockedNodes[:nRequiredNodes]
         else:
-            dbNodeList = dbUnlockedNodeList[:count]
+            dbNodeList = dbUnlockedNodeList
 
         results = self.__transfer_node(
             session, dbNodeList, dbDstSoftwareProfile)
@@ -1115,9 +1360,13 @@ class NodeManager(TortugaObjectManager): \
             #
             # Fire node state change events
             #
-            for event in events_to_fire:
-                NodeStateChanged.fire(node=event['node'],
-                                      previous_state=event['previous_state'])
+            from tortuga.events.dispatcher import batch
+
+            with batch():
+                for event in events_to_fire:
+                    NodeStateChanged.fire(
+                        node=event['node'],
+                        previous_state=event['previous_state'])
 
             # Convert list of Nodes to list of node names for providing
             # user feedback.
@@ -1509,62 +1758,34 @@ class NodeManager(TortugaObjectManager): \
             hardwareProfile.resourceadapter.name) \
             if hardwareProfile.resourceadapter else None
 
-    def __isNodeTransferrable(self, dbNode: NodeModel) -> bool:
-        # Only nodes that are not locked and in Installed state are
-        # eligible for transfer.
-        return not self.__isNodeLocked(dbNode) and \
-            self.__isNodeStateInstalled(dbNode)
-
-    def __getNodeTransferCandidates(
-            self, dbSrcSoftwareProfile: Optional[SoftwareProfileModel],
-            dbDstSoftwareProfile: SoftwareProfileModel, compare_func):
-        """
-        Helper method for determining which nodes should be considered for
-        transfer.
-        """
-
-        if dbSrcSoftwareProfile:
-            # Find all nodes within this software profile that are in the
-            # same hardware profile as the destination software profile.
-            # Exclude all nodes that are HardLocked or not in "Installed"
-            # state.
-            return [
-                dbNode for dbNode in dbSrcSoftwareProfile.nodes
-                if dbNode.hardwareprofile in
-                dbDstSoftwareProfile.hardwareprofiles and
-                compare_func(dbNode)]
-
-        # Find all nodes that are in the same hardware profile(s) as
-        # the destination software profile. Exclude all nodes that are
-        # HardLocked or not in "Installed" state.
-        return [
-            dbNode for dbHardwareProfile in
-            dbDstSoftwareProfile.hardwareprofiles
-            for dbNode in dbHardwareProfile.nodes
-            if dbNode.softwareprofile != dbDstSoftwareProfile and
-            compare_func(dbNode)]
-
     def __getTransferrableNodes(
-            self, dbSrcSoftwareProfile: Optional[SoftwareProfileModel],
-            dbDstSoftwareProfile: SoftwareProfileModel) -> List[Node]:
+            self, session: Session,
+            dbSrcSoftwareProfile: Optional[SoftwareProfileModel],
+            dbDstSoftwareProfile: SoftwareProfileModel,
+            count: int) -> List[NodeModel]:
         """
-        Return list of Unlocked nodes
+        Return list of up to 'count' Unlocked nodes in "Installed" state
         """
 
-        return self.__getNodeTransferCandidates(
-            dbSrcSoftwareProfile, dbDstSoftwareProfile,
-            self.__isNodeTransferrable)
+        return self._nodesDbHandler.getTransferCandidates(
+            session, dbDstSoftwareProfile,
+            srcSoftwareProfile=dbSrcSoftwareProfile,
+            lockedState='Unlocked', state=state.NODE_STATE_INSTALLED,
+            limit=count)
 
     def __getSoftLockedNodes(
-            self, dbSrcSoftwareProfile: SoftwareProfileModel,
-            dbDstSoftwareProfile: SoftwareProfileModel) -> List[Node]:
+            self, session: Session,
+            dbSrcSoftwareProfile: Optional[SoftwareProfileModel],
+            dbDstSoftwareProfile: SoftwareProfileModel,
+            count: int) -> List[NodeModel]:
         """
-        Return list of SoftLocked nodes
+        Return list of up to 'count' SoftLocked nodes
         """
 
-        return self.__getNodeTransferCandidates(
-            dbSrcSoftwareProfile, dbDstSoftwareProfile,
-            self.__isNodeSoftLocked)
+        return self._nodesDbHandler.getTransferCandidates(
+            session, dbDstSoftwareProfile,
+            srcSoftwareProfile=dbSrcSoftwareProfile,
+            lockedState='SoftLocked', limit=count)
 
     def __isNodeLocked(self, dbNode: NodeModel) -> bool:
         return dbNode.lockedState != 'Unlocked'
@@ -1572,9 +1793,6 @@ class NodeManager(TortugaObjectManager): \
     def __isNodeHardLocked(self, dbNode: NodeModel) -> bool:
         return dbNode.lockedState == 'HardLocked'
 
-    def __isNodeSoftLocked(self, dbNode: NodeModel) -> bool:
-        return dbNode.lockedState == 'SoftLocked'
-
     def __getNodeState(self, dbNode: NodeModel) -> str:
         return dbNode.state
 
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from logging import getLogger
-from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 
 logger = getLogger(__name__)
@@ -109,16 +109,31 @@ class ObjectStore:
         """
         return '{}:{}'.format(self._namespace, key)
 
-    def set(self, key: str, value: dict):
+    def set(self, key: str, value: dict, ttl: Optional[int] = None):
         """
         Saves the object to the object store.
 
         :param str key:    the key name to use for the object
         :param dict value: the object to store, stores {} if None
+        :param int ttl:    the number of seconds after which the object
+                           expires, or None to keep the object indefinitely
 
         """
         raise NotImplementedError()
 
+    def set_many(self, objects: Dict[str, dict], ttl: Optional[int] = None):
+        """
+        Saves multiple objects to the object store.
+
+        :param Dict[str, dict] objects: a dict of {key: object}
+        :param int ttl:                 the number of seconds after which
+                                        the objects expire, or None to keep
+                                        the objects indefinitely
+
+        """
+        for key, value in objects.items():
+            self.set(key, value, ttl=ttl)
+
     def get(self, key: str) -> Optional[dict]:
         """
         Gets the object from the object store.
@@ -130,6 +145,18 @@ class ObjectStore:
         """
         raise NotImplementedError()
 
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[dict]]:
+        """
+        Gets multiple objects from the object store.
+
+        :param Iterable[str] keys: the keys of the objects to get
+
+        :return Dict[str, Optional[dict]]: a dict of {key: object}, where
+                                           the object is None if not found
+
+        """
+        return {key: self.get(key) for key in keys}
+
     def list(
             self,
             order_by: Optional[str] = None,
@@ -198,6 +225,16 @@ class ObjectStore:
         """
         raise NotImplementedError()
 
+    def delete_many(self, keys: Iterable[str]):
+        """
+        Deletes multiple objects from the object store.
+
+        :param Iterable[str] keys: the keys of the objects to delete
+
+        """
+        for key in keys:
+            self.delete(key)
+
     def exists(self, key: str) -> bool:
         """
         Determines whether or not a key exists.
@@ -0,0 +1,95 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from logging import getLogger
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from tortuga.db.sessionHooks import call_after_transaction
+from .manager import ObjectStoreManager
+
+
+logger = getLogger(__name__)
+
+
+class Generation:
+    """
+    Generation counter of process-level caches, shared by all processes
+    through a Redis key. Caches store the generation along with their
+    entries, and ignore entries stored with a different generation.
+
+    The generation also has a counter local to the process, so that the
+    process sees its own changes even if Redis is not available.
+
+    :param key:           the Redis key of the counter
+    :param description:   description of the cached data, for log
+                          messages
+    :param on_invalidate: called whenever the generation is invalidated
+                          in this process, for example to clear the cache
+
+    """
+
+    def __init__(self, key: str, description: str,
+                 on_invalidate: Optional[Callable[[], None]] = None):
+        self.key = key
+        self._description = description
+        self._on_invalidate = on_invalidate
+        self._local_generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self, session: Optional[Session] = None):
+        """
+        Invalidates the cached data in all processes.
+
+        :param session: the database session making the change, if any.
+                        The data is invalidated again when its
+                        transaction ends, as other sessions may cache data
+                        from the uncommitted state in the meantime.
+
+        """
+        self._invalidate()
+
+        if session is not None:
+            call_after_transaction(session, self._invalidate)
+
+    def _invalidate(self):
+        with self._lock:
+            self._local_generation += 1
+
+            if self._on_invalidate is not None:
+                self._on_invalidate()
+
+        try:
+            ObjectStoreManager.get_redis_client().incr(self.key)
+        except Exception as ex:
+            logger.warning('Unable to invalidate {}: {}'.format(
+                self._description, ex))
+
+    def get(self) -> Optional[Tuple[int, int]]:
+        """
+        :return: the current generation, or None if it cannot be
+                 determined
+
+        """
+        try:
+            value = ObjectStoreManager.get_redis_client().get(self.key)
+        except Exception as ex:
+            logger.warning('Unable to get {} generation: {}'.format(
+                self._description, ex))
+
+            return None
+
+        return self._local_generation, int(value or 0)
@@ -33,8 +33,18 @@ class ObjectStoreManager:
         :param str namespace: the namespace for the object store
         :return ObjectStore:  the object store instance
 
+        """
+        return RedisObjectStore(namespace=namespace,
+                                redis_client=cls.get_redis_client())
+
+    @classmethod
+    def get_redis_client(cls) -> Redis:
+        """
+        Get the Redis client shared by all object stores.
+
+        :return Redis: the redis client
+
         """
         if not cls._redis_client:
             cls._redis_client = Redis()
-        return RedisObjectStore(namespace=namespace,
-                                redis_client=cls._redis_client)
+        return cls._redis_client
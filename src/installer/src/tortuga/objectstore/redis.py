@@ -13,8 +13,9 @@
 # limitations under the License.
 
 import json
+import time
 from logging import getLogger
-from typing import Iterator, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from redis.exceptions import ResponseError
 
@@ -24,16 +25,69 @@ from .base import ObjectStore
 logger = getLogger(__name__)
 
 
+def serialize(value: dict) -> dict:
+    """
+    Prepares a dict for storage as a Redis hash. Any values that are more
+    complex data structures are stored as serialized JSON.
+
+    :param dict value: the dict to serialize
+
+    :return dict: the serialized result
+
+    """
+    serialized = {}
+    for k, v in value.items():
+        if isinstance(v, (dict, list, tuple)):
+            serialized[k] = 'JSON:{}'.format(json.dumps(v))
+        else:
+            serialized[k] = v
+
+    return serialized
+
+
+def deserialize(hsh: dict) -> dict:
+    """
+    Reconstitutes a Redis hash.
+
+    :param dict hsh: the Redis hash to deserialize
+
+    :return dict: the deserialized result
+
+    """
+    deserialized = {}
+    for k, v in hsh.items():
+        if isinstance(k, bytes):
+            k = k.decode()
+        if isinstance(v, bytes):
+            v = v.decode()
+        if isinstance(v, str) and v.startswith('JSON:'):
+            deserialized[k] = json.loads(v[5:])
+        else:
+            deserialized[k] = v
+
+    return deserialized
+
+
 class RedisObjectStore(ObjectStore):
     """
     An implementation of the ObjectStore that stores objects in an Redis
     KV store.
 
+    Each object is stored as a hash, and its key is added to the INDEX set
+    of the namespace in the same transaction. Keys of objects saved with a
+    TTL are also added to the EXPIRY sorted set, scored by expiry time, so
+    that the keys of expired objects can be pruned from the index.
+
     """
     #
     # A list of reserved keys, that are required for internal use
     #
-    RESERVED_KEYS = ['INDEX']
+    RESERVED_KEYS = ['INDEX', 'EXPIRY']
+
+    #
+    # Number of objects fetched from Redis per round trip when listing
+    #
+    PAGE_SIZE = 100
 
     def __init__(self, namespace: str, redis_client):
         """
@@ -55,40 +109,69 @@ class RedisObjectStore(ObjectStore):
         """
         return self.get_key_name('INDEX')
 
-    def set(self, key: str, value: dict):
+    def _get_expiry_key_name(self) -> str:
+        """
+        Gets the key name for the Redis sorted set of expiry times.
+
+        :return str: the key name
+
+        """
+        return self.get_key_name('EXPIRY')
+
+    def set(self, key: str, value: dict, ttl: Optional[int] = None):
         """
         See superclass.
 
         :param key:
         :param value:
+        :param ttl:
 
         """
-        if key in self.RESERVED_KEYS:
-            raise Exception('Key reserved for internal use: {}'.format(key))
+        self.set_many({key: value}, ttl=ttl)
 
-        if not value:
-            value = {}
+    def set_many(self, objects: Dict[str, dict], ttl: Optional[int] = None):
+        """
+        See superclass. The objects are saved, and added to the index, in
+        a single transaction.
 
-        logger.debug('set({}, {})'.format(key, value))
+        :param objects:
+        :param ttl:
 
-        #
-        # If any of the keys are more complex data structures, store them
-        # as serialized JSON
-        #
-        to_store = {}
-        for k, v in value.items():
-            if isinstance(v, (dict, list, tuple)):
-                to_store[k] = 'JSON:{}'.format(json.dumps(v))
-            else:
-                to_store[k] = v
+        """
+        for key in objects.keys():
+            if key in self.RESERVED_KEYS:
+                raise Exception(
+                    'Key reserved for internal use: {}'.format(key))
+
+        if not objects:
+            return
+
+        pipeline = self._redis.pipeline()
 
-        key = self.get_key_name(key)
-        self._redis.hmset(key, to_store)
+        for key, value in objects.items():
+            if not value:
+                value = {}
+
+            logger.debug('set({}, {}, ttl={})'.format(key, value, ttl))
+
+            key = self.get_key_name(key)
+            pipeline.hmset(key, serialize(value))
+
+            if ttl:
+                pipeline.expire(key, ttl)
+                pipeline.zadd(self._get_expiry_key_name(),
+                              {key: time.time() + ttl})
+            else:
+                pipeline.persist(key)
+                pipeline.zrem(self._get_expiry_key_name(), key)
 
         #
         # Create a Redis set for the purposes of indexing, sorting, etc.
         #
-        self._redis.sadd(self._get_index_key_name(), key)
+        pipeline.sadd(self._get_index_key_name(),
+                      *[self.get_key_name(key) for key in objects.keys()])
+
+        pipeline.execute()
 
     def get(self, key: str) -> Optional[dict]:
         """
@@ -117,29 +200,137 @@ class RedisObjectStore(ObjectStore):
             return None
 
         logger.debug('get({}) -> {}'.format(key, result))
-        return self._deserialize(result)
+        return deserialize(result)
 
-    def _deserialize(self, hsh: dict) -> dict:
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[dict]]:
         """
-        Reconstitutes a Redis hash.
+        See superclass. The objects are fetched in a single pipelined
+        round trip.
 
-        :param dict hsh: the Redis hash to deserialize
+        :param keys:
 
-        :return dict: the deserialized result
+        :return Dict[str, Optional[dict]]:
 
         """
-        deserialized = {}
-        for k, v in hsh.items():
-            if isinstance(k, bytes):
-                k = k.decode()
-            if isinstance(v, bytes):
-                v = v.decode()
-            if isinstance(v, str) and v.startswith('JSON:'):
-                deserialized[k] = json.loads(v[5:])
-            else:
-                deserialized[k] = v
+        keys = list(keys)
+
+        return dict(zip(keys, self._get_many(
+            [self.get_key_name(key) for key in keys])))
+
+    def _get_many(self, keys: List[str]) -> List[Optional[dict]]:
+        """
+        This is the same as the get_many() method, except it expects the
+        key prefix to already be prepended to the keys.
+
+        :param keys: the keys, namespace prefixed
+
+        :return: a list of objects, in the same order as the keys, where
+                 the object is None if not found
+
+        """
+        if not keys:
+            return []
+
+        pipeline = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipeline.hgetall(key)
+
+        return [deserialize(result) if result else None
+                for result in pipeline.execute()]
+
+    def _get_pages(self, keys: Iterable[bytes]) \
+            -> Iterator[Tuple[str, dict]]:
+        """
+        Fetches the objects for an iterable of keys, PAGE_SIZE objects per
+        round trip. Keys of objects that no longer exist are removed from
+        the index.
+
+        :param keys: the keys, namespace prefixed
+
+        :return: an iterator of tuples, containing (key, object)
+
+        """
+        page: List[str] = []
+        missing: List[str] = []
+
+        def flush():
+            for key, obj in zip(page, self._get_many(page)):
+                if obj is None:
+                    missing.append(key)
+                    continue
+
+                yield self._remove_namespace(key), obj
+
+            page.clear()
+
+        for key in keys:
+            page.append(key.decode())
+
+            if len(page) >= self.PAGE_SIZE:
+                yield from flush()
+
+        yield from flush()
+
+        self._remove_missing(missing)
+
+    def _scan_index(self) -> Iterator[bytes]:
+        """
+        Iterates over the index set, PAGE_SIZE keys per round trip.
+
+        :return: an iterator of keys, namespace prefixed
+
+        """
+        #
+        # SSCAN may return the same key more than once
+        #
+        seen = set()
+
+        for key in self._redis.sscan_iter(self._get_index_key_name(),
+                                          count=self.PAGE_SIZE):
+            if key not in seen:
+                seen.add(key)
+                yield key
+
+    def _sort_index(self, order_by: str, order_desc: bool,
+                    order_alpha: bool) -> Iterator[bytes]:
+        """
+        Sorts the index set, and iterates over the result, PAGE_SIZE keys
+        per round trip.
+
+        :return: an iterator of keys, namespace prefixed
+
+        """
+        sort_by = '*->{}'.format(order_by)
+        start = 0
 
-        return deserialized
+        while True:
+            try:
+                keys = self._redis.sort(self._get_index_key_name(),
+                                        by=sort_by, desc=order_desc,
+                                        alpha=order_alpha, start=start,
+                                        num=self.PAGE_SIZE)
+
+            except ResponseError as e:
+                #
+                # This error means that Redis can't sort this attribute
+                # as a double, which is it's default behavior. We need to
+                # specify order_alpha instead
+                #
+                if str(e) == \
+                        "One or more scores can't be converted into double":
+                    raise Exception(
+                        '{} must be sorted using order_alpha'.format(
+                            order_by)
+                    )
+                else:
+                    raise
+
+            yield from keys
+
+            if len(keys) < self.PAGE_SIZE:
+                return
+
+            start += self.PAGE_SIZE
 
     def list_sorted(
             self,
@@ -156,41 +347,72 @@ class RedisObjectStore(ObjectStore):
         :return Iterator[dict]:
 
         """
+        self.prune()
+
         #
         # Un-ordered list
         #
         if not order_by:
-            for key in self._redis.smembers(self._get_index_key_name()):
-                key = key.decode()
-                yield (self._remove_namespace(key), self._get(key))
+            yield from self._get_pages(self._scan_index())
 
             return
 
         #
         # Ordered list
         #
-        try:
-            sort_by = '*->{}'.format(order_by)
-            for key in self._redis.sort(self._get_index_key_name(),
-                                        by=sort_by, desc=order_desc,
-                                        alpha=order_alpha):
-                key = key.decode()
-                yield (self._remove_namespace(key), self._get(key))
+        yield from self._get_pages(
+            self._sort_index(order_by, order_desc, order_alpha))
 
-            return
+    def prune(self) -> int:
+        """
+        Removes the keys of expired objects from the index.
 
-        except ResponseError as e:
-            #
-            # This error means that Redis can't sort this attribute
-            # as a double, which is it's default behavior. We need to
-            # specify order_alpha instead
-            #
-            if str(e) == "One or more scores can't be converted into double":
-                raise Exception(
-                    '{} must be sorted using order_alpha'.format(order_by)
-                )
-            else:
-                raise
+        :return int: the number of keys removed
+
+        """
+        expired = [
+            key.decode() for key in self._redis.zrangebyscore(
+                self._get_expiry_key_name(), '-inf', time.time())
+        ]
+
+        return len(self._remove_missing(expired))
+
+    def _remove_missing(self, keys: List[str]) -> List[str]:
+        """
+        Removes the keys of objects that no longer exist from the index
+        and the expiry set. The keys are watched while they are checked
+        and removed, so that the keys of objects saved again concurrently
+        are kept.
+
+        :param keys: the keys, namespace prefixed
+
+        :return: the keys removed
+
+        """
+        removed: List[str] = []
+
+        for idx in range(0, len(keys), self.PAGE_SIZE):
+            page = keys[idx:idx + self.PAGE_SIZE]
+
+            missing: List[str] = []
+
+            def remove(pipe, page=page, missing=missing):
+                missing[:] = [key for key in page if not pipe.exists(key)]
+
+                pipe.multi()
+
+                if missing:
+                    pipe.srem(self._get_index_key_name(), *missing)
+                    pipe.zrem(self._get_expiry_key_name(), *missing)
+
+            self._redis.transaction(remove, *page)
+
+            removed.extend(missing)
+
+        if removed:
+            logger.debug('removed from index: {}'.format(removed))
+
+        return removed
 
     def _remove_namespace(self, key: str) -> str:
         """
@@ -211,8 +433,28 @@ class RedisObjectStore(ObjectStore):
         :param key:
 
         """
-        logger.debug('delete({})'.format(key))
-        self._redis.delete(self.get_key_name(key))
+        self.delete_many([key])
+
+    def delete_many(self, keys: Iterable[str]):
+        """
+        See superclass. The objects are deleted, and removed from the
+        index, in a single transaction.
+
+        :param keys:
+
+        """
+        keys = [self.get_key_name(key) for key in keys]
+
+        if not keys:
+            return
+
+        logger.debug('delete({})'.format(keys))
+
+        pipeline = self._redis.pipeline()
+        pipeline.delete(*keys)
+        pipeline.srem(self._get_index_key_name(), *keys)
+        pipeline.zrem(self._get_expiry_key_name(), *keys)
+        pipeline.execute()
 
     def exists(self, key: str) -> bool:
         """
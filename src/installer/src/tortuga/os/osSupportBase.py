@@ -15,8 +15,11 @@
 # pylint: disable=no-member
 
 import logging
-from typing import Optional
+import os.path
+import threading
+from typing import Any, Dict, Optional
 
+from jinja2 import Environment, FileSystemLoader, Template
 from sqlalchemy.orm.session import Session
 
 from tortuga.config.configManager import ConfigManager
@@ -26,6 +29,33 @@ from tortuga.db.models.softwareProfile import SoftwareProfile
 from tortuga.objects.osFamilyInfo import OsFamilyInfo
 
 
+#
+# Jinja environments keyed on template directory. Each environment caches
+# compiled templates, and recompiles a template when its file is modified.
+#
+_template_environments: Dict[str, Environment] = {}
+_template_environments_lock = threading.Lock()
+
+
+def get_template(path: str) -> Template:
+    """
+    Returns the compiled Jinja template at 'path'
+    """
+
+    srcpath, srcfile = os.path.split(path)
+
+    with _template_environments_lock:
+        env = _template_environments.get(srcpath)
+
+        if env is None:
+            env = Environment(loader=FileSystemLoader(srcpath),
+                              auto_reload=True)
+
+            _template_environments[srcpath] = env
+
+    return env.get_template(srcfile)
+
+
 class OsSupportBase:
     def __init__(self, osFamilyInfo: OsFamilyInfo) -> None:
         self._osFamilyInfo = osFamilyInfo
@@ -35,13 +65,28 @@ class OsSupportBase:
     def getLogger(self):
         return self._logger
 
+    def get_kickstart_context(
+            self, session: Session, hardwareprofile: HardwareProfile,
+            softwareprofile: SoftwareProfile) -> Dict[str, Any]: \
+        # pylint: disable=no-self-use,unused-argument
+        """
+        Returns the Kickstart template variables shared by all nodes in
+        the given hardware and software profiles
+        """
+
+        return {}
+
     def getKickstartFileContents(
             self, session: Session, node: Node,
             hardwareprofile: HardwareProfile,
-            softwareprofile: SoftwareProfile) -> str: \
+            softwareprofile: SoftwareProfile,
+            context: Optional[Dict[str, Any]] = None) -> str: \
         # pylint: disable=no-self-use,unused-argument
         """
         Returns entire Kickstart file contents
+
+        'context' is the result of get_kickstart_context() for the
+        profiles, and is computed if not specified.
         """
 
         return ''
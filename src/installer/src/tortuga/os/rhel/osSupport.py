@@ -19,7 +19,6 @@ import time
 from random import choice
 from typing import Any, Dict, List, Optional
 
-from jinja2 import Template
 from sqlalchemy.orm.session import Session
 
 from tortuga.config.configManager import getfqdn
@@ -33,7 +32,7 @@ from tortuga.db.models.softwareProfile import SoftwareProfile
 from tortuga.exceptions.nicNotFound import NicNotFound
 from tortuga.exceptions.nodeNotFound import NodeNotFound
 from tortuga.exceptions.parameterNotFound import ParameterNotFound
-from tortuga.os.osSupportBase import OsSupportBase
+from tortuga.os.osSupportBase import OsSupportBase, get_template
 from tortuga.utility.bootParameters import getBootParameters
 from tortuga.objects.osFamilyInfo import OsFamilyInfo
 
@@ -405,21 +404,17 @@ dd if=/dev/zero of=$d%s bs=512 count=1
 
         return buf
 
-    def __get_template_subst_dict(
-            self, session: Session, node: Node,
-            hardwareprofile: HardwareProfile,
+    def get_kickstart_context(
+            self, session: Session, hardwareprofile: HardwareProfile,
             softwareprofile: SoftwareProfile) -> Dict[str, Any]:
         """
-        :param node: Object
+        Returns the Kickstart template variables shared by all nodes in
+        the given hardware and software profiles
+
         :param hardwareprofile: Object
         :param softwareprofile: Object
         :return: Dictionary
         """
-        hardwareprofile = hardwareprofile \
-            if hardwareprofile else node.hardwareprofile
-        softwareprofile = softwareprofile \
-            if softwareprofile else node.softwareprofile
-
         installer_public_fqdn: str = getfqdn()
         installer_hostname: str = installer_public_fqdn.split('.')[0]
 
@@ -438,12 +433,7 @@ dd if=/dev/zero of=$d%s bs=512 count=1
                 hardwareprofile.nics[0], enable_interface_aliases=None),
             '.%s' % private_domain if private_domain else '')
 
-        values: List[str] = node.name.split('.', 1)
-        domain: str = values[1].lower() if len(values) == 2 else ''
-
         return {
-            'fqdn': node.name,
-            'domain': domain,
             'hostname': installer_hostname,
             'installer_private_fqdn': installer_private_fqdn,
             'installer_private_domain': private_domain,
@@ -468,10 +458,6 @@ dd if=/dev/zero of=$d%s bs=512 count=1
             ),
             'lang': 'en_US.UTF-8',
             'keyboard': 'us',
-            'networkcfg': self.__kickstart_get_network_section(
-                node, hardwareprofile
-            ),
-            'rootpw': self._generatePassword(),
             'timezone': self.__kickstart_get_timezone(session),
             'includes': '%include /tmp/partinfo',
             'repos': '\n'.join(
@@ -491,19 +477,54 @@ dd if=/dev/zero of=$d%s bs=512 count=1
             'cfmstring': self._cm.getCfmPassword()
         }
 
-    def getKickstartFileContents(self, session: Session, node: Node,
-                                 hardwareprofile: HardwareProfile,
-                                 softwareprofile: SoftwareProfile) -> str:
+    def __get_template_subst_dict(
+            self, node: Node, hardwareprofile: HardwareProfile,
+            context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        :param node: Object
+        :param hardwareprofile: Object
+        :param context: Dictionary returned by get_kickstart_context()
+        :return: Dictionary
+        """
+        values: List[str] = node.name.split('.', 1)
+        domain: str = values[1].lower() if len(values) == 2 else ''
+
+        result = dict(context)
+
+        result.update({
+            'fqdn': node.name,
+            'domain': domain,
+            'networkcfg': self.__kickstart_get_network_section(
+                node, hardwareprofile
+            ),
+            'rootpw': self._generatePassword(),
+        })
+
+        return result
+
+    def getKickstartFileContents(
+            self, session: Session, node: Node,
+            hardwareprofile: HardwareProfile,
+            softwareprofile: SoftwareProfile,
+            context: Optional[Dict[str, Any]] = None) -> str:
         # Perform basic sanity checking before proceeding
         self.__validate_node(node)
 
-        template_subst_dict = self.__get_template_subst_dict(
-            session, node, hardwareprofile, softwareprofile)
+        hardwareprofile = hardwareprofile \
+            if hardwareprofile else node.hardwareprofile
+        softwareprofile = softwareprofile \
+            if softwareprofile else node.softwareprofile
 
-        with open(self.__get_kickstart_template(softwareprofile)) as fp:
-            tmpl = fp.read()
+        if context is None:
+            context = self.get_kickstart_context(
+                session, hardwareprofile, softwareprofile)
+
+        template_subst_dict = self.__get_template_subst_dict(
+            node, hardwareprofile, context)
 
-        return Template(tmpl).render(template_subst_dict)
+        return get_template(
+            self.__get_kickstart_template(softwareprofile)).render(
+                template_subst_dict)
 
     @staticmethod
     def _generatePassword() -> str:
@@ -17,6 +17,7 @@
 import os
 import pwd
 import shutil
+from typing import List
 
 from sqlalchemy.orm.session import Session
 
@@ -106,6 +107,11 @@ class OsBootHostManagerCommon(OsObjectManager):
         # (ie. any platform not running ISC DHCPD)
         pass
 
+    def removeDhcpLeases(self, nodes: List[Node]) -> None:
+        # Remove the DHCP leases of multiple nodes
+        for node in nodes:
+            self.removeDhcpLease(node)
+
     def setNodeForNetworkBoot(
             self, session: Session, dbNode: Node) -> None: \
         # pylint: disable=unused-argument
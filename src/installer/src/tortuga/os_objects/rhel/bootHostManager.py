@@ -16,8 +16,9 @@
 
 import os
 import subprocess
+import tempfile
 from textwrap import dedent
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm.session import Session
 
@@ -33,11 +34,40 @@ from tortuga.resourceAdapter.utility import get_provisioning_nic
 from tortuga.utility.bootParameters import getBootParameters
 
 
+def _write_file(path: str, contents: str) -> None:
+    """
+    Atomically replace the file at 'path'
+    """
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path),
+        prefix='.%s.' % (os.path.basename(path)))
+
+    try:
+        os.fchmod(fd, 0o644)
+
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(contents)
+
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+        raise
+
+
 class BootHostManager(OsBootHostManagerCommon):
     """
     Methods for manipulating PXE files
     """
 
+    def __init__(self, configManager) -> None:
+        super().__init__(configManager)
+
+        # OS support instances keyed on OS family name, version and arch
+        self.__ossupport_cache: Dict[tuple, Any] = {}
+
     def __getPxelinuxBootFilePath(self, mac: str):
         pxeconfigDir = os.path.join(
             self.getTftproot(), 'tortuga/pxelinux.cfg')
@@ -90,6 +120,21 @@ class BootHostManager(OsBootHostManagerCommon):
         # Call OS-specific cleanup routine
         self.deleteNodeCleanup(dbNode)
 
+    def removeDeletedNodeFiles(self, nodes: List[Node]) -> None:
+        """
+        Remove the files of deleted nodes in a single pass: the PXE files
+        of nodes in 'local' hardware profiles, the Puppet certificates and
+        the node directories
+        """
+
+        for node in nodes:
+            if node.hardwareprofile.location == 'local':
+                self.rmPXEFile(node)
+
+            self.deletePuppetNodeCert(node.name)
+
+            self.nodeCleanup(node.name)
+
     def deleteNodeCleanup(self, node: Node):
         if not node.softwareprofile:
             self.getLogger().debug(
@@ -106,13 +151,44 @@ class BootHostManager(OsBootHostManagerCommon):
     def writePXEFile(self, session: Session, node: Node,
                      localboot: Optional[bool] = None,
                      hardwareprofile: Optional[HardwareProfile] = None,
-                     softwareprofile: Optional[SoftwareProfile] = None): \
-            # pylint: disable=unused-argument
+                     softwareprofile: Optional[SoftwareProfile] = None):
         # 'hardwareProfile', 'softwareProfile', and 'localboot' are
         # overrides.  If not specified, node.hardwareprofile,
         # node.softwareprofile, and node.bootFrom values are used
         # respectively.
 
+        self.writePXEFiles(
+            session, [node], localboot=localboot,
+            hardwareprofile=hardwareprofile,
+            softwareprofile=softwareprofile)
+
+    def writePXEFiles(self, session: Session, nodes: List[Node],
+                      localboot: Optional[bool] = None,
+                      hardwareprofile: Optional[HardwareProfile] = None,
+                      softwareprofile: Optional[SoftwareProfile] = None):
+        """
+        Write the PXE files, and the Kickstart files of package-based
+        installations, of all nodes. OS support modules and Kickstart
+        template variables are loaded once per profile, and all files are
+        replaced atomically.
+
+        'hardwareProfile', 'softwareProfile', and 'localboot' are
+        overrides, as in writePXEFile().
+        """
+
+        # {(hardware profile, software profile): Kickstart context}
+        kickstart_contexts: Dict[tuple, Dict[str, Any]] = {}
+
+        for node in nodes:
+            self.__write_pxe_file(
+                session, node, localboot, hardwareprofile, softwareprofile,
+                kickstart_contexts)
+
+    def __write_pxe_file(self, session: Session, node: Node,
+                         localboot: Optional[bool],
+                         hardwareprofile: Optional[HardwareProfile],
+                         softwareprofile: Optional[SoftwareProfile],
+                         kickstart_contexts: Dict[tuple, Dict[str, Any]]):
         hwprofile = hardwareprofile if hardwareprofile else \
             node.hardwareprofile
 
@@ -174,22 +250,11 @@ label Reinstall
 
                 # Call the external support module
                 try:
-                    osSupport = __import__(
-                        'tortuga.os.%s.osSupport' % (osFamilyInfo.name),
-                        globals(), locals(), ['osSupport'], 0)
-
-                    if not hasattr(osSupport, 'OSSupport'):
-                        self.getLogger().error(
-                            'Invalid OS support module for [%s]' % (
-                                osFamilyInfo.name))
-
-                        return
-
-                    result += osSupport.OSSupport(
-                        osFamilyInfo).getPXEReinstallSnippet(
+                    result += self.__get_ossupport(
+                        swprofile).getPXEReinstallSnippet(
                             ksurl, node, hardwareprofile=hwprofile,
                             softwareprofile=swprofile) + '\n'
-                except ImportError:
+                except OsNotSupported:
                     self.getLogger().warning(
                         'OS support module not found for [%s]' % (
                             osFamilyInfo.name))
@@ -214,19 +279,23 @@ label Reinstall
             os.setegid(self.passdata.pw_gid)
             os.seteuid(self.passdata.pw_uid)
 
-            fp = os.open(
-                filename, os.O_CREAT | os.O_TRUNC | os.O_WRONLY, 0o644)
-
-            os.write(fp, result.encode())
-
-            os.close(fp)
+            _write_file(filename, result)
         finally:
             os.seteuid(current_euid)
             os.setegid(current_egid)
 
         if hwprofile.installType == 'package':
             # Now write out the kickstart file
-            self._writeKickstartFile(session, node, hwprofile, swprofile)
+            key = (hwprofile, swprofile)
+
+            if key not in kickstart_contexts:
+                kickstart_contexts[key] = self.__get_ossupport(
+                    swprofile).get_kickstart_context(
+                        session, hwprofile, swprofile)
+
+            self._writeKickstartFile(
+                session, node, hwprofile, swprofile,
+                context=kickstart_contexts[key])
 
         # Write 'cloud-init' configuration
 
@@ -234,36 +303,22 @@ label Reinstall
 
     def _writeKickstartFile(self, session: Session, node: Node,
                             hardwareprofile: HardwareProfile,
-                            softwareprofile: SoftwareProfile) -> None:
+                            softwareprofile: SoftwareProfile,
+                            context: Optional[Dict[str, Any]] = None) \
+            -> None:
         """
         Generate kickstart file for specified node
 
         Raises:
             OsNotSupported
         """
-        osFamilyName = softwareprofile.os.family.name
 
-        try:
-            osSupportModule = __import__(
-                'tortuga.os.%s.osSupport' % (osFamilyName),
-                fromlist=['OSSupport'])
-        except ImportError:
-            raise OsNotSupported(
-                'Operating system family [%s] not supported' % (
-                    osFamilyName))
-
-        OSSupport = osSupportModule.OSSupport
+        contents = self.__get_ossupport(
+            softwareprofile).getKickstartFileContents(
+                session, node, hardwareprofile, softwareprofile,
+                context=context)
 
-        tmpOsFamilyInfo = OsFamilyInfo(
-            softwareprofile.os.family.name,
-            softwareprofile.os.family.version,
-            softwareprofile.os.family.arch)
-
-        contents = OSSupport(tmpOsFamilyInfo).getKickstartFileContents(
-            session, node, hardwareprofile, softwareprofile)
-
-        with open(self.__get_kickstart_file_path(node), 'w') as fp:
-            fp.write(contents)
+        _write_file(self.__get_kickstart_file_path(node), contents)
 
     def _getDhcpNodeName(self, node: Node, nic: Nic): \
             # pylint: disable=unused-argument,no-self-use
@@ -299,30 +354,43 @@ label Reinstall
                     node.name, p.returncode, stdout))
 
     def removeDhcpLease(self, node: Node) -> None:
-        # Find first provisioning NIC
-        try:
-            nic = get_provisioning_nic(node)
-        except NicNotFound:
-            return
+        self.removeDhcpLeases([node])
 
-        self.getLogger().debug(
-            'Removing DHCP lease for node [%s] MAC [%s]' % (
-                node.name, nic.mac))
+    def removeDhcpLeases(self, nodes: List[Node]) -> None:
+        """
+        Remove the DHCP leases of all nodes in a single omshell session
+        """
 
-        dhcpName = self._getDhcpNodeName(node, nic)
+        cmds = 'connect\n'
+        names = []
 
-        cmds = dedent("""\
-            connect
-            new host
-            set name = "{name}"
-            set hardware-address = {mac}
-            set hardware-type = 1
-            set ip-address = {ip}
-            open
-            remove
-        """)
+        for node in nodes:
+            # Find first provisioning NIC
+            try:
+                nic = get_provisioning_nic(node)
+            except NicNotFound:
+                continue
 
-        cmds = cmds.format(name=dhcpName, mac=nic.mac, ip=nic.ip)
+            self.getLogger().debug(
+                'Removing DHCP lease for node [%s] MAC [%s]' % (
+                    node.name, nic.mac))
+
+            dhcpName = self._getDhcpNodeName(node, nic)
+
+            cmds += dedent("""\
+                new host
+                set name = "{name}"
+                set hardware-address = {mac}
+                set hardware-type = 1
+                set ip-address = {ip}
+                open
+                remove
+            """).format(name=dhcpName, mac=nic.mac, ip=nic.ip)
+
+            names.append(node.name)
+
+        if not names:
+            return
 
         p = subprocess.Popen(['/usr/bin/omshell'],
                              stdin=subprocess.PIPE,
@@ -332,8 +400,8 @@ label Reinstall
 
         if p.poll() != 0:
             self.getLogger().error(
-                'Error removing DHCP lease for node [%s] (retval=%d): %s' % (
-                    node.name, p.returncode, stdout))
+                'Error removing DHCP lease for node(s) [%s] (retval=%d):'
+                ' %s' % (' '.join(names), p.returncode, stdout))
 
     def getTftproot(self): \
             # pylint: disable=no-self-use
@@ -360,15 +428,16 @@ label Reinstall
                     osFamilyName))
 
     def __get_ossupport(self, softwareprofile):
-        OSSupport = self.__get_ossupport_module(
-            softwareprofile.os.family.name)
+        key = (softwareprofile.os.family.name,
+               softwareprofile.os.family.version,
+               softwareprofile.os.family.arch)
+
+        if key not in self.__ossupport_cache:
+            OSSupport = self.__get_ossupport_module(key[0])
 
-        tmpOsFamilyInfo = OsFamilyInfo(
-            softwareprofile.os.family.name,
-            softwareprofile.os.family.version,
-            softwareprofile.os.family.arch)
+            self.__ossupport_cache[key] = OSSupport(OsFamilyInfo(*key))
 
-        return OSSupport(tmpOsFamilyInfo)
+        return self.__ossupport_cache[key]
 
     def get_cloud_config(self, node, hardwareprofile=None,
                          softwareprofile=None):
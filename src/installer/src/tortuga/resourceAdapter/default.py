@@ -263,9 +263,10 @@ class Default(ResourceAdapter):
         except ParameterNotFound:
             dns_zone = ''
 
-        nodes = self.__add_predefined_nodes(
-            addNodesRequest, dbSession, dbHardwareProfile, dbSoftwareProfile,
-            dns_zone=dns_zone)
+        with self.addHostApi.allocation_batch():
+            nodes = self.__add_predefined_nodes(
+                addNodesRequest, dbSession, dbHardwareProfile,
+                dbSoftwareProfile, dns_zone=dns_zone)
 
         # This is a necessary evil for the time being, until there's
         # a proper context manager implemented.
@@ -380,10 +381,13 @@ class Default(ResourceAdapter):
 
             dbSession.add(node)
 
-            # Create DHCP/PXE configuration
-            self.writeLocalBootConfiguration(
-                node, dbHardwareProfile, dbSoftwareProfile)
+            newNodes.append(node)
+
+        # Create DHCP/PXE configuration for all nodes
+        self.writeLocalBootConfigurations(
+            newNodes, dbHardwareProfile, dbSoftwareProfile)
 
+        for node in newNodes:
             # Get the provisioning nic
             nics = get_provisioning_nics(node)
 
@@ -393,8 +397,6 @@ class Default(ResourceAdapter):
                 dbSoftwareProfile.name,
                 nics[0].ip if nics else None)
 
-            newNodes.append(node)
-
         return newNodes
 
     def __dhcp_discovery(self, addNodesRequest, dbSession, dbHardwareProfile,
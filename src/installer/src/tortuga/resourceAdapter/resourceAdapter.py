@@ -24,6 +24,8 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy.orm.session import Session
 
 import gevent
+import gevent.monkey
+import gevent.pool
 from tortuga.addhost.addHostManager import AddHostManager
 from tortuga.config.configManager import ConfigManager
 from tortuga.db.models.hardwareProfile import HardwareProfile
@@ -36,7 +38,10 @@ from tortuga.db.resourceAdapterConfigDbHandler import \
     ResourceAdapterConfigDbHandler
 from tortuga.events.types.node import NodeStateChanged
 from tortuga.exceptions.configurationError import ConfigurationError
+from tortuga.exceptions.deleteNodeFailed import DeleteNodeFailed
 from tortuga.exceptions.nicNotFound import NicNotFound
+from tortuga.exceptions.remoteCommunicationFailed import \
+    RemoteCommunicationFailed
 from tortuga.exceptions.resourceNotFound import ResourceNotFound
 from tortuga.exceptions.unsupportedOperation import UnsupportedOperation
 from tortuga.kit.actions.manager import KitActionsManager
@@ -66,6 +71,30 @@ class ResourceAdapter(UserDataMixin): \
 
     __adaptername__ = None
 
+    #
+    # Adapters that keep no per-request state (no session, add host
+    # session or caches) may set this to share a single instance
+    #
+    __stateless__ = False
+
+    #
+    # Node deletion fan-out: the maximum number of nodes deleted
+    # concurrently, the time allowed to delete each node (in seconds,
+    # including retries), and the number of retries, with exponential
+    # backoff, of transient errors. Deletions only run concurrently, and
+    # the timeout is only enforced, if the process has been monkey
+    # patched by gevent (as the gevent Celery worker pool does).
+    #
+    DELETE_CONCURRENCY = 20
+    DELETE_TIMEOUT = 600
+    DELETE_RETRIES = 3
+    DELETE_RETRY_DELAY = 2.0
+
+    #
+    # Exceptions raised by _delete_node() that are considered transient
+    #
+    DELETE_TRANSIENT_ERRORS = (RemoteCommunicationFailed, ConnectionError)
+
     def __init__(self, addHostSession: Optional[str] = None):
         if not self.__adaptername__:
             raise AttributeError(
@@ -199,28 +228,100 @@ class ResourceAdapter(UserDataMixin): \
 
         self.__trace(node, softwareProfileName, softwareProfileChanged)
 
-    def deleteNode(self, nodes: List[Node]) -> None:
+    def deleteNode(self, nodes: List[Node]) \
+            -> Optional[Dict[str, Optional[Exception]]]:
         """
         Remove the given node (active or idle) from the system
+
+        Adapters may return the result of _async_delete_nodes(); nodes
+        that could not be deleted are reported as failed and are not
+        removed from the database.
         """
 
         self.__trace(nodes)
 
-    def _async_delete_nodes(self, nodes):
+    def _async_delete_nodes(self, nodes: List[Node],
+                            concurrency: Optional[int] = None,
+                            timeout: Optional[float] = None) \
+            -> Dict[str, Optional[Exception]]:
         """
         Asynchronously delete nodes; calls "ResourceAdapter._delete_node()"
         method for each deleted nodes
 
-        :param dbNodes: list of Nodes objects
-        :return: None
+        At most 'concurrency' nodes are deleted at the same time. Transient
+        errors are retried, and each node is given at most 'timeout'
+        seconds; the timeout is only enforced while _delete_node() yields
+        to other greenlets. Unless the process has been monkey patched by
+        gevent, blocking I/O does not yield, so nodes are deleted one at
+        a time and the timeout is not enforced.
+
+        _delete_node() runs in concurrent greenlets, and must not use the
+        database session of the resource adapter.
+
+        :param nodes:       list of Nodes objects
+        :param concurrency: the maximum number of concurrent deletions,
+                            defaults to DELETE_CONCURRENCY
+        :param timeout:     the time allowed to delete each node, defaults
+                            to DELETE_TIMEOUT
+
+        :return: dict of node name to None if the node was deleted, or the
+                 exception raised while deleting it
         """
-        greenlets = []
+        if not gevent.monkey.is_module_patched('socket'):
+            self.getLogger().warning(
+                'gevent monkey patching is not enabled; blocking node'
+                ' deletions will not run concurrently or time out')
 
-        for node in nodes:
-            greenlets.append(gevent.spawn(self._delete_node, node))
+        pool = gevent.pool.Pool(concurrency or self.DELETE_CONCURRENCY)
+
+        greenlets = {
+            node.name: pool.spawn(
+                self.__delete_node_with_retries, node,
+                timeout or self.DELETE_TIMEOUT)
+            for node in nodes
+        }
+
+        pool.join()
+
+        return {
+            name: greenlet.value if greenlet.successful() else
+            greenlet.exception
+            for name, greenlet in greenlets.items()
+        }
+
+    def __delete_node_with_retries(self, node: Node, timeout: float) \
+            -> Optional[Exception]:
+        timeout_exc = DeleteNodeFailed(
+            'Timed out deleting node [%s] after %s seconds' % (
+                node.name, timeout))
+
+        try:
+            with gevent.Timeout(timeout, timeout_exc):
+                attempt = 0
+
+                while True:
+                    try:
+                        self._delete_node(node)
+
+                        return None
+                    except self.DELETE_TRANSIENT_ERRORS as exc:
+                        if attempt >= self.DELETE_RETRIES:
+                            raise
+
+                        delay = self.DELETE_RETRY_DELAY * 2 ** attempt
+
+                        self.getLogger().warning(
+                            'Error deleting node [%s] (retrying in %s'
+                            ' seconds): %s' % (node.name, delay, exc))
 
-        # TODO: implement timeout
-        gevent.joinall(greenlets)
+                        gevent.sleep(delay)
+
+                        attempt += 1
+        except Exception as exc:  # pylint: disable=broad-except
+            self.getLogger().error(
+                'Unable to delete node [%s]: %s' % (node.name, exc))
+
+            return exc
 
     def transferNode(self, nodeIdSoftwareProfileTuples,
                      newSoftwareProfileName: str):
@@ -487,6 +588,20 @@ class ResourceAdapter(UserDataMixin): \
             NicNotFound
         """
 
+        self.writeLocalBootConfigurations(
+            [node], hardwareprofile, softwareprofile)
+
+    def writeLocalBootConfigurations(self, nodes: List[Node],
+                                     hardwareprofile: HardwareProfile,
+                                     softwareprofile: SoftwareProfile):
+        """
+        Write PXE files and add DHCP leases for multiple nodes in the same
+        hardware and software profiles
+
+        Raises:
+            NicNotFound
+        """
+
         if not hardwareprofile.nics:
             # Hardware profile has no provisioning NICs defined. This
             # shouldn't happen...
@@ -500,31 +615,41 @@ class ResourceAdapter(UserDataMixin): \
         # Determine the provisioning nic for the hardware profile
         hwProfileProvisioningNic = hardwareprofile.nics[0]
 
-        nic = None
+        node_nics = []
+
+        for node in nodes:
+            nic = None
 
-        if hwProfileProvisioningNic.network:
-            # Find the nic attached to the newly added node that is on
-            # the same network as the provisioning nic.
-            nic = self.__findNicForProvisioningNetwork(
-                node.nics, hwProfileProvisioningNic.network)
+            if hwProfileProvisioningNic.network:
+                # Find the nic attached to the newly added node that is on
+                # the same network as the provisioning nic.
+                nic = self.__findNicForProvisioningNetwork(
+                    node.nics, hwProfileProvisioningNic.network)
 
-        if not nic or not nic.mac:
-            self.getLogger().warning(
-                'MAC address not defined for nic (ip=[%s]) on node [%s]' % (
-                    nic.ip, node.name))
+            if not nic or not nic.mac:
+                self.getLogger().warning(
+                    'MAC address not defined for nic (ip=[%s]) on node'
+                    ' [%s]' % (nic.ip, node.name))
+
+                continue
+
+            node_nics.append((node, nic))
 
+        if not node_nics:
             return
 
-        # Set up DHCP/PXE for newly addded node
+        # Set up DHCP/PXE for newly addded nodes
         bhm = getOsObjectFactory().getOsBootHostManager(self._cm)
 
-        # Write out the PXE file
-        bhm.writePXEFile(
-            self.session, node, hardwareprofile=hardwareprofile,
+        # Write out the PXE files
+        bhm.writePXEFiles(
+            self.session, [node for node, _ in node_nics],
+            hardwareprofile=hardwareprofile,
             softwareprofile=softwareprofile, localboot=False)
 
-        # Add a DHCP lease
-        bhm.addDhcpLease(node, nic)
+        # Add DHCP leases
+        for node, nic in node_nics:
+            bhm.addDhcpLease(node, nic)
 
     def removeLocalBootConfiguration(self, node: Node) -> None:
         bhm = self.osObject.getOsBootHostManager(self._cm)
@@ -13,11 +13,28 @@
 # limitations under the License.
 
 import pkgutil
+import threading
+from typing import Dict, Optional, Type
 
 from tortuga.exceptions.resourceNotFound import ResourceNotFound
 import tortuga.resourceAdapter
 
 
+#
+# Resource adapter classes, keyed by adapter name. Built on first use,
+# and rebuilt by refresh() when resource adapters are installed or
+# removed.
+#
+_registry: Optional[Dict[str, Type]] = None
+
+#
+# Instances of stateless resource adapters, keyed by adapter name
+#
+_instances: Dict[str, object] = {}
+
+_registry_lock = threading.RLock()
+
+
 def find_resourceadapters():
     """
     Finds all resource adapter classes.
@@ -51,6 +68,61 @@ def find_resourceadapters():
     return subclasses
 
 
+def _get_registry() -> Dict[str, Type]:
+    global _registry
+
+    with _registry_lock:
+        if _registry is None:
+            registry = {}
+
+            for adapter in find_resourceadapters():
+                if adapter.__adaptername__:
+                    registry.setdefault(adapter.__adaptername__, adapter)
+
+            _registry = registry
+
+        return _registry
+
+
+def register_resourceadapter_class(adapter_class: Type):
+    """
+    Adds a resource adapter class to the registry, replacing any class
+    previously registered with the same adapter name.
+
+    :param adapter_class: a ResourceAdapter subclass
+
+    """
+    with _registry_lock:
+        _get_registry()[adapter_class.__adaptername__] = adapter_class
+        _instances.pop(adapter_class.__adaptername__, None)
+
+
+def unregister_resourceadapter_class(adapter_name: str):
+    """
+    Removes a resource adapter class from the registry.
+
+    :param adapter_name: the name of the resource adapter
+
+    """
+    with _registry_lock:
+        _get_registry().pop(adapter_name, None)
+        _instances.pop(adapter_name, None)
+
+
+def refresh():
+    """
+    Discards the registry, so that resource adapter packages are scanned
+    again on the next lookup. Called when resource adapters are installed
+    or removed.
+
+    """
+    global _registry
+
+    with _registry_lock:
+        _registry = None
+        _instances.clear()
+
+
 def get_resourceadapter_class(adapter_name: str):
     """
     Gets the resource adapter class for the given resource adapter name.
@@ -60,9 +132,19 @@ def get_resourceadapter_class(adapter_name: str):
     :raises ResourceNotFound:
 
     """
-    for adapter in find_resourceadapters():
-        if adapter.__adaptername__ == adapter_name:
-            return adapter
+    adapter = _get_registry().get(adapter_name)
+    if adapter is not None:
+        return adapter
+
+    #
+    # The adapter may have been installed by another process since the
+    # registry was built
+    #
+    refresh()
+
+    adapter = _get_registry().get(adapter_name)
+    if adapter is not None:
+        return adapter
 
     raise ResourceNotFound(
         'Unable to find resource adapter [{0}]'.format(adapter_name))
@@ -71,11 +153,22 @@ def get_resourceadapter_class(adapter_name: str):
 def get_api(adapter_name: str):
     """
     Gets an instantiated resource adapter class for the given resource
-    adapter name.
+    adapter name. Adapters declaring themselves stateless are instantiated
+    once and the instance is shared.
 
     :param adapter_name:      the name of the resource adapter
     :return: ResourceAdapter: a resource adapter instance
     :raises ResourceNotFound:
 
     """
-    return get_resourceadapter_class(adapter_name)()
+    adapter_class = get_resourceadapter_class(adapter_name)
+
+    if not getattr(adapter_class, '__stateless__', False):
+        return adapter_class()
+
+    with _registry_lock:
+        instance = _instances.get(adapter_name)
+        if instance is None or type(instance) is not adapter_class:
+            instance = _instances[adapter_name] = adapter_class()
+
+        return instance
@@ -25,6 +25,7 @@ from tortuga.db.helper import get_installer_hostname_suffix
 from tortuga.db.nodesDbHandler import NodesDbHandler
 from tortuga.exceptions.nodeNotFound import NodeNotFound
 from tortuga.exceptions.parameterNotFound import ParameterNotFound
+from tortuga.kit.actions import registry
 from tortuga.kit.loader import load_kits
 from tortuga.kit.registry import get_kit_installer
 
@@ -122,8 +123,8 @@ def get_puppet_node_yaml(session, nodeName):
                     dbComponent.kit.version,
                     dbComponent.kit.iteration
                 )
-                kit_installer = get_kit_installer(kit_spec)()
-                kit_installer.session = session
+                kit_installer = registry.get_kit_installer(
+                    session, get_kit_installer(kit_spec))
                 _component = kit_installer.get_component_installer(
                     dbComponent.name)
 
@@ -0,0 +1,126 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Process-level cache of software profile metadata.
+
+Entries are stamped with the kit registry generation, which changes when
+kits are installed or deleted and components are enabled or disabled,
+and with the software profile generation, which changes when software
+profiles are created, updated, copied or deleted. Entries with an
+outdated stamp are ignored.
+
+invalidate() is called again when the transaction of the session making
+the change ends, so that metadata cached from the uncommitted state by
+other sessions is discarded.
+
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from tortuga.kit.actions import registry
+from tortuga.objectstore.generation import Generation
+
+
+GENERATION_KEY = 'softwareprofiles:generation'
+
+#
+# {software profile name: (stamp, metadata, volatile kit specs)}
+#
+_cache: Dict[str, Tuple[Tuple, dict, List[Tuple[str, str, str]]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _clear():
+    with _cache_lock:
+        _cache.clear()
+
+
+_generation = Generation(
+    GENERATION_KEY, 'software profile metadata', on_invalidate=_clear)
+
+
+def invalidate(session: Optional[Session] = None):
+    """
+    Invalidates the cached metadata of all software profiles in all
+    processes.
+
+    :param session: the database session making the change, if any; the
+                    cache is invalidated again when its transaction ends
+
+    """
+    _generation.invalidate(session)
+
+
+def get_stamp() -> Optional[Tuple]:
+    """
+    :return: the current version stamp, or None if it cannot be
+             determined
+
+    """
+    kit_generation = registry.get_generation()
+    if kit_generation is None:
+        return None
+
+    generation = _generation.get()
+    if generation is None:
+        return None
+
+    return kit_generation, generation
+
+
+def get(name: str, stamp: Optional[Tuple]) \
+        -> Optional[Tuple[dict, List[Tuple[str, str, str]]]]:
+    """
+    Gets cached metadata.
+
+    :param name:  the software profile name
+    :param stamp: the current version stamp
+
+    :return: a tuple of the cacheable metadata and the specs of the kits
+             with volatile metadata, or None if there is no current entry
+
+    """
+    if stamp is None:
+        return None
+
+    with _cache_lock:
+        entry = _cache.get(name)
+
+    if entry is None or entry[0] != stamp:
+        return None
+
+    return entry[1], entry[2]
+
+
+def put(name: str, stamp: Optional[Tuple], metadata: dict,
+        volatile_kits: List[Tuple[str, str, str]]):
+    """
+    Caches metadata.
+
+    :param name:          the software profile name
+    :param stamp:         the version stamp obtained before the metadata
+                          was retrieved
+    :param metadata:      the cacheable metadata
+    :param volatile_kits: the specs of the kits with volatile metadata
+
+    """
+    if stamp is None:
+        return
+
+    with _cache_lock:
+        _cache[name] = stamp, metadata, volatile_kits
@@ -27,6 +27,7 @@ from tortuga.db.softwareProfileDbApi import SoftwareProfileDbApi
 from tortuga.exceptions.componentNotFound import ComponentNotFound
 from tortuga.exceptions.kitNotFound import KitNotFound
 from tortuga.helper import osHelper
+from tortuga.kit.actions import registry as kit_actions_registry
 from tortuga.kit.registry import get_kit_installer
 from tortuga.objects.kit import Kit
 from tortuga.objects.softwareProfile import SoftwareProfile
@@ -34,6 +35,7 @@ from tortuga.objects.tortugaObject import TortugaObjectList
 from tortuga.objects.tortugaObjectManager import TortugaObjectManager
 from tortuga.os_utility import osUtility
 from tortuga.puppet import Puppet
+from tortuga.softwareprofile import metadataCache
 from tortuga.utility import validation
 
 
@@ -125,6 +127,8 @@ class SoftwareProfileManager(TortugaObjectManager): \
 
         self._sp_db_api.updateSoftwareProfile(session, softwareProfileObject)
 
+        metadataCache.invalidate(session)
+
     def getSoftwareProfile(
             self,
             session: Session,
@@ -279,6 +283,8 @@ class SoftwareProfileManager(TortugaObjectManager): \
         # DHCP/PXE/kickstart/OS) just create it now and we're done
         if unmanagedProfile:
             self._sp_db_api.addSoftwareProfile(session, swProfileSpec)
+
+            metadataCache.invalidate(session)
         else:
             if bOsMediaRequired and swProfileSpec.getOsInfo():
                 try:
@@ -391,6 +397,8 @@ class SoftwareProfileManager(TortugaObjectManager): \
             # Add the software profile
             self._sp_db_api.addSoftwareProfile(session, swProfileSpec)
 
+            metadataCache.invalidate(session)
+
             # Enable components in one fell swoop
             for comp in components:
                 self.getLogger().debug(
@@ -501,6 +509,8 @@ class SoftwareProfileManager(TortugaObjectManager): \
             self.getLogger().info(
                 'Component not enabled: {}'.format(comp_name))
         else:
+            kit_actions_registry.invalidate(session)
+
             self.getLogger().info(
                 'Enabled component on software profile: {} -> {}'.format(
                     best_match_component, software_profile
@@ -690,6 +700,8 @@ class SoftwareProfileManager(TortugaObjectManager): \
             best_match_component = self._disable_kit_component(
                 session, kit, comp_name, comp_version, software_profile)
 
+        kit_actions_registry.invalidate(session)
+
         self.getLogger().info(
             'Disabled component on software profile: {} -> {}'.format(
                 best_match_component, software_profile
@@ -794,6 +806,8 @@ class SoftwareProfileManager(TortugaObjectManager): \
 
         self._sp_db_api.deleteSoftwareProfile(session, name)
 
+        metadataCache.invalidate(session)
+
         # Remove all flags for software profile
         swProfileFlagPath = os.path.join(
             self._config_manager.getRoot(), 'var/run/actions/%s' % (name))
@@ -845,6 +859,8 @@ class SoftwareProfileManager(TortugaObjectManager): \
         self._sp_db_api.copySoftwareProfile(
             session, srcSoftwareProfileName, dstSoftwareProfileName)
 
+        metadataCache.invalidate(session)
+
     def getUsableNodes(self, session: Session, softwareProfileName):
         return self._sp_db_api.getUsableNodes(session, softwareProfileName)
 
@@ -852,28 +868,60 @@ class SoftwareProfileManager(TortugaObjectManager): \
             self, session: Session, name: str) -> Dict[str, str]:
         """
         Call action_get_metadata() method for all kits
+
+        Metadata of kits that do not declare it volatile is cached until
+        kits, components or software profiles change.
         """
 
+        stamp = metadataCache.get_stamp()
+
+        cached = metadataCache.get(name, stamp)
+        if cached is not None:
+            cached_metadata, volatile_kits = cached
+
+            metadata: Dict[str, str] = dict(cached_metadata)
+
+            for kit_spec in volatile_kits:
+                metadata.update(
+                    self.__get_kit_metadata(session, kit_spec, name))
+
+            return metadata
+
         self.getLogger().debug(
             'Retrieving metadata for software profile [%s]', name)
 
-        metadata: Dict[str, str] = {}
+        cacheable_metadata: Dict[str, str] = {}
+        volatile_metadata: Dict[str, str] = {}
+        volatile_kits = []
 
         for kit in self._kit_db_api.getKitList(session):
             if kit.getIsOs():
                 # ignore OS kits
                 continue
 
-            kit_installer = get_kit_installer(
-                (kit.getName(), kit.getVersion(), kit.getIteration())
-            )()
-            kit_installer.session = session
+            kit_spec = (kit.getName(), kit.getVersion(), kit.getIteration())
 
-            # we are only interested in software profile metadata
-            item = kit_installer.action_get_metadata(
-                software_profile_name=name)
+            if get_kit_installer(kit_spec).metadata_volatile:
+                volatile_kits.append(kit_spec)
 
-            if item:
-                metadata.update(item)
+                volatile_metadata.update(
+                    self.__get_kit_metadata(session, kit_spec, name))
+            else:
+                cacheable_metadata.update(
+                    self.__get_kit_metadata(session, kit_spec, name))
+
+        metadataCache.put(name, stamp, cacheable_metadata, volatile_kits)
+
+        metadata = dict(cacheable_metadata)
+        metadata.update(volatile_metadata)
 
         return metadata
+
+    def __get_kit_metadata(self, session: Session, kit_spec,
+                           name: str) -> Dict[str, str]:
+        kit_installer = kit_actions_registry.get_kit_installer(
+            session, get_kit_installer(kit_spec))
+
+        # we are only interested in software profile metadata
+        return kit_installer.action_get_metadata(
+            software_profile_name=name) or {}
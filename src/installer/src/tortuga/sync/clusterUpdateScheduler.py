@@ -0,0 +1,316 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional
+
+from redis import Redis
+
+
+logger = logging.getLogger(__name__)
+
+
+class ClusterUpdateScheduler:
+    """
+    Coalesces cluster update requests from all processes (tortugawsd,
+    Celery workers and command line tools) into as few cluster updates as
+    possible.
+
+    Requests, and the reasons given for them, are recorded in Redis. The
+    first process to request an update starts a scheduler thread, which
+    holds a lock in Redis while it waits for the requests to settle and
+    runs the update, refreshing the lock until it is released; the status
+    of a running update expires along with the lock, should the process
+    die. Every request pushes the update back by the debounce
+    window, but no further than the maximum delay after the first pending
+    request. Requests made while an update is running are picked up by
+    another update once it has finished.
+
+    :param redis_client: the Redis client
+    :param run_update:   callable running the cluster update, called with
+                         the list of coalesced reasons; returns the exit
+                         status of the update, or None to have the
+                         reasons rescheduled
+    :param debounce:     seconds to wait for further requests
+    :param max_delay:    maximum seconds an update may be deferred
+    :param namespace:    prefix for the Redis keys
+
+    """
+    #
+    # Seconds the scheduler lock is held without being refreshed
+    #
+    LOCK_TIMEOUT = 60
+
+    #
+    # Maximum number of seconds the scheduler sleeps before checking for
+    # new requests, and between refreshes of its lock
+    #
+    POLL_INTERVAL = 5
+
+    #
+    # Number of completed updates kept in the history
+    #
+    HISTORY_LENGTH = 20
+
+    #
+    # Seconds to wait before retrying an update that could not be run
+    #
+    RETRY_DELAY = 60
+
+    def __init__(self, redis_client: Redis,
+                 run_update: Callable[[List[str]], Optional[int]],
+                 debounce: float = 5, max_delay: float = 60,
+                 namespace: str = 'cluster-update'):
+        self._redis = redis_client
+        self._run_update = run_update
+        self.debounce = debounce
+        self.max_delay = max_delay
+
+        self._reasons_key = '{}:reasons'.format(namespace)
+        self._first_key = '{}:first'.format(namespace)
+        self._due_key = '{}:due'.format(namespace)
+        self._lock_key = '{}:lock'.format(namespace)
+        self._status_key = '{}:status'.format(namespace)
+        self._history_key = '{}:history'.format(namespace)
+
+        self._token = uuid.uuid4().hex
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def schedule(self, reason: Optional[str] = None,
+                 delay: Optional[float] = None):
+        """
+        Requests a cluster update.
+
+        :param reason: the reason for the update
+        :param delay:  seconds to wait for further requests, defaults to
+                       the debounce window
+
+        """
+        self._add_reasons([reason or 'unspecified'],
+                          self.debounce if delay is None else delay)
+
+        self._start()
+
+    def _add_reasons(self, reasons: List[str], delay: float):
+        now = time.time()
+
+        pipe = self._redis.pipeline()
+        pipe.rpush(self._reasons_key, *reasons)
+        pipe.set(self._first_key, now, nx=True)
+        pipe.set(self._due_key, now + delay)
+        pipe.execute()
+
+    def _start(self):
+        with self._thread_lock:
+            if self._thread is not None:
+                return
+
+            self._thread = threading.Thread(target=self._worker)
+            self._thread.start()
+
+    def _worker(self):
+        logger.debug('Cluster update scheduler running')
+
+        while True:
+            try:
+                if self._acquire_lock():
+                    try:
+                        while self._wait_until_due():
+                            self._run(self._pop_reasons())
+                    finally:
+                        self._release_lock()
+            except Exception:
+                logger.exception('Error running cluster update scheduler')
+
+            #
+            # Requests made while the lock was held are handled by the
+            # process holding it, unless they were made after it last
+            # checked for them, so check again after the lock has been
+            # released.
+            #
+            with self._thread_lock:
+                if not self.is_scheduled():
+                    self._thread = None
+
+                    break
+
+            time.sleep(min(self.POLL_INTERVAL, self.debounce or 1))
+
+        logger.debug('Cluster update scheduler exiting')
+
+    def _acquire_lock(self) -> bool:
+        return bool(self._redis.set(self._lock_key, self._token,
+                                    nx=True, ex=self.LOCK_TIMEOUT))
+
+    def _holds_lock(self, pipe) -> bool:
+        token = pipe.get(self._lock_key)
+
+        return token is not None and token.decode() == self._token
+
+    def _refresh_lock(self, running: bool = False):
+        """
+        Refreshes the lock, and the status of the running update if
+        'running' is True, if the lock is still held.
+
+        """
+        def refresh(pipe):
+            held = self._holds_lock(pipe)
+
+            pipe.multi()
+
+            if held:
+                pipe.expire(self._lock_key, self.LOCK_TIMEOUT)
+
+                if running:
+                    pipe.expire(self._status_key, self.LOCK_TIMEOUT)
+            else:
+                logger.warning('Cluster update scheduler lock lost')
+
+        self._redis.transaction(refresh, self._lock_key)
+
+    def _release_lock(self):
+        def release(pipe):
+            held = self._holds_lock(pipe)
+
+            pipe.multi()
+
+            if held:
+                pipe.delete(self._lock_key)
+
+        self._redis.transaction(release, self._lock_key)
+
+    def _heartbeat(self, stop: threading.Event):
+        """
+        Refreshes the lock while an update is running, until 'stop' is set.
+
+        """
+        while not stop.wait(self.POLL_INTERVAL):
+            try:
+                self._refresh_lock(running=True)
+            except Exception:
+                logger.exception('Error refreshing cluster update lock')
+
+    def _get_deadline(self) -> Optional[float]:
+        first, due = self._redis.mget(self._first_key, self._due_key)
+        if first is None or due is None:
+            return None
+
+        return min(float(due), float(first) + self.max_delay)
+
+    def _wait_until_due(self) -> bool:
+        """
+        Waits until the pending update is due.
+
+        :return bool: False if there is no pending update
+
+        """
+        while True:
+            deadline = self._get_deadline()
+            if deadline is None:
+                return False
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return True
+
+            time.sleep(min(remaining, self.POLL_INTERVAL))
+
+            self._refresh_lock()
+
+    def _pop_reasons(self) -> List[str]:
+        pipe = self._redis.pipeline()
+        pipe.lrange(self._reasons_key, 0, -1)
+        pipe.delete(self._reasons_key, self._first_key, self._due_key)
+        reasons = pipe.execute()[0]
+
+        return [reason.decode() for reason in reasons]
+
+    def _run(self, reasons: List[str]):
+        status = {
+            'running': True,
+            'reasons': reasons,
+            'started': time.time(),
+        }
+
+        self._redis.set(self._status_key, json.dumps(status),
+                        ex=self.LOCK_TIMEOUT)
+
+        logger.debug('Running cluster update, reasons: {}'.format(
+            ', '.join(reasons)))
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(stop,),
+                                     daemon=True)
+        heartbeat.start()
+
+        try:
+            exit_status = self._run_update(reasons)
+        except Exception:
+            logger.exception('Error running cluster update')
+
+            exit_status = -1
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        status['running'] = False
+        status['finished'] = time.time()
+        status['exitStatus'] = exit_status
+
+        pipe = self._redis.pipeline()
+        pipe.set(self._status_key, json.dumps(status))
+        pipe.lpush(self._history_key, json.dumps(status))
+        pipe.ltrim(self._history_key, 0, self.HISTORY_LENGTH - 1)
+        pipe.execute()
+
+        if exit_status is None:
+            self._add_reasons(reasons, self.RETRY_DELAY)
+
+    def is_scheduled(self) -> bool:
+        """
+        Returns True if a cluster update has been requested and has not
+        started yet.
+
+        """
+        return bool(self._redis.exists(self._due_key))
+
+    def get_status(self) -> dict:
+        """
+        Returns the status of the scheduler.
+
+        :return dict: 'running' and 'scheduled' flags, the reasons of the
+                      pending update and the most recent updates
+
+        """
+        pipe = self._redis.pipeline()
+        pipe.get(self._status_key)
+        pipe.lrange(self._reasons_key, 0, -1)
+        pipe.get(self._due_key)
+        pipe.lrange(self._history_key, 0, -1)
+        current, reasons, due, history = pipe.execute()
+
+        current = json.loads(current.decode()) if current else {}
+
+        return {
+            'running': bool(current.get('running')),
+            'scheduled': due is not None,
+            'due': float(due) if due is not None else None,
+            'reasons': [reason.decode() for reason in reasons],
+            'history': [json.loads(item.decode()) for item in history],
+        }
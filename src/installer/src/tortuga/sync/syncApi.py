@@ -58,3 +58,24 @@ class SyncApi(TortugaApi):
             self.getLogger().exception('Error getting update status')
 
             raise TortugaException(exception=ex)
+
+    def getUpdateStatusDetails(self):
+        """Return detailed cluster update status
+
+            Returns:
+                dict - 'running' is True if cluster update is currently
+                running, 'scheduled' is True if one is pending; also
+                includes the reasons for the pending update and the
+                history of recent updates
+            Throws:
+                TortugaException
+        """
+        try:
+            return SyncManager().getUpdateStatusDetails()
+        except Exception as ex:
+            if isinstance(ex, TortugaException):
+                raise
+
+            self.getLogger().exception('Error getting update status')
+
+            raise TortugaException(exception=ex)
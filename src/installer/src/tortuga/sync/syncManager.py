@@ -16,143 +16,113 @@
 
 import os.path
 import threading
-import time
 
 from tortuga.config.configManager import ConfigManager
 from tortuga.exceptions.commandFailed import CommandFailed
 from tortuga.objects.tortugaObjectManager import TortugaObjectManager
+from tortuga.objectstore.manager import ObjectStoreManager
 from tortuga.os_utility import osUtility
 from tortuga.os_utility.tortugaSubprocess import TortugaSubprocess
 from tortuga.utility import tortugaStatus
 from tortuga.utility.runManager import RunManager
 
+from .clusterUpdateScheduler import ClusterUpdateScheduler
+
 
 class SyncManager(TortugaObjectManager):
     """Class for cluster sync management"""
 
     __instanceLock = threading.RLock()
 
-    # update delay increase (seconds)
-    CLUSTER_UPDATE_DELAY_INCREASE = 30
-
-    # after this limit is reached, warning will be logged
-    CLUSTER_UPDATE_WARNING_LIMIT = 10
+    # Cluster update scheduler shared by all instances in this process
+    __scheduler = None
 
     def __init__(self):
         super(SyncManager, self).__init__()
 
-        self._isUpdateScheduled = False
-        self._isUpdateRunning = False
         self._sudoCmd = \
             osUtility.getOsObjectFactory().getOsSysManager().getSudoCommand()
         self._cm = ConfigManager()
 
-    def __runClusterUpdate(self):
-        """ Run cluster update. """
-        self.getLogger().debug('Update timer running')
-
+    def __getScheduler(self):
+        """ Get the process-wide cluster update scheduler. """
+        with SyncManager.__instanceLock:
+            if SyncManager.__scheduler is None:
+                SyncManager.__scheduler = ClusterUpdateScheduler(
+                    ObjectStoreManager.get_redis_client(),
+                    self.__runClusterUpdate,
+                    debounce=self._cm.getClusterUpdateDebounce(),
+                    max_delay=self._cm.getClusterUpdateMaxDelay(),
+                )
+
+            return SyncManager.__scheduler
+
+    def __runClusterUpdate(self, reasons):
+        """
+        Run cluster update.
+
+        :return: exit status of the update, or None if another update
+                 was already running
+        """
         updateCmd = '%s %s' % (
             self._sudoCmd,
             os.path.join(self._cm.getRoot(), 'bin/run_cluster_update.sh'))
 
-        delay = 0
-        updateCnt = 0
-        while self.__resetIsUpdateScheduled():
-            self._isUpdateRunning = True
-
-            self.getLogger().debug(
-                'New cluster update delay: %s seconds' % (delay))
-
-            time.sleep(delay)
-            delay += SyncManager.CLUSTER_UPDATE_DELAY_INCREASE
-
-            # Log warning if timer has been running for too many times.
-            updateCnt += 1
-            self.getLogger().debug(
-                'Cluster update timer count: %s' % (updateCnt))
-
-            if updateCnt > SyncManager.CLUSTER_UPDATE_WARNING_LIMIT:
-                self.getLogger().warning(
-                    'Cluster updated more than %s times using the same'
-                    ' timer (possible configuration problem)' % (
-                        SyncManager.CLUSTER_UPDATE_WARNING_LIMIT))
+        self.getLogger().debug(
+            'Starting cluster update using: %s, reasons: %s' % (
+                updateCmd, ', '.join(reasons)))
 
-            self.getLogger().debug(
-                'Starting cluster update using: %s' % (updateCmd))
+        p = TortugaSubprocess(updateCmd)
 
-            # Since we might sleep for a while, we need to
-            # reset update flag just before we run update to avoid
-            # unnecessary syncs.
+        try:
+            p.run()
 
-            self.__resetIsUpdateScheduled()
+            self.getLogger().debug('Cluster update successful')
+        except CommandFailed:
+            if p.getExitStatus() == tortugaStatus.\
+                    TORTUGA_ANOTHER_INSTANCE_OWNS_LOCK_ERROR:
+                self.getLogger().debug(
+                    'Another cluster update is already running, will'
+                    ' try to reschedule it')
 
-            p = TortugaSubprocess(updateCmd)
+                return None
 
-            try:
-                p.run()
+            self.getLogger().error(
+                'Update command "%s" failed (exit status: %s):'
+                ' %s' % (updateCmd, p.getExitStatus(), p.getStdErr()))
 
-                self.getLogger().debug('Cluster update successful')
-            except CommandFailed:
-                if p.getExitStatus() == tortugaStatus.\
-                        TORTUGA_ANOTHER_INSTANCE_OWNS_LOCK_ERROR:
-                    self.getLogger().debug(
-                        'Another cluster update is already running, will'
-                        ' try to reschedule it')
+        return p.getExitStatus()
 
-                    self._isUpdateRunning = False
+    def scheduleClusterUpdate(self, updateReason=None, delay=None):
+        """
+        Schedule cluster update.
 
-                    self.scheduleClusterUpdate(
-                        updateReason='another update already running',
-                        delay=60)
+        Requests made by all tortuga processes within the configured
+        debounce window are coalesced into a single cluster update.
+        """
+        self.getLogger().debug(
+            'Scheduling cluster update, reason: %s' % (updateReason))
 
-                    break
-                else:
-                    self.getLogger().error(
-                        'Update command "%s" failed (exit status: %s):'
-                        ' %s' % (
-                            updateCmd, p.getExitStatus(), p.getStdErr()))
+        self.__getScheduler().schedule(updateReason, delay=delay)
 
-            self.getLogger().debug('Done with cluster update')
+    def getUpdateStatus(self) -> bool:
+        """
+        Get cluster update status.
 
-        self._isUpdateRunning = False
+        :return: True if a cluster update is currently running
+        """
+        return self.getUpdateStatusDetails()['running']
 
-        self.getLogger().debug('Update timer exiting')
+    def getUpdateStatusDetails(self) -> dict:
+        """
+        Get detailed cluster update status.
 
-    def __resetIsUpdateScheduled(self):
-        """ Reset cluster update flag, return old flag value. """
-        SyncManager.__instanceLock.acquire()
-        try:
-            flag = self._isUpdateScheduled
-            self._isUpdateScheduled = False
-            return flag
-        finally:
-            SyncManager.__instanceLock.release()
-
-    def scheduleClusterUpdate(self, updateReason=None, delay=5):
-        """ Schedule cluster update. """
-        SyncManager.__instanceLock.acquire()
-        try:
-            if self._isUpdateScheduled:
-                # Already scheduled.
-                return
+        :return: dict with 'running' and 'scheduled' flags, the reasons
+                 for the pending update and the most recent updates
+        """
+        status = self.__getScheduler().get_status()
 
-            # Start update timer if needed.
-            self._isUpdateScheduled = True
-            if not self._isUpdateRunning:
-                self.getLogger().debug(
-                    'Scheduling cluster update in %s seconds,'
-                    ' reason: %s' % (delay, updateReason))
-
-                t = threading.Timer(delay, self.__runClusterUpdate)
+        status['running'] = \
+            status['running'] or RunManager().checkLock('cfmsync')
 
-                t.start()
-            else:
-                self.getLogger().debug(
-                    'Will not schedule new update timer while the old'
-                    ' timer is running')
-        finally:
-            SyncManager.__instanceLock.release()
-
-    def getUpdateStatus(self):  # pylint: disable=no-self-use
-        """ Check cluster update flag. """
-        return RunManager().checkLock('cfmsync')
+        return status
@@ -18,6 +18,8 @@ from typing import List
 
 from celery import Celery
 from celery.contrib.testing.app import TestApp
+from celery.signals import worker_init
+from kombu import Queue
 
 from tortuga.db.dbManager import DbManager
 from tortuga.kit.loader import load_kits
@@ -81,5 +83,28 @@ else:
     )
 
 
+#
+# Events are dispatched to event listeners through a dedicated queue.
+# Workers consume both the default queue and the events queue.
+#
+EVENTS_QUEUE = 'tortuga.events'
+
+app.conf.task_default_queue = 'celery'
+app.conf.task_queues = (
+    Queue('celery'),
+    Queue(EVENTS_QUEUE),
+)
+app.conf.task_routes = {
+    'tortuga.events.tasks.dispatch_events': {'queue': EVENTS_QUEUE},
+}
+
+
+@worker_init.connect
+def upgrade_database(**kwargs):  # pylint: disable=unused-argument
+    """
+    Bring the database schema up to date before the worker runs tasks
+    """
+    app.dbm.upgrade_database()
+
 if __name__ == '__main__':
     app.start()
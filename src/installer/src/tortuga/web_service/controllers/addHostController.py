@@ -107,6 +107,11 @@ class AddHostController(TortugaController):
     def getStatus(self, session, **kwargs):
         '''
         Call the addHost manager directly
+
+        Returns the session messages starting at offset 'startMessage'.
+        If 'wait' is specified, waits up to that many seconds for new
+        messages before returning. If too many requests are already
+        waiting, returns immediately, possibly without messages.
         '''
 
         startMessage = int(kwargs['startMessage']) \
@@ -116,8 +121,22 @@ class AddHostController(TortugaController):
             if 'getNodes' in kwargs else False
 
         try:
+            # Wait up to 'wait' seconds for new messages (long-polling)
+            try:
+                wait = float(kwargs['wait']) if kwargs.get('wait') else 0
+            except ValueError:
+                raise InvalidArgument('wait must be a number of seconds')
+
+            if wait > 0:
+                #
+                # Return the database connection to the pool while
+                # waiting; the session reconnects if it is used again
+                #
+                cherrypy.request.db.close()
+
             status = AddHostManager().getStatus(
-                cherrypy.request.db, session, int(startMessage), getNodes)
+                cherrypy.request.db, session, int(startMessage), getNodes,
+                wait=wait)
 
             response = {'addhoststatus': status.getCleanDict()}
         except NotFound as ex:
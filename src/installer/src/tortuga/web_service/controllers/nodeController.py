@@ -14,13 +14,18 @@
 
 # pylint: disable=no-member
 
+import http.client
+import urllib.parse
+
 from marshmallow import Schema, ValidationError, fields, validates
 
 import cherrypy
+from tortuga.db.nodesDbHandler import NODE_FILTERS
 from tortuga.exceptions.invalidArgument import InvalidArgument
 from tortuga.exceptions.nodeNotFound import NodeNotFound
 from tortuga.exceptions.nodeTransferNotValid import NodeTransferNotValid
 from tortuga.exceptions.operationFailed import OperationFailed
+from tortuga.node.changeCounter import get_node_generation
 from tortuga.node.task import enqueue_delete_hosts_request
 from tortuga.objects.tortugaObject import TortugaObjectList
 from tortuga.schema import NodeSchema
@@ -43,6 +48,14 @@ class UpdateNodeRequestSchema(Schema):
             )
 
 
+class UpdateNodeStatusSchema(UpdateNodeRequestSchema):
+    name = fields.String(255, required=True)
+
+
+class UpdateNodesStatusRequestSchema(Schema):
+    nodes = fields.Nested(UpdateNodeStatusSchema, many=True, required=True)
+
+
 class TransferNodesRequestSchema(Schema):
     srcSoftwareProfile = fields.String(255)
     dstSoftwareProfile = fields.String(255, required=True)
@@ -117,6 +130,12 @@ class NodeController(TortugaController):
             'action': 'updateNodeRequest',
             'method': ['PUT'],
         },
+        {
+            'name': 'updateNodesStatus',
+            'path': '/v1/node-status/',
+            'action': 'updateNodesStatusRequest',
+            'method': ['PUT'],
+        },
         {
             'name': 'getNodeByIpRequest',
             'path': '/v1/identify-node',
@@ -137,26 +156,59 @@ class NodeController(TortugaController):
         """
         Return list of all available nodes
 
+        The node list may be paged using the 'limit' and 'after' (name of
+        the last node of the previous page) query parameters; the URL of
+        the next page is returned in the 'Link' header. 'fields' is a
+        comma separated list of the node attributes to return.
+
+        Nodes may be filtered by name (nodespec), state, softwareprofile,
+        hardwareprofile, lockedState, isIdle and addHostSession; append
+        "__ne" to the parameter name to negate a filter.
+
+        Responses carry a weak ETag that changes whenever any node is
+        changed, so unchanged node lists are not fetched again.
+
         """
+        etag = self.__get_node_list_etag()
+        if etag:
+            if etag in [
+                    tag.strip() for tag in cherrypy.request.headers.get(
+                        'If-None-Match', '').split(',')]:
+                raise cherrypy.HTTPRedirect([], http.client.NOT_MODIFIED)
+
+            cherrypy.response.headers['ETag'] = etag
 
         tagspec = []
 
         if 'tag' in kwargs and kwargs['tag']:
             tagspec.extend(parse_tag_query_string(kwargs['tag']))
 
+        try:
+            limit = int(kwargs['limit']) if kwargs.get('limit') else None
+            if limit is not None and limit < 1:
+                raise ValueError()
+        except ValueError:
+            return self.errorResponse('limit must be a positive integer')
+
+        node_fields = None
+        if kwargs.get('fields'):
+            node_fields = [
+                field.strip() for field in kwargs['fields'].split(',')
+                if field.strip()
+            ]
+
+            invalid_fields = set(node_fields) - set(NodeSchema().fields)
+            if invalid_fields:
+                return self.errorResponse('Invalid fields: {}'.format(
+                    ', '.join(sorted(invalid_fields))))
+
         try:
             options = make_options_from_query_string(
                 kwargs['include']
                 if 'include' in kwargs else None,
                 ['softwareprofile', 'hardwareprofile'])
 
-            if 'addHostSession' in kwargs and kwargs['addHostSession']:
-                nodeList = self.app.node_api.getNodesByAddHostSession(
-                    cherrypy.request.db, kwargs['addHostSession'], options)
-            elif 'name' in kwargs and kwargs['name']:
-                nodeList = self.app.node_api.getNodesByNameFilter(
-                    cherrypy.request.db, kwargs['name'], optionDict=options)
-            elif 'installer' in kwargs and str2bool(kwargs['installer']):
+            if 'installer' in kwargs and str2bool(kwargs['installer']):
                 nodeList = TortugaObjectList(
                     [self.app.node_api.getInstallerNode(cherrypy.request.db)]
                 )
@@ -166,10 +218,17 @@ class NodeController(TortugaController):
                         cherrypy.request.db, kwargs['ip'])])
             else:
                 nodeList = self.app.node_api.getNodeList(
-                    cherrypy.request.db, tags=tagspec)
+                    cherrypy.request.db, tags=tagspec, limit=limit,
+                    after=kwargs.get('after'), fields=node_fields,
+                    filters=self.__get_node_filters(kwargs),
+                    optionDict=options)
+
+                if limit and len(nodeList) == limit:
+                    self.__set_next_link(kwargs, nodeList[-1].getName())
 
             response = {
-                'nodes': NodeSchema().dump(nodeList, many=True).data
+                'nodes': NodeSchema(only=node_fields).dump(
+                    nodeList, many=True).data
             }
         except Exception as ex:  # noqa pylint: disable=broad-except
             self.getLogger().exception('node WS API getNodes() failed')
@@ -178,6 +237,45 @@ class NodeController(TortugaController):
 
         return self.formatResponse(response)
 
+    @staticmethod
+    def __get_node_list_etag():
+        generation = get_node_generation()
+        if generation is None:
+            return None
+
+        return 'W/"nodes-{}"'.format(generation)
+
+    @staticmethod
+    def __get_node_filters(query: dict) -> dict:
+        """
+        Node filters (ie. "state=Installed", "state__ne=Deleted") found in
+        the query parameters
+        """
+        filters = {}
+
+        for key, value in query.items():
+            if key.partition('__')[0] not in NODE_FILTERS or not value:
+                continue
+
+            if key.startswith('isIdle'):
+                if isinstance(value, list):
+                    raise InvalidArgument(
+                        '{} may only be specified once'.format(key))
+
+                value = str2bool(value)
+
+            filters[key] = value
+
+        return filters
+
+    @staticmethod
+    def __set_next_link(query: dict, last_node_name: str):
+        params = dict(query)
+        params['after'] = last_node_name
+
+        cherrypy.response.headers['Link'] = '<{}>; rel="next"'.format(
+            cherrypy.url(qs=urllib.parse.urlencode(params, doseq=True)))
+
     @cherrypy.tools.json_out()
     @authentication_required()
     def getNodeById(self, node_id: str, **kwargs):
@@ -270,6 +368,48 @@ class NodeController(TortugaController):
 
         return self.formatResponse(response)
 
+    @cherrypy.tools.json_out()
+    @cherrypy.tools.json_in()
+    @authentication_required()
+    def updateNodesStatusRequest(self):
+        """
+        Update the status of multiple nodes in a single request
+
+        The request contains a list of nodes, each with a 'name' and
+        optional 'state' and 'bootFrom'. The response reports whether each
+        node changed, and lists the nodes that were not found.
+
+        """
+        try:
+            request_data, errors = \
+                UpdateNodesStatusRequestSchema().load(cherrypy.request.json)
+            if errors:
+                raise InvalidArgument(
+                    'Invalid argument(s): {}'.format(errors))
+
+            result = self.app.node_api.updateNodesStatus(
+                cherrypy.request.db, request_data['nodes'])
+
+            response = {
+                'changed': {
+                    name: changed for name, changed in result.items()
+                    if changed is not None
+                },
+                'notFound': [
+                    name for name, changed in result.items()
+                    if changed is None
+                ],
+            }
+        except Exception as ex:  # noqa pylint: disable=broad-except
+            self.getLogger().exception(
+                'node WS API updateNodesStatusRequest() failed')
+
+            self.handleException(ex)
+
+            response = self.errorResponse(str(ex))
+
+        return self.formatResponse(response)
+
     @cherrypy.tools.json_out()
     @cherrypy.tools.json_in()
     @authentication_required()
@@ -81,11 +81,7 @@ class UpdateController(TortugaController):
         """
 
         try:
-            status = self._syncApi.getUpdateStatus()
-
-            response = {
-                'running': status,
-            }
+            response = self._syncApi.getUpdateStatusDetails()
         except Exception as ex:
             self.getLogger().exception('getUpdateStatus() failed')
             self.handleException(ex)
@@ -96,6 +96,11 @@ class Controller(object):
         """
         Gets a list of objects from the configured object store.
 
+        If the object store supports cursor pagination and a full page
+        (limit) of objects is returned, the cursor for the next page is
+        returned in the X-Next-Cursor response header. Pass it as the
+        cursor query parameter to get the next page.
+
         :param query: query parameters
 
         :return List[dict]: a list of objects, in dict form
@@ -105,12 +110,18 @@ class Controller(object):
             params = self.build_params(query)
 
             response = []
+            obj = None
             for obj in self.object_store.list(**params):
                 if hasattr(obj, 'schema'):
                     response.append(obj.schema().dump(obj).data)
                 else:
                     response.append(obj)
 
+            if params.get('limit') and len(response) == params['limit'] \
+                    and getattr(self.object_store, 'supports_cursor', False):
+                cherrypy.response.headers['X-Next-Cursor'] = \
+                    self.object_store.get_cursor(obj)
+
         except Exception as ex:
             logger.error('%s' % ex)
             response = self.error_response(str(ex))
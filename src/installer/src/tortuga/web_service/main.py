@@ -85,6 +85,8 @@ def prepare_server():
     config = {
         '/': {
             'tools.db.on': True,
+            'tools.gzip.on': True,
+            'tools.gzip.mime_types': ['application/json'],
             'response.headers.server': 'Tortuga web service',
             'request.dispatch': rootRouteMapper.setupRoutes(),
         },
@@ -24,6 +24,8 @@ class DatabasePlugin(plugins.SimplePlugin):
         self.bus.subscribe('bind', self.bind)
 
     def start(self):
+        dbm.upgrade_database()
+
         self.sa_engine = dbm.engine
 
     def stop(self):
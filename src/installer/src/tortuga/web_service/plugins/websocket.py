@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import asyncio
+import functools
 import logging
 import os
 import ssl
@@ -24,6 +25,7 @@ import cherrypy
 import websockets
 from cherrypy.process import plugins
 
+from tortuga.web_service.websocket.broadcaster import EventBroadcaster
 from tortuga.web_service.websocket.state_manager import StateManager
 
 
@@ -44,12 +46,15 @@ class WebsocketPlugin(plugins.SimplePlugin):
 
         self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._thread: Optional[threading.Thread] = None
+        self._broadcaster: Optional[EventBroadcaster] = None
 
     def start(self):
         self._thread = threading.Thread(target=self.worker, daemon=True)
         self._thread.start()
 
     def stop(self):
+        if self._broadcaster:
+            self._broadcaster.stop()
         self._loop.stop()
         if self._debug:
             tracemalloc.stop()
@@ -74,6 +79,12 @@ class WebsocketPlugin(plugins.SimplePlugin):
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
 
+        #
+        # All websocket sessions share a single event subscription
+        #
+        self._broadcaster = EventBroadcaster(self._loop)
+        self._broadcaster.start()
+
         try:
             if self.scheme == 'wss':
                 server = self._start_secure()
@@ -108,7 +119,7 @@ class WebsocketPlugin(plugins.SimplePlugin):
         ssl_context = self._get_ssl_context()
 
         return websockets.serve(
-            websocket_handler, port=self.port, ssl=ssl_context)
+            self._get_handler(), port=self.port, ssl=ssl_context)
 
     def _get_ssl_context(self) -> ssl.SSLContext:
         cherrypy_cert = cherrypy.config.get('server.ssl_certificate', '')
@@ -134,7 +145,11 @@ class WebsocketPlugin(plugins.SimplePlugin):
             'Starting websocket with SSL/TLS disabled on port {}'.format(
                 self.port))
 
-        return websockets.serve(websocket_handler, port=self.port)
+        return websockets.serve(self._get_handler(), port=self.port)
+
+    def _get_handler(self):
+        return functools.partial(websocket_handler,
+                                 broadcaster=self._broadcaster)
 
 
 async def memory_stats():
@@ -151,18 +166,21 @@ async def memory_stats():
             logger.debug('Memory: {}'.format(stat))
 
 
-async def websocket_handler(websocket, path):
+async def websocket_handler(websocket, path,
+                            broadcaster: Optional[EventBroadcaster] = None):
     """
     The main websocket handler.
 
-    :param websocket: the websocket server instance
-    :param path:      the path requested on the websocket (unused)
+    :param websocket:   the websocket server instance
+    :param path:        the path requested on the websocket (unused)
+    :param broadcaster: the source of events for subscribed sessions
 
     """
     logger.debug('New websocket connection established')
 
     try:
-        state_manager = StateManager(websocket=websocket)
+        state_manager = StateManager(websocket=websocket,
+                                     broadcaster=broadcaster)
         consumer_task = asyncio.ensure_future(
             state_manager.consumer_handler())
         producer_task = asyncio.ensure_future(
@@ -173,12 +191,19 @@ async def websocket_handler(websocket, path):
         logger.error('Websocket connection exited')
         raise
 
-    done, pending = await asyncio.wait(
-        [consumer_task, producer_task],
-        return_when=asyncio.FIRST_COMPLETED,
-    )
+    try:
+        done, pending = await asyncio.wait(
+            [consumer_task, producer_task],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+
+        for task in pending:
+            task.cancel()
 
-    for task in pending:
-        task.cancel()
+    finally:
+        #
+        # Stop delivering events to the closed connection
+        #
+        state_manager.state.clear_message_queue()
 
     logger.debug('Websocket connection exited')
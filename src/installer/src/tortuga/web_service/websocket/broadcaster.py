@@ -0,0 +1,133 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import threading
+from typing import Optional, Set
+
+from tortuga.events.manager import PubSubManager
+from tortuga.events.pubsub import EventPubSub
+from tortuga.events.types import BaseEvent
+
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroadcaster:
+    """
+    Delivers events from a single, shared event pubsub subscription to all
+    subscribed websocket sessions.
+
+    The subscription is read by a dedicated thread that blocks waiting for
+    events, and each event is handed to the asyncio event loop, where it is
+    pushed onto the message queue of every subscribed session.
+
+    """
+    #
+    # Maximum number of seconds the reader thread blocks waiting for an
+    # event before checking whether it has been stopped
+    #
+    WAIT_TIMEOUT = 1.0
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        """
+        Initializer.
+
+        :param loop: the event loop running the websocket sessions
+
+        """
+        self._loop = loop
+        self._subscribers: Set['State'] = set()
+        self._pubsub: Optional[EventPubSub] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """
+        Subscribes to the event pubsub and starts the reader thread.
+
+        """
+        self._pubsub = PubSubManager.get()
+        self._pubsub.subscribe()
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.worker, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the pubsub reader thread.
+
+        """
+        self._stopped.set()
+
+    def add_subscriber(self, state: 'State'):
+        """
+        Adds a websocket session to the list of event recipients.
+
+        :param State state: the websocket session state
+
+        """
+        self._subscribers.add(state)
+
+    def remove_subscriber(self, state: 'State'):
+        """
+        Removes a websocket session from the list of event recipients.
+
+        :param State state: the websocket session state
+
+        """
+        self._subscribers.discard(state)
+
+    def broadcast(self, event: BaseEvent):
+        """
+        Enqueues an event for all subscribed sessions. Must be called from
+        the event loop thread.
+
+        :param BaseEvent event: the event to send
+
+        """
+        for state in list(self._subscribers):
+            state.enqueue_message(event)
+
+    def worker(self):
+        """
+        The thread worker that reads events from the pubsub.
+
+        """
+        logger.debug('Starting websocket event broadcaster')
+
+        try:
+            while not self._stopped.is_set():
+                try:
+                    event = self._pubsub.get_message(
+                        timeout=self.WAIT_TIMEOUT)
+
+                except Exception as ex:
+                    logger.error(
+                        'Error reading event pubsub: {}'.format(ex))
+                    self._stopped.wait(self.WAIT_TIMEOUT)
+                    continue
+
+                if event is None:
+                    continue
+
+                self._loop.call_soon_threadsafe(self.broadcast, event)
+
+        finally:
+            self._pubsub.unsubscribe()
+            self._pubsub = None
+
+        logger.debug('Websocket event broadcaster exited')
@@ -12,11 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from datetime import datetime, timedelta
-from typing import List, Union, Optional
+from typing import Optional, Union
 
 from tortuga.events.types import BaseEvent
-from tortuga.events.pubsub import EventPubSub
+from .broadcaster import EventBroadcaster
 from .messages import BaseMessage
 
 
@@ -27,10 +28,19 @@ class State:
     """
     AUTHENTICATION_TIMEOUT = 30  # Seconds
 
-    def __init__(self):
+    #
+    # Maximum number of messages queued for a session; if a client can't
+    # keep up, the oldest messages are discarded
+    #
+    MAX_QUEUED_MESSAGES = 1000
+
+    def __init__(self, broadcaster: Optional[EventBroadcaster] = None):
         """
         Initializer.
 
+        :param EventBroadcaster broadcaster: the source of events for
+                                             subscribed sessions
+
         """
         #
         # Authentication state
@@ -42,8 +52,10 @@ class State:
         #
         # Message queue state
         #
-        self._message_queue: List[Union[BaseMessage, BaseEvent]] = []
-        self.pubsub: EventPubSub = None
+        self._message_queue: asyncio.Queue = \
+            asyncio.Queue(maxsize=self.MAX_QUEUED_MESSAGES)
+        self._broadcaster: Optional[EventBroadcaster] = broadcaster
+        self.subscribed: bool = False
 
         #
         # Websocket state
@@ -79,6 +91,21 @@ class State:
             return True
         return False
 
+    def get_authentication_time_remaining(self) -> Optional[float]:
+        """
+        Gets the number of seconds until the authentication period expires.
+
+        :returns Optional[float]: the number of seconds remaining, or None
+                                  if there is no authentication timeout
+
+        """
+        if not self._authentication_timeout:
+            return None
+
+        remaining = self._authentication_timeout - datetime.now()
+
+        return max(remaining.total_seconds(), 0)
+
     def enqueue_message(self, msg: Union[BaseMessage, BaseEvent]):
         """
         Enqueues a message to be sent to the websocket client.
@@ -86,28 +113,51 @@ class State:
         :param Union[BaseMessage, BaseEvent] msg: the message to send
 
         """
-        self._message_queue.insert(0, msg)
+        if self._message_queue.full():
+            self._message_queue.get_nowait()
 
-    def next_message(self) -> Optional[Union[BaseMessage, BaseEvent]]:
+        self._message_queue.put_nowait(msg)
+
+    async def next_message(self, timeout: Optional[float] = None) -> \
+            Union[BaseMessage, BaseEvent]:
         """
-        Gets the next message to send from the queue.
+        Waits for the next message to send from the queue.
+
+        :param Optional[float] timeout: the maximum number of seconds to
+                                        wait, or None to wait indefinitely
+
+        :return Union[BaseMessage, BaseEvent]: the next message
+
+        :raises asyncio.TimeoutError: if no message arrives in time
 
-        :return Optional[Union[BaseMessage, BaseEvent]]: the next message if
-                                                         any, None otherwise
         """
-        #
-        # Queued messages take priority over pubsub messages
-        #
-        if self._message_queue:
-            return self._message_queue.pop()
+        return await asyncio.wait_for(self._message_queue.get(), timeout)
 
-        #
-        # If there are no queued messages, check for pubsub messages
-        #
-        if self.authenticated and self.pubsub:
-            return self.pubsub.get_message()
+    def subscribe(self):
+        """
+        Subscribes the session to events.
+
+        """
+        if self.subscribed:
+            return
+
+        if self._broadcaster:
+            self._broadcaster.add_subscriber(self)
+
+        self.subscribed = True
+
+    def unsubscribe(self):
+        """
+        Unsubscribes the session from events.
+
+        """
+        if not self.subscribed:
+            return
+
+        if self._broadcaster:
+            self._broadcaster.remove_subscriber(self)
 
-        return None
+        self.subscribed = False
 
     def clear_message_queue(self):
         """
@@ -116,13 +166,12 @@ class State:
 
         """
         #
-        # Unsubscribe from the event pubsub
+        # Unsubscribe from events
         #
-        if self.pubsub:
-            self.pubsub.unsubscribe()
-        self.pubsub = None
+        self.unsubscribe()
 
         #
         # Clear out the message queue
         #
-        self._message_queue = []
+        while not self._message_queue.empty():
+            self._message_queue.get_nowait()
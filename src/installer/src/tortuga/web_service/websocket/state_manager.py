@@ -15,13 +15,14 @@
 import asyncio
 import json
 import logging
-from typing import Type, Union
+from typing import Optional, Type, Union
 
 import websockets
 from marshmallow import UnmarshalResult
 
 from tortuga.events.types import BaseEvent
 from .actions import BaseAction, get_action_class
+from .broadcaster import EventBroadcaster
 from .exceptions import AuthenticationRequired, ActionNotFoundError
 from .messages import BaseMessage, AuthenticationRequiredMessage, ErrorMessage
 from .state import State
@@ -36,14 +37,18 @@ class StateManager:
     websocket session.
 
     """
-    def __init__(self, websocket: websockets.WebSocketServerProtocol):
+    def __init__(self, websocket: websockets.WebSocketServerProtocol,
+                 broadcaster: Optional[EventBroadcaster] = None):
         """
         Initializer.
 
+        :param websocket:   the websocket connection
+        :param broadcaster: the source of events for subscribed sessions
+
         """
         logger.debug('Initializing websocket state manager')
         self._websocket = websocket
-        self.state = State()
+        self.state = State(broadcaster=broadcaster)
         #
         # Enqueue an authentication message to be sent immediately upon
         # the websocket session being established
@@ -150,7 +155,7 @@ class StateManager:
         msg: Union[BaseMessage, BaseEvent] = None
 
         #
-        # This loops spins until there is a message to return
+        # This loop waits until there is a message to return
         #
         while not msg:
             #
@@ -162,6 +167,7 @@ class StateManager:
             # a final message down the pipe.
             #
             if self.state.is_authentication_timed_out():
+                self.state.clear_authentication_timeout()
                 self.state.clear_message_queue()
                 self.state.exit = True
                 self.state.exit_reason = 'Authentication timeout'
@@ -169,13 +175,15 @@ class StateManager:
                     ErrorMessage(reason='Authentication timeout')
                 )
 
-            msg = self.state.next_message()
-
             #
-            # If there is no message to send, we wait for a short period of
-            # time before trying again.
+            # Wait for the next message, but no longer than the remaining
+            # authentication period, so that a timeout is noticed promptly.
             #
-            if not msg:
-                await asyncio.sleep(1)
+            try:
+                msg = await self.state.next_message(
+                    timeout=self.state.get_authentication_time_remaining())
+
+            except asyncio.TimeoutError:
+                continue
 
         return msg
@@ -51,6 +51,8 @@ def disable_DbManager(monkeypatch, dbm):
 @pytest.fixture(autouse=True)
 def mock_redis(monkeypatch, redis):
     monkeypatch.setattr(objectstore_manager, 'Redis', lambda: redis)
+    monkeypatch.setattr(
+        objectstore_manager.ObjectStoreManager, '_redis_client', None)
 
 
 @pytest.fixture()
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import fnmatch
+import threading
 from typing import Dict, List, Union
 import re
 
@@ -20,22 +22,44 @@ import re
 class MockRedis:
     def __init__(self):
         self._data_store: Dict[bytes, Union[bytes, dict]] = {}
+        self._ttls: Dict[bytes, int] = {}
         self._channels: List[bytes] = []
         self._pubsubs: List[PubSub] = []
 
-    def delete(self, key: str):
-        bkey = key.encode()
-
-        try:
-            self._data_store.pop(bkey)
-        except KeyError:
-            pass
+    def delete(self, *keys: str):
+        for key in keys:
+            self._data_store.pop(key.encode(), None)
+            self._ttls.pop(key.encode(), None)
 
     def exists(self, key: str) -> bool:
         bkey = key.encode()
 
         return bkey in self._data_store.keys()
 
+    def expire(self, key: str, seconds: int) -> bool:
+        bkey = key.encode()
+
+        if bkey not in self._data_store:
+            return False
+
+        self._ttls[bkey] = seconds
+
+        return True
+
+    def persist(self, key: str) -> bool:
+        return self._ttls.pop(key.encode(), None) is not None
+
+    def ttl(self, key: str) -> int:
+        bkey = key.encode()
+
+        if bkey not in self._data_store:
+            return -2
+
+        return self._ttls.get(bkey, -1)
+
+    def get(self, key: str) -> bytes:
+        return self._data_store.get(key.encode(), None)
+
     def hmset(self, key: str, value: dict):
         bkey = key.encode()
 
@@ -46,6 +70,14 @@ class MockRedis:
 
         return self._data_store.get(bkey, None)
 
+    def incr(self, key: str, amount: int = 1) -> int:
+        bkey = key.encode()
+
+        value = int(self._data_store.get(bkey, 0)) + amount
+        self._data_store[bkey] = str(value).encode()
+
+        return value
+
     def keys(self, pattern: str) -> List[bytes]:
         keys: List[bytes] = []
 
@@ -56,6 +88,25 @@ class MockRedis:
 
         return keys
 
+    def lpush(self, key: str, *values: str):
+        list_ = self._data_store.setdefault(key.encode(), [])
+        for value in values:
+            list_.insert(0, str(value).encode())
+
+    def lrange(self, key: str, start: int, end: int) -> List[bytes]:
+        list_ = self._data_store.get(key.encode(), [])
+
+        return list_[start:] if end == -1 else list_[start:end + 1]
+
+    def ltrim(self, key: str, start: int, end: int):
+        bkey = key.encode()
+
+        if bkey in self._data_store:
+            self._data_store[bkey] = self.lrange(key, start, end)
+
+    def mget(self, *keys: str) -> List[bytes]:
+        return [self.get(key) for key in keys]
+
     def publish(self, channel: str, value: str):
         bchannel = channel.encode()
         bvalue = value.encode()
@@ -68,27 +119,84 @@ class MockRedis:
         for pubsub in self._pubsubs:
             pubsub._new_message(bchannel, bvalue)
 
+    def pipeline(self, transaction: bool = True) -> 'Pipeline':
+        return Pipeline(self)
+
+    def transaction(self, func, *watches: str):
+        """
+        Calls 'func' with a pipeline watching 'watches', and executes the
+        pipeline, retrying if a watched key was changed.
+
+        """
+        while True:
+            pipe = self.pipeline()
+            pipe.watch(*watches)
+
+            try:
+                func(pipe)
+
+                return pipe.execute()
+            except WatchError:
+                continue
+
     def pubsub(self) -> 'PubSub':
         p = PubSub(self)
         self._pubsubs.append(p)
 
         return p
 
-    def sadd(self, key: str, value: str):
+    def rpush(self, key: str, *values: str):
+        list_ = self._data_store.setdefault(key.encode(), [])
+        for value in values:
+            list_.append(str(value).encode())
+
+    def set(self, key: str, value, ex: int = None, nx: bool = False):
+        bkey = key.encode()
+
+        if nx and bkey in self._data_store:
+            return None
+
+        self._data_store[bkey] = str(value).encode()
+
+        if ex is not None:
+            self._ttls[bkey] = ex
+        else:
+            self._ttls.pop(bkey, None)
+
+        return True
+
+    def sadd(self, key: str, *values: str):
         bkey = key.encode()
 
         set_ = self._data_store.get(bkey, [])
-        set_.append(value.encode())
+        for value in values:
+            if value.encode() not in set_:
+                set_.append(value.encode())
         self._data_store[bkey] = set_
 
+    def srem(self, key: str, *values: str):
+        bkey = key.encode()
+
+        set_ = self._data_store.get(bkey, [])
+        for value in values:
+            if value.encode() in set_:
+                set_.remove(value.encode())
+
+        if not set_:
+            self._data_store.pop(bkey, None)
+
     def smembers(self, key: str) -> List[bytes]:
         bkey = key.encode()
 
         return self._data_store.get(bkey, [])
 
+    def sscan_iter(self, key: str, match: str = None, count: int = None):
+        yield from list(self.smembers(key))
+
     def sort(self, key: str, by: str = None, desc: bool = False,
-             alpha: bool = False) -> List[bytes]:
-        result = self.smembers(key)
+             alpha: bool = False, start: int = None,
+             num: int = None) -> List[bytes]:
+        result = list(self.smembers(key))
 
         sort_key = None
         if by:
@@ -96,15 +204,136 @@ class MockRedis:
             groups = m.groups()
             if not len(groups) == 1:
                 raise Exception('Mock does not support by: {}'.format(by))
-            sort_key = lambda obj_key: self._data_store[obj_key][groups[0]]
+            sort_key = lambda obj_key: self._data_store.get(
+                obj_key, {}).get(groups[0], 0)
 
         result.sort(key=sort_key)
 
         if desc:
             result.reverse()
 
+        if start is not None:
+            result = result[start:start + num]
+
         return result
 
+    def zadd(self, key: str, mapping: Dict[str, float]):
+        bkey = key.encode()
+
+        zset = self._data_store.setdefault(bkey, {})
+        for member, score in mapping.items():
+            zset[member.encode()] = float(score)
+
+    def zrem(self, key: str, *members: str):
+        bkey = key.encode()
+
+        zset = self._data_store.get(bkey, {})
+        for member in members:
+            zset.pop(member.encode(), None)
+
+        if not zset:
+            self._data_store.pop(bkey, None)
+
+    def zrangebyscore(self, key: str, min, max, start: int = None,
+                      num: int = None, withscores: bool = False):
+        return self._zrange(key, min, max, start, num, withscores, False)
+
+    def zrevrangebyscore(self, key: str, max, min, start: int = None,
+                         num: int = None, withscores: bool = False):
+        return self._zrange(key, min, max, start, num, withscores, True)
+
+    def _zrange(self, key: str, min, max, start, num, withscores, desc):
+        bkey = key.encode()
+
+        min_score, min_exclusive = _parse_score(min)
+        max_score, max_exclusive = _parse_score(max)
+
+        result = []
+        for member, score in self._data_store.get(bkey, {}).items():
+            if score < min_score or (min_exclusive and score == min_score):
+                continue
+            if score > max_score or (max_exclusive and score == max_score):
+                continue
+            result.append((member, score))
+
+        result.sort(key=lambda item: (item[1], item[0]), reverse=desc)
+
+        if start is not None:
+            result = result[start:start + num]
+
+        if withscores:
+            return result
+
+        return [member for member, _ in result]
+
+
+def _parse_score(score) -> tuple:
+    if isinstance(score, str):
+        if score.startswith('('):
+            return float(score[1:]), True
+        return float(score), False
+
+    return float(score), False
+
+
+class WatchError(Exception):
+    pass
+
+
+class Pipeline:
+    """
+    Commands are buffered and run by execute(). After watch(), commands
+    run immediately until multi() is called, and execute() raises
+    WatchError if a watched key has changed.
+
+    """
+    def __init__(self, redis_client: MockRedis):
+        self._redis: MockRedis = redis_client
+        self._commands: List[tuple] = []
+        self._watches: Dict[bytes, tuple] = {}
+        self._immediate = False
+
+    def __getattr__(self, name: str):
+        def command(*args, **kwargs):
+            if self._immediate:
+                return getattr(self._redis, name)(*args, **kwargs)
+
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return command
+
+    def _snapshot(self, bkey: bytes) -> tuple:
+        return (copy.deepcopy(self._redis._data_store.get(bkey)),
+                self._redis._ttls.get(bkey))
+
+    def watch(self, *keys: str):
+        for key in keys:
+            self._watches[key.encode()] = self._snapshot(key.encode())
+
+        self._immediate = True
+
+    def multi(self):
+        self._immediate = False
+
+    def reset(self):
+        self._commands = []
+        self._watches = {}
+        self._immediate = False
+
+    def execute(self) -> list:
+        try:
+            for bkey, snapshot in self._watches.items():
+                if self._snapshot(bkey) != snapshot:
+                    raise WatchError(bkey)
+
+            return [
+                getattr(self._redis, name)(*args, **kwargs)
+                for name, args, kwargs in self._commands
+            ]
+        finally:
+            self.reset()
+
 
 class PubSub:
     def __init__(self, redis_client: MockRedis):
@@ -112,13 +341,19 @@ class PubSub:
         self._patterns: List[bytes] = []
         self._subscriptions: List[bytes] = []
         self._messages: List[dict] = []
+        self._cond = threading.Condition()
 
-    def get_message(self, ignore_subscribe_messages: bool = True):
-        try:
-            return self._messages.pop()
+    def get_message(self, ignore_subscribe_messages: bool = True,
+                    timeout: float = 0):
+        with self._cond:
+            if not self._messages and timeout:
+                self._cond.wait(timeout)
 
-        except IndexError:
-            return None
+            try:
+                return self._messages.pop()
+
+            except IndexError:
+                return None
 
     def psubscribe(self, pattern: str):
         bpattern = pattern.encode()
@@ -139,9 +374,16 @@ class PubSub:
         self._subscriptions.append(bchannel)
 
     def unsubscribe(self):
-        self._patterns = []
-        self._subscriptions = []
-        self._messages = []
+        with self._cond:
+            self._patterns = []
+            self._subscriptions = []
+            self._messages = []
+
+    def close(self):
+        self.unsubscribe()
+
+        if self in self._redis._pubsubs:
+            self._redis._pubsubs.remove(self)
 
     def _new_channel(self):
         """
@@ -166,5 +408,7 @@ class PubSub:
         msg = {
             'data': message
         }
-        self._messages.insert(0, msg)
+        with self._cond:
+            self._messages.insert(0, msg)
+            self._cond.notify_all()
 
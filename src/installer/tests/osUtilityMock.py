@@ -31,6 +31,10 @@ class MockBootHostManager:
             # pylint: disable=unused-argument
         return
 
+    def writePXEFiles(self, *args, **kwargs): \
+            # pylint: disable=unused-argument
+        return
+
     def addDhcpLease(self, *args, **kwargs): \
             # pylint: disable=unused-argument
         pass
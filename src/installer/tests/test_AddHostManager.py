@@ -0,0 +1,148 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+import mock
+import pytest
+
+from tortuga.addhost import addHostManager
+from tortuga.addhost.addHostManager import AddHostManager
+from tortuga.exceptions.notFound import NotFound
+
+
+def test_status_messages(dbm):
+    manager = AddHostManager()
+
+    session_id = manager.createNewSession()
+
+    for idx in range(5):
+        manager.updateStatus(session_id, 'message {}'.format(idx))
+
+    with dbm.session() as session:
+        status = manager.getStatus(session, session_id, 0, False)
+        assert status.getMessageList() == [
+            'message {}'.format(idx) for idx in range(5)]
+
+        # offset reads
+        status = manager.getStatus(session, session_id, 3, False)
+        assert status.getMessageList() == ['message 3', 'message 4']
+
+        assert manager.getStatus(
+            session, session_id, 5, False).getMessageList() == []
+
+        # appends from other managers (processes) are visible
+        AddHostManager().updateStatus(session_id, 'message 5')
+
+        assert manager.getStatus(
+            session, session_id, 5, False).getMessageList() == ['message 5']
+
+        manager.delete_sessions([session_id])
+
+        with pytest.raises(NotFound):
+            manager.getStatus(session, session_id, 0, False)
+
+
+def test_status_long_poll(dbm):
+    manager = AddHostManager()
+
+    session_id = manager.createNewSession()
+
+    manager.updateStatus(session_id, 'message 0')
+
+    with dbm.session() as session:
+        # messages are available; no waiting
+        start = time.monotonic()
+        assert manager.getStatus(
+            session, session_id, 0, False,
+            wait=5).getMessageList() == ['message 0']
+        assert time.monotonic() - start < 1
+
+        # times out without new messages
+        start = time.monotonic()
+        assert manager.getStatus(
+            session, session_id, 1, False, wait=0.2).getMessageList() == []
+        assert time.monotonic() - start >= 0.2
+
+        # returns as soon as a new message is appended
+        timer = threading.Timer(
+            0.1, manager.updateStatus, args=(session_id, 'message 1'))
+        timer.start()
+
+        try:
+            start = time.monotonic()
+            assert manager.getStatus(
+                session, session_id, 1, False,
+                wait=5).getMessageList() == ['message 1']
+            assert time.monotonic() - start < 5
+        finally:
+            timer.join()
+
+
+def test_status_long_poll_keeps_session():
+    manager = AddHostManager()
+
+    session_id = manager.createNewSession()
+
+    db_session = mock.Mock()
+
+    # the caller's database session is left alone, even when waiting
+    manager.getStatus(db_session, session_id, 0, False, wait=0.1)
+    db_session.close.assert_not_called()
+
+
+def test_status_messages_ttl(redis):
+    manager = AddHostManager()
+
+    session_id = manager.createNewSession()
+
+    manager.updateStatus(session_id, 'message 0')
+
+    assert redis.ttl(
+        manager._AddHostManager__get_messages_key(session_id)) == \
+        addHostManager.STATUS_MESSAGES_TTL
+
+
+def test_status_long_poll_max_waiters(dbm, monkeypatch):
+    manager = AddHostManager()
+
+    session_id = manager.createNewSession()
+
+    # no waiting once all waiter slots are taken
+    monkeypatch.setattr(
+        addHostManager, '_status_waiters', threading.BoundedSemaphore(1))
+    addHostManager._status_waiters.acquire()
+
+    with dbm.session() as session:
+        start = time.monotonic()
+        assert manager.getStatus(
+            session, session_id, 0, False, wait=5).getMessageList() == []
+        assert time.monotonic() - start < 1
+
+
+def test_status_waiters_configured(monkeypatch):
+    from tortuga.config.configManager import ConfigManager
+
+    monkeypatch.setattr(addHostManager, '_status_waiters', None)
+    monkeypatch.setattr(
+        ConfigManager, 'getAddHostStatusWaiters', lambda self: 2)
+
+    status_waiters = addHostManager._get_status_waiters()
+
+    assert status_waiters.acquire(blocking=False)
+    assert status_waiters.acquire(blocking=False)
+    assert not status_waiters.acquire(blocking=False)
+
+    assert addHostManager._get_status_waiters() is status_waiters
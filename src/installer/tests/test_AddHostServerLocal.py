@@ -51,6 +51,91 @@ def test_generate_node_name(dbm):
         assert name1 == name3
 
 
+def clear_compute_session_nodes():
+    api.clear_session_nodes(
+        [Node(name='compute-{:02d}'.format(idx)) for idx in range(11, 100)])
+
+
+def test_generate_node_names(dbm):
+    clear_compute_session_nodes()
+
+    with dbm.session() as session:
+        names = api.generate_node_names(session, 'compute-#NN', 3)
+
+        # fixture sets up compute-01..compute-10
+        assert names == ['compute-11', 'compute-12', 'compute-13']
+
+        names = api.generate_node_names(
+            session, 'compute-#NN', 2, randomize=True)
+
+        assert [name[:-6] for name in names] == ['compute-01', 'compute-02']
+
+        # '#NN' can only represent 99 nodes
+        with pytest.raises(InvalidArgument):
+            api.generate_node_names(session, 'compute-#NN', 100)
+
+    clear_compute_session_nodes()
+
+
+def test_generate_node_names_failed(dbm):
+    clear_compute_session_nodes()
+
+    with dbm.session() as session:
+        with api.allocation_batch():
+            # '#NN' can only represent 99 nodes
+            with pytest.raises(InvalidArgument):
+                api.generate_node_names(session, 'compute-#NN', 100)
+
+            # Node numbers allocated by the failed request are released
+            assert api.generate_node_names(session, 'compute-#NN', 89)[-1] \
+                == 'compute-99'
+
+            # Only one host name can be generated without '#N'
+            assert api.generate_node_names(session, 'compute', 1) == \
+                ['compute']
+
+            with pytest.raises(InvalidArgument):
+                api.generate_node_names(session, 'compute', 2)
+
+    clear_compute_session_nodes()
+    api.clear_session_node(Node(name='compute'))
+
+
+def test_allocation_batch(dbm):
+    from tortuga.addhost import addHostServerLocal
+
+    clear_compute_session_nodes()
+
+    with dbm.session() as session:
+        with pytest.raises(InvalidArgument):
+            with api.allocation_batch():
+                assert api.generate_node_name(
+                    session, 'compute-#NN') == 'compute-11'
+
+                assert addHostServerLocal.nameSlotAllocators
+
+                raise InvalidArgument('add nodes batch failed')
+
+        # Allocators are discarded when the batch ends, even if it fails
+        assert not addHostServerLocal.nameSlotAllocators
+        assert not addHostServerLocal.ipAllocators
+
+        clear_compute_session_nodes()
+
+        # Nodes added since the last batch are seen by the next batch
+        session.add(Node(name='compute-11.private'))
+        session.flush()
+
+        try:
+            with api.allocation_batch():
+                assert api.generate_node_name(
+                    session, 'compute-#NN') == 'compute-12'
+        finally:
+            session.rollback()
+
+    clear_compute_session_nodes()
+
+
 def test_generate_provisioning_ip_address(dbm):
     with dbm.session() as session:
         networks = NetworksDbHandler().getNetworkList(session)
@@ -0,0 +1,50 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from tortuga.db.models.node import Node
+from tortuga.node.changeCounter import get_node_generation
+
+
+def test_node_generation(dbm):
+    generation = get_node_generation()
+    assert generation is not None
+
+    assert get_node_generation() == generation
+
+    with dbm.session() as session:
+        node = session.query(Node).filter(
+            Node.name == 'compute-01.private').one()
+
+        state = node.state
+        node.state = 'Changed'
+        session.flush()
+
+        #
+        # Not committed yet
+        #
+        assert get_node_generation() == generation
+
+        session.commit()
+
+        assert get_node_generation() > generation
+        generation = get_node_generation()
+
+        node.state = 'Rolled back'
+        session.flush()
+        session.rollback()
+
+        assert get_node_generation() == generation
+
+        node.state = state
+        session.commit()
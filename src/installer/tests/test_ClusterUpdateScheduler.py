@@ -0,0 +1,159 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from tortuga.sync.clusterUpdateScheduler import ClusterUpdateScheduler
+
+
+class UpdateRecorder:
+    def __init__(self, exit_status=0):
+        self.runs = []
+        self.exit_status = exit_status
+
+    def __call__(self, reasons):
+        self.runs.append(reasons)
+
+        exit_status, self.exit_status = self.exit_status, 0
+
+        return exit_status
+
+
+def wait_for_scheduler(*schedulers, timeout=5):
+    deadline = time.time() + timeout
+    while any(s._thread is not None for s in schedulers):
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_coalesce_updates(redis):
+    recorder = UpdateRecorder()
+
+    #
+    # Schedulers in different processes share state through redis
+    #
+    schedulers = [
+        ClusterUpdateScheduler(redis, recorder, debounce=0.2, max_delay=5)
+        for _ in range(4)
+    ]
+
+    for idx in range(200):
+        schedulers[idx % 4].schedule('node-{} state changed'.format(idx))
+
+    status = schedulers[0].get_status()
+    assert status['scheduled']
+    assert len(status['reasons']) == 200
+
+    wait_for_scheduler(*schedulers)
+
+    assert len(recorder.runs) == 1
+    assert len(recorder.runs[0]) == 200
+
+    status = schedulers[0].get_status()
+    assert not status['running']
+    assert not status['scheduled']
+    assert len(status['history']) == 1
+    assert status['history'][0]['exitStatus'] == 0
+    assert status['history'][0]['reasons'][0] == 'node-0 state changed'
+
+
+def test_max_delay(redis):
+    recorder = UpdateRecorder()
+
+    scheduler = ClusterUpdateScheduler(
+        redis, recorder, debounce=0.2, max_delay=0.3)
+
+    start = time.time()
+    while time.time() - start < 0.6:
+        scheduler.schedule('test')
+        time.sleep(0.02)
+
+    wait_for_scheduler(scheduler)
+
+    #
+    # Requests keep arriving within the debounce window, so without the
+    # maximum delay there would have been a single update at the end
+    #
+    assert len(recorder.runs) >= 2
+
+
+def test_reschedule(redis):
+    recorder = UpdateRecorder(exit_status=None)
+
+    scheduler = ClusterUpdateScheduler(
+        redis, recorder, debounce=0.05, max_delay=1)
+    scheduler.RETRY_DELAY = 0.05
+
+    scheduler.schedule('test')
+
+    wait_for_scheduler(scheduler)
+
+    assert recorder.runs == [['test'], ['test']]
+
+
+def test_lock_refreshed_while_running(redis):
+    observed = {}
+
+    def run_update(reasons):
+        # let the lock and the running status (almost) expire
+        redis.expire(scheduler._lock_key, 1)
+        redis.expire(scheduler._status_key, 1)
+
+        time.sleep(0.3)
+
+        observed['lock_ttl'] = redis.ttl(scheduler._lock_key)
+        observed['status_ttl'] = redis.ttl(scheduler._status_key)
+        observed['running'] = scheduler.get_status()['running']
+
+        return 0
+
+    scheduler = ClusterUpdateScheduler(redis, run_update, debounce=0.05)
+    scheduler.POLL_INTERVAL = 0.05
+
+    scheduler.schedule('test')
+
+    wait_for_scheduler(scheduler)
+
+    assert observed == {
+        'lock_ttl': scheduler.LOCK_TIMEOUT,
+        'status_ttl': scheduler.LOCK_TIMEOUT,
+        'running': True,
+    }
+
+    # the final status does not expire
+    assert redis.ttl(scheduler._status_key) == -1
+    assert not redis.exists(scheduler._lock_key)
+
+
+def test_lock_owner(redis):
+    scheduler = ClusterUpdateScheduler(redis, UpdateRecorder())
+    other = ClusterUpdateScheduler(redis, UpdateRecorder())
+
+    assert scheduler._acquire_lock()
+    assert not other._acquire_lock()
+
+    # only the holder refreshes or releases the lock
+    redis.expire(scheduler._lock_key, 1)
+    other._refresh_lock()
+    assert redis.ttl(scheduler._lock_key) == 1
+
+    other._release_lock()
+    assert redis.exists(scheduler._lock_key)
+
+    scheduler._refresh_lock()
+    assert redis.ttl(scheduler._lock_key) == scheduler.LOCK_TIMEOUT
+
+    scheduler._release_lock()
+    assert not redis.exists(scheduler._lock_key)
+
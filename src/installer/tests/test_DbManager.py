@@ -12,10 +12,120 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import configparser
 import unittest
+
 import pytest
+import sqlalchemy
+
+from tortuga.db.dbManager import DEFAULT_MAX_OVERFLOW
+
+from tortuga.db.models.base import ModelBase
+from tortuga.db.schemaUpgrade import upgrade_schema
 
 
 def test_instantiation(dbm):
     with dbm.session() as session:
         pass
+
+
+def test_upgrade_schema():
+    engine = sqlalchemy.create_engine('sqlite:///:memory:')
+
+    #
+    # nodes table as created before short names were added
+    #
+    engine.execute(
+        'CREATE TABLE nodes (id INTEGER PRIMARY KEY,'
+        ' name VARCHAR(255) NOT NULL UNIQUE, state VARCHAR(255),'
+        ' "addHostSession" VARCHAR(36))')
+    engine.execute(
+        "INSERT INTO nodes (name, state) VALUES"
+        " ('Compute-01.private', 'Installed'), ('compute-02', 'Installed')")
+
+    ModelBase.metadata.create_all(engine)
+    upgrade_schema(engine)
+
+    assert engine.execute(
+        'SELECT name, short_name FROM nodes ORDER BY id').fetchall() == [
+            ('Compute-01.private', 'compute-01'),
+            ('compute-02', 'compute-02'),
+        ]
+
+    indexes = {
+        index['name']
+        for index in sqlalchemy.inspect(engine).get_indexes('nodes')
+    }
+
+    assert {'ix_nodes_short_name', 'ix_nodes_state',
+            'ix_nodes_addHostSession'} <= indexes
+
+    # Upgrading is idempotent
+    upgrade_schema(engine)
+
+
+def test_get_pool_status(dbm):
+    checkouts = dbm.get_pool_status()['checkouts']
+
+    with dbm.session() as session:
+        session.execute('SELECT 1')
+
+    status = dbm.get_pool_status()
+
+    assert status['pool']
+    assert status['checkouts'] > checkouts
+
+
+def test_pool_config(dbm):
+    cfg = configparser.ConfigParser()
+    cfg.read_dict({
+        'database': {
+            'engine': 'mysql',
+            'username': 'tortuga',
+            'password': 'secret',
+            'pool_size': '5',
+            'pool_pre_ping': 'false',
+        },
+    })
+
+    db_config = dbm._refreshDbConfig(cfg)
+
+    assert db_config['pool_size'] == 5
+    assert db_config['max_overflow'] == DEFAULT_MAX_OVERFLOW
+    assert not db_config['pool_pre_ping']
+
+    cfg['database'].update({
+        'engine': 'sqlite',
+        'path': '/tmp/tortuga.sqlite',
+        'journal_mode': 'wal',
+    })
+    del cfg['database']['pool_pre_ping']
+
+    db_config = dbm._refreshDbConfig(cfg)
+
+    assert not db_config['pool_pre_ping']
+    assert db_config['journal_mode'] == 'wal'
+
+
+def test_upgrade_schema_uninitialized():
+    engine = sqlalchemy.create_engine('sqlite:///:memory:')
+
+    # nothing to upgrade before the database is initialized
+    upgrade_schema(engine)
+
+    engine.execute(
+        'CREATE TABLE nodes (id INTEGER PRIMARY KEY,'
+        ' name VARCHAR(255) NOT NULL UNIQUE, state VARCHAR(255),'
+        ' "addHostSession" VARCHAR(36))')
+    engine.execute("INSERT INTO nodes (name) VALUES ('compute-01.private')")
+
+    upgrade_schema(engine)
+
+    assert engine.execute('SELECT short_name FROM nodes').fetchall() == [
+        ('compute-01',)]
+
+
+def test_upgrade_database(dbm):
+    # upgrading an up-to-date schema is a no-op
+    dbm.upgrade_database()
+    dbm.upgrade_database()
@@ -0,0 +1,87 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ipaddress
+import time
+
+import pytest
+
+from tortuga.addhost.ipAllocator import IpAllocator
+from tortuga.exceptions.invalidArgument import InvalidArgument
+
+
+def test_allocate():
+    allocator = IpAllocator(ipaddress.IPv4Network('10.0.0.0/29'),
+                            used_ips=['10.0.0.2', '192.168.0.1'])
+
+    assert allocator.allocate() == '10.0.0.1'
+    assert allocator.allocate() == '10.0.0.3'
+
+    allocator.release('10.0.0.1')
+
+    assert allocator.allocate() == '10.0.0.1'
+    assert allocator.allocate_many(3) == ['10.0.0.4', '10.0.0.5', '10.0.0.6']
+
+    # the broadcast address is never allocated
+    with pytest.raises(InvalidArgument):
+        allocator.allocate()
+
+
+def test_allocate_start_ip_increment():
+    allocator = IpAllocator(ipaddress.IPv4Network('10.0.0.0/24'),
+                            start_ip='10.0.0.100', increment=50,
+                            used_ips=['10.0.0.150', '10.0.0.151'])
+
+    assert allocator.allocate_many(3) == \
+        ['10.0.0.100', '10.0.0.200', '10.0.0.250']
+
+    with pytest.raises(InvalidArgument):
+        allocator.allocate()
+
+
+def test_allocate_many_exhausted():
+    allocator = IpAllocator(ipaddress.IPv4Network('10.0.0.0/29'))
+
+    with pytest.raises(InvalidArgument):
+        allocator.allocate_many(7)
+
+    # nothing was allocated by the failed request
+    assert allocator.allocate_many(6)
+
+
+@pytest.mark.parametrize('prefixlen', [24, 20, 16])
+def test_allocate_benchmark(prefixlen):
+    network = ipaddress.IPv4Network('10.0.0.0/{}'.format(prefixlen))
+    num_hosts = network.num_addresses - 2
+
+    # half of the network is already allocated
+    used_ips = [ip for idx, ip in enumerate(network.hosts()) if idx % 2]
+
+    start = time.perf_counter()
+
+    allocator = IpAllocator(network, used_ips=used_ips)
+
+    ips = [allocator.allocate()
+           for _ in range(num_hosts - len(used_ips))]
+
+    elapsed = time.perf_counter() - start
+
+    assert len(set(ips) | set(str(ip) for ip in used_ips)) == num_hosts
+
+    with pytest.raises(InvalidArgument):
+        allocator.allocate()
+
+    # allocation is linear in the size of the network; scanning all
+    # addresses for each allocation would take minutes for a /16
+    assert elapsed < 5
@@ -0,0 +1,114 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from tortuga.db.models.component import Component
+from tortuga.db.models.softwareProfile import SoftwareProfile
+from tortuga.kit.actions import registry
+from tortuga.objectstore.manager import ObjectStoreManager
+
+
+class DummyKitInstaller:
+    instances = 0
+
+    def __init__(self):
+        DummyKitInstaller.instances += 1
+
+        self.session = None
+
+
+def test_get_kit_installer(dbm):
+    with dbm.session() as session:
+        kit_installer = registry.get_kit_installer(
+            session, DummyKitInstaller)
+
+        assert kit_installer.session is session
+
+        assert registry.get_kit_installer(
+            session, DummyKitInstaller) is kit_installer
+
+        registry.invalidate()
+
+        kit_installer2 = registry.get_kit_installer(
+            session, DummyKitInstaller)
+
+        assert kit_installer2 is not kit_installer
+
+        # Invalidated by another process
+        ObjectStoreManager.get_redis_client().incr(registry.GENERATION_KEY)
+
+        assert registry.get_kit_installer(
+            session, DummyKitInstaller) is not kit_installer2
+
+
+def test_get_enabled_component_names(dbm):
+    with dbm.session() as session:
+        compute = session.query(SoftwareProfile).filter(
+            SoftwareProfile.name == 'compute').one()
+
+        assert registry.get_enabled_component_names(
+            session, compute.id) == {'core'}
+
+        enabled = registry.get_enabled_component_names(session)
+        assert {'core', 'installer', 'dhcpd'} <= enabled
+        assert 'pdsh' not in enabled
+
+        pdsh = session.query(Component).filter(
+            Component.name == 'pdsh').one()
+
+        compute.components.append(pdsh)
+        session.commit()
+
+        try:
+            # Cached until invalidated
+            assert 'pdsh' not in registry.get_enabled_component_names(
+                session)
+
+            registry.invalidate()
+
+            assert 'pdsh' in registry.get_enabled_component_names(session)
+            assert registry.get_enabled_component_names(
+                session, compute.id) == {'core', 'pdsh'}
+        finally:
+            compute.components.remove(pdsh)
+            session.commit()
+
+            registry.invalidate()
+
+
+def test_invalidate_after_transaction(dbm):
+    with dbm.session() as session:
+        generation = registry.get_generation()
+
+        registry.invalidate(session)
+
+        invalidated_generation = registry.get_generation()
+        assert invalidated_generation != generation
+
+        # Invalidated again when the transaction ends...
+        session.commit()
+
+        committed_generation = registry.get_generation()
+        assert committed_generation != invalidated_generation
+
+        # ...but only once
+        session.commit()
+
+        assert registry.get_generation() == committed_generation
+
+        registry.invalidate(session)
+        generation = registry.get_generation()
+
+        session.rollback()
+
+        assert registry.get_generation() != generation
@@ -13,11 +13,13 @@
 # limitations under the License.
 
 import pytest
+from sqlalchemy import event
 
 from tortuga.db.nodeDbApi import NodeDbApi
 from tortuga.objects.node import Node
 from tortuga.objects.tortugaObject import TortugaObjectList
 from tortuga.exceptions.nodeNotFound import NodeNotFound
+from tortuga.node.nodeManager import get_default_relations
 
 
 def test_getNode(dbm):
@@ -74,3 +76,82 @@ def test_getNodeList(dbm):
     assert isinstance(result, TortugaObjectList)
 
     assert isinstance(result[0], Node)
+
+
+@pytest.fixture()
+def query_counter(dbm):
+    """
+    Count SQL statements executed on the database engine
+    """
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(dbm.engine, 'before_cursor_execute', before_cursor_execute)
+
+    yield statements
+
+    event.remove(dbm.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def test_getNodeList_query_count(dbm, query_counter):
+    """
+    Ensure number of queries does not depend on number of nodes
+    """
+
+    options = get_default_relations({'nics': True})
+
+    with dbm.session() as session:
+        result = NodeDbApi().getNodesByNameFilter(
+            session, 'compute-01', optionDict=options)
+
+        assert len(result) == 1
+
+        single_node_query_count = len(query_counter)
+
+    del query_counter[:]
+
+    with dbm.session() as session:
+        result = NodeDbApi().getNodeList(session, optionDict=options)
+
+        assert len(result) > 10
+
+        assert result[0].getHardwareProfile().getName()
+
+        assert result[0].getSoftwareProfile().getName()
+
+        assert len(query_counter) == single_node_query_count
+
+
+def test_getNodeList_keyset_pagination(dbm):
+    with dbm.session() as session:
+        all_nodes = [
+            node.getName() for node in NodeDbApi().getNodeList(session)]
+
+        nodes = []
+        after = None
+        while True:
+            page = NodeDbApi().getNodeList(session, limit=5, after=after)
+            if not page:
+                break
+
+            assert len(page) <= 5
+
+            nodes.extend(node.getName() for node in page)
+            after = page[-1].getName()
+
+    assert nodes == all_nodes
+
+
+def test_getNodeList_without_relations(dbm, query_counter):
+    with dbm.session() as session:
+        result = NodeDbApi().getNodeList(
+            session, optionDict={}, resource_adapter=False)
+
+        assert result[0].getHardwareProfile() is None
+
+        assert result[0].getSoftwareProfile() is None
+
+    assert len(query_counter) == 1
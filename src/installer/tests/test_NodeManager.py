@@ -40,7 +40,8 @@ class TestNodeManager:
             Node(name='compute-02', softwareprofile=swprofile),
         ]
 
-        NodeManager()._NodeManager__validate_delete_nodes_request(nodes, False)
+        NodeManager()._NodeManager__validate_delete_nodes_request(
+            None, nodes, False)
 
     def test_validate_delete_nodes_request_alt(
             self, get_os_object_factory_mock): \
@@ -59,7 +60,7 @@ class TestNodeManager:
 
         with pytest.raises(OperationFailed):
             NodeManager()._NodeManager__validate_delete_nodes_request(
-                nodes, False)
+                None, nodes, False)
 
     def test_simple_validate_delete_nodes_request_alt(
             self, get_os_object_factory_mock): \
@@ -76,7 +77,7 @@ class TestNodeManager:
 
         with pytest.raises(OperationFailed):
             NodeManager()._NodeManager__validate_delete_nodes_request(
-                nodes, False)
+                None, nodes, False)
 
 
     def test_simple_validate_delete_nodes_request_alt_with_force(
@@ -92,7 +93,8 @@ class TestNodeManager:
                                                 lockedState='SoftLocked')),
         ]
 
-        NodeManager()._NodeManager__validate_delete_nodes_request(nodes, True)
+        NodeManager()._NodeManager__validate_delete_nodes_request(
+            None, nodes, True)
 
 
     def test_simple_validate_delete_nodes_request_alt2(
@@ -110,4 +112,215 @@ class TestNodeManager:
 
         with pytest.raises(OperationFailed):
             NodeManager()._NodeManager__validate_delete_nodes_request(
-                nodes, False)
+                None, nodes, False)
+
+
+@mock.patch('tortuga.os_utility.osUtility.getOsObjectFactory',
+            side_effect=get_os_object_factory)
+def test_validate_delete_nodes_request_min_nodes(
+        get_os_object_factory_mock, dbm): \
+        # pylint: disable=unused-argument
+    manager = NodeManager()
+
+    with dbm.session() as session:
+        node = manager._nodesDbHandler.getNode(session, 'compute-01.private')
+
+        node.softwareprofile.minNodes = 10
+
+        try:
+            with pytest.raises(OperationFailed, match='minimum of 10 nodes'):
+                manager._NodeManager__validate_delete_nodes_request(
+                    session, [node], False)
+
+            node.softwareprofile.minNodes = 9
+
+            manager._NodeManager__validate_delete_nodes_request(
+                session, [node], False)
+        finally:
+            session.rollback()
+
+
+@mock.patch('tortuga.os_utility.osUtility.getOsObjectFactory',
+            side_effect=get_os_object_factory)
+def test_update_nodes_status(get_os_object_factory_mock, dbm): \
+        # pylint: disable=unused-argument
+    manager = NodeManager()
+
+    with dbm.session() as session:
+        compute_09 = manager._nodesDbHandler.getNode(
+            session, 'compute-09.private')
+        compute_10 = manager._nodesDbHandler.getNode(
+            session, 'compute-10.private')
+
+        original = {
+            node.name: (node.state, node.bootFrom)
+            for node in (compute_09, compute_10)
+        }
+
+        with mock.patch.object(manager._bhm, 'writePXEFiles') as \
+                write_pxe_files, \
+                mock.patch('tortuga.node.nodeManager.NodeStateChanged') as \
+                event, \
+                mock.patch.object(manager, '_NodeManager__scheduleUpdate') as \
+                schedule_update:
+            result = manager.updateNodesStatus(session, [
+                # state change only
+                {'name': 'compute-09.private', 'state': 'Provisioned'},
+                # bootFrom change only, matched on short name
+                {'name': 'compute-10',
+                 'bootFrom': 1 - (compute_10.bootFrom or 0)},
+                {'name': 'compute-99.private', 'state': 'Installed'},
+            ])
+
+            assert result == {
+                'compute-09.private': True,
+                'compute-10': True,
+                'compute-99.private': None,
+            }
+
+            # PXE files are only written for nodes whose bootFrom changed
+            write_pxe_files.assert_called_once()
+            assert [node.name for node in write_pxe_files.call_args[0][1]] \
+                == ['compute-10.private']
+
+            # an event for each state change
+            event.fire.assert_called_once()
+            change = event.fire.call_args[1]
+            assert change['node']['name'] == 'compute-09.private'
+            assert change['node']['state'] == 'Provisioned'
+            assert change['previous_state'] == original[
+                'compute-09.private'][0]
+
+            schedule_update.assert_called_once()
+
+            assert manager._nodesDbHandler.getNode(
+                session, 'compute-09.private').state == 'Provisioned'
+
+            # unchanged
+            write_pxe_files.reset_mock()
+            event.reset_mock()
+
+            assert manager.updateNodesStatus(session, [
+                {'name': 'compute-09.private', 'state': 'Provisioned'},
+            ]) == {'compute-09.private': False}
+
+            write_pxe_files.assert_not_called()
+            event.fire.assert_not_called()
+
+        for name, (state, bootFrom) in original.items():
+            node = manager._nodesDbHandler.getNode(session, name)
+            node.state, node.bootFrom = state, bootFrom
+
+        session.commit()
+
+
+@mock.patch('tortuga.os_utility.osUtility.getOsObjectFactory',
+            side_effect=get_os_object_factory)
+def test_delete_node_events_batched(get_os_object_factory_mock, dbm): \
+        # pylint: disable=unused-argument
+    from tortuga.events import dispatcher
+
+    manager = NodeManager()
+
+    fired = []
+
+    def fire(**kwargs):
+        fired.append(
+            (kwargs['node']['name'],
+             getattr(dispatcher._batch, 'pending', None) is not None))
+
+    adapter = mock.Mock()
+    adapter.deleteNode.return_value = {}
+
+    with dbm.session() as session:
+        nodes = [
+            manager._nodesDbHandler.getNode(session, name)
+            for name in ('compute-09.private', 'compute-10.private')
+        ]
+
+        original = {node.name: node.state for node in nodes}
+
+        try:
+            with mock.patch(
+                    'tortuga.node.nodeManager.resourceAdapterFactory.get_api',
+                    return_value=adapter), \
+                    mock.patch.object(manager, '_bhm'), \
+                    mock.patch(
+                        'tortuga.node.nodeManager.NodeStateChanged.fire',
+                        side_effect=fire):
+                result = manager._NodeManager__delete_node(session, nodes)
+
+            assert [node.name for node in result['NodesDeleted']] == \
+                list(original)
+
+            # all events are fired in a single batch
+            assert fired == [(name, True) for name in original]
+        finally:
+            session.rollback()
+
+            for name, state in original.items():
+                manager._nodesDbHandler.getNode(session, name).state = state
+
+            session.commit()
+
+
+@mock.patch('tortuga.os_utility.osUtility.getOsObjectFactory',
+            side_effect=get_os_object_factory)
+def test_delete_node_partial_failure(get_os_object_factory_mock, dbm): \
+        # pylint: disable=unused-argument
+    from tortuga.exceptions.deleteNodeFailed import DeleteNodeFailed
+
+    manager = NodeManager()
+
+    names = ['delete-01.private', 'delete-02.private']
+
+    adapter = mock.Mock()
+    adapter.deleteNode.return_value = {
+        'delete-01.private': DeleteNodeFailed('timed out'),
+        'delete-02.private': None,
+    }
+
+    with dbm.session() as session:
+        compute_01 = manager._nodesDbHandler.getNode(
+            session, 'compute-01.private')
+
+        for name in names:
+            session.add(Node(name=name, state='Installed',
+                             softwareprofile=compute_01.softwareprofile,
+                             hardwareprofile=compute_01.hardwareprofile))
+
+        session.commit()
+
+        try:
+            with mock.patch(
+                    'tortuga.node.nodeManager.resourceAdapterFactory.get_api',
+                    return_value=adapter), \
+                    mock.patch('tortuga.node.nodeManager.KitActionsManager'), \
+                    mock.patch.object(manager, '_bhm') as bhm, \
+                    mock.patch.object(manager, '_addHostManager'), \
+                    mock.patch.object(manager, '_syncApi'), \
+                    mock.patch(
+                        'tortuga.node.nodeManager.NodeStateChanged.fire'):
+                result = manager.deleteNode(session, ','.join(names))
+
+            assert result['NodesDeleted'] == ['delete-02.private']
+            assert result['DeleteNodeFailed'] == ['delete-01.private']
+
+            # node files are only removed for deleted nodes, in a
+            # single call
+            bhm.removeDeletedNodeFiles.assert_called_once()
+            assert [node.name for node in
+                    bhm.removeDeletedNodeFiles.call_args[0][0]] == \
+                ['delete-02.private']
+
+            # nodes that failed to delete remain in the database
+            remaining = session.query(Node).filter(
+                Node.name.in_(names)).all()
+
+            assert [node.name for node in remaining] == ['delete-01.private']
+            assert remaining[0].state == 'Deleted'
+        finally:
+            for node in session.query(Node).filter(Node.name.in_(names)):
+                session.delete(node)
+
+            session.commit()
@@ -15,8 +15,11 @@
 import unittest
 
 import pytest
+from sqlalchemy import event
 
+from tortuga.db.nodeRequestsDbHandler import NodeRequestsDbHandler
 from tortuga.db.nodesDbHandler import NodesDbHandler
+from tortuga.exceptions.invalidArgument import InvalidArgument
 from tortuga.exceptions.nodeNotFound import NodeNotFound
 from tortuga.config.configManager import getfqdn
 
@@ -274,6 +277,228 @@ def test_expand_nodespec_default(dbm):
             installer in [node.name for node in result]
 
 
+def test_getNodeList_filters(dbm):
+    with dbm.session() as session:
+        nodes = NodesDbHandler().getNodeList(session)
+
+        def select(predicate):
+            return sorted(node.name for node in nodes if predicate(node))
+
+        def query(**filters):
+            return sorted(
+                node.name for node in NodesDbHandler().getNodeList(
+                    session, filters=filters))
+
+        assert query(state='Installed') == \
+            select(lambda node: node.state == 'Installed')
+
+        assert query(state__ne=['Installed', 'Deleted']) == \
+            select(lambda node: node.state not in ('Installed', 'Deleted'))
+
+        assert query(softwareprofile='compute', state='Installed') == \
+            select(lambda node: node.softwareprofile and
+                   node.softwareprofile.name == 'compute' and
+                   node.state == 'Installed')
+
+        assert query(hardwareprofile__ne='Installer') == \
+            select(lambda node: node.hardwareprofile.name != 'Installer')
+
+        assert query(name='compute-0*') == \
+            select(lambda node: node.name.startswith('compute-0'))
+
+        assert query(isIdle=False, lockedState='Unlocked') == \
+            select(lambda node: not node.isIdle and
+                   node.lockedState == 'Unlocked')
+
+
+def test_getNodeList_invalid_filter(dbm):
+    with dbm.session() as session:
+        with pytest.raises(InvalidArgument):
+            NodesDbHandler().getNodeList(session, filters={'rack': 1})
+
+        with pytest.raises(InvalidArgument):
+            NodesDbHandler().getNodeList(
+                session, filters={'state__gt': 'Installed'})
+
+
+def get_query_plans(session, func):
+    """
+    Call 'func' and return the SQLite query plans of the statements it
+    executed
+    """
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters,
+                              context, executemany):
+        statements.append((statement, parameters))
+
+    engine = session.get_bind()
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+
+    try:
+        func()
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    cursor = session.connection().connection.cursor()
+
+    return [
+        ' '.join(row[-1] for row in cursor.execute(
+            'EXPLAIN QUERY PLAN ' + statement, parameters).fetchall())
+        for statement, parameters in statements
+    ]
+
+
+@pytest.mark.parametrize('name,expected', [
+    ('compute-01', 'compute-01.private'),
+    ('COMPUTE-01', 'compute-01.private'),
+    ('compute-01.private', 'compute-01.private'),
+    ('Compute-01.Private', 'compute-01.private'),
+])
+def test_getNode_short_name(dbm, name, expected):
+    with dbm.session() as session:
+        plans = get_query_plans(
+            session, lambda: NodesDbHandler().getNode(session, name))
+
+        assert 'ix_nodes_short_name' in plans[0]
+
+        assert NodesDbHandler().getNode(session, name).name == expected
+
+
+@pytest.mark.parametrize('nodespec', [
+    'compute-01', 'compute-01.private', 'compute-0*', 'compute-0*.private',
+])
+def test_expand_nodespec_uses_index(dbm, nodespec):
+    with dbm.session() as session:
+        plans = get_query_plans(
+            session,
+            lambda: NodesDbHandler().expand_nodespec(session, nodespec))
+
+        assert 'ix_nodes_short_name' in plans[0]
+
+
+def test_expand_nodespec_prefix(dbm):
+    with dbm.session() as session:
+        names = [node.name for node in NodesDbHandler().getNodeList(session)]
+
+        result = NodesDbHandler().expand_nodespec(session, 'COMPUTE-0*')
+
+        assert sorted(node.name for node in result) == \
+            sorted(name for name in names if name.startswith('compute-0'))
+
+        result = NodesDbHandler().expand_nodespec(session, '*-01.private')
+
+        assert sorted(node.name for node in result) == \
+            sorted(name for name in names if name.endswith('-01.private'))
+
+
+def test_getNodeList_state_uses_index(dbm):
+    with dbm.session() as session:
+        plans = get_query_plans(
+            session,
+            lambda: NodesDbHandler().getNodeList(
+                session, filters={'state': 'Installed'}))
+
+        assert 'ix_nodes_state' in plans[0]
+
+
+def test_getNodesByAddHostSession_uses_index(dbm):
+    with dbm.session() as session:
+        plans = get_query_plans(
+            session,
+            lambda: NodesDbHandler().getNodesByAddHostSession(
+                session, '1234'))
+
+        assert 'ix_nodes_addHostSession' in plans[0]
+
+        plans = get_query_plans(
+            session,
+            lambda: NodeRequestsDbHandler().get_by_addHostSession(
+                session, '1234'))
+
+        assert 'ix_node_requests_addHostSession' in plans[0]
+
+
+def test_getTransferCandidates(dbm):
+    from tortuga.db.softwareProfilesDbHandler import SoftwareProfilesDbHandler
+
+    with dbm.session() as session:
+        compute = SoftwareProfilesDbHandler().getSoftwareProfile(
+            session, 'compute')
+        compute2 = SoftwareProfilesDbHandler().getSoftwareProfile(
+            session, 'compute2')
+
+        handler = NodesDbHandler()
+
+        nodes = {
+            node.name: node
+            for node in handler.getNodeList(session, softwareProfile='compute')
+        }
+
+        nodes['compute-01.private'].lockedState = 'HardLocked'
+        nodes['compute-02.private'].lockedState = 'SoftLocked'
+        nodes['compute-03.private'].state = 'Provisioned'
+        nodes['compute-04.private'].softwareprofile = compute2
+
+        try:
+            result = handler.getTransferCandidates(
+                session, compute2, srcSoftwareProfile=compute,
+                state='Installed', limit=3)
+
+            assert [node.name for node in result] == [
+                'compute-05.private', 'compute-06.private',
+                'compute-07.private',
+            ]
+
+            result = handler.getTransferCandidates(
+                session, compute2, srcSoftwareProfile=compute,
+                lockedState='SoftLocked')
+
+            assert [node.name for node in result] == ['compute-02.private']
+
+            #
+            # Without a source software profile, nodes already in the
+            # destination software profile are excluded
+            #
+            result = handler.getTransferCandidates(
+                session, compute2, state='Installed')
+
+            assert 'compute-04.private' not in [node.name for node in result]
+
+            result = handler.getTransferCandidates(
+                session, compute, state='Installed')
+
+            assert [node.name for node in result] == ['compute-04.private']
+        finally:
+            session.rollback()
+
+
+def test_getNodeCountsBySoftwareProfile(dbm):
+    from tortuga.db.softwareProfilesDbHandler import SoftwareProfilesDbHandler
+
+    with dbm.session() as session:
+        compute = SoftwareProfilesDbHandler().getSoftwareProfile(
+            session, 'compute')
+        compute2 = SoftwareProfilesDbHandler().getSoftwareProfile(
+            session, 'compute2')
+
+        handler = NodesDbHandler()
+
+        assert handler.getNodeCountsBySoftwareProfile(
+            session, [compute.id, compute2.id], lock=True) == {
+                compute.id: 10,
+                compute2.id: 0,
+            }
+
+        plans = get_query_plans(
+            session,
+            lambda: handler.getNodeCountsBySoftwareProfile(
+                session, [compute.id]))
+
+        assert 'ix_nodes_softwareProfileId_lockedState' in plans[0]
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -30,3 +30,100 @@ def test_failed_instantiation():
         __adaptername__ = 'testadapter'
 
     MyResourceAdapter()
+
+
+def test_resourceadapter_registry():
+    from tortuga.exceptions.resourceNotFound import ResourceNotFound
+    from tortuga.resourceAdapter import resourceAdapterFactory
+    from tortuga.resourceAdapter.default import Default
+
+    assert resourceAdapterFactory.get_resourceadapter_class('default') \
+        is Default
+
+    class StatelessResourceAdapter(ResourceAdapter):
+        __adaptername__ = 'stateless'
+        __stateless__ = True
+
+    class StatefulResourceAdapter(ResourceAdapter):
+        __adaptername__ = 'stateful'
+
+    resourceAdapterFactory.register_resourceadapter_class(
+        StatelessResourceAdapter)
+    resourceAdapterFactory.register_resourceadapter_class(
+        StatefulResourceAdapter)
+
+    try:
+        adapter = resourceAdapterFactory.get_api('stateless')
+        assert isinstance(adapter, StatelessResourceAdapter)
+        assert resourceAdapterFactory.get_api('stateless') is adapter
+
+        assert resourceAdapterFactory.get_api('stateful') is not \
+            resourceAdapterFactory.get_api('stateful')
+    finally:
+        resourceAdapterFactory.unregister_resourceadapter_class('stateless')
+        resourceAdapterFactory.unregister_resourceadapter_class('stateful')
+
+    with pytest.raises(ResourceNotFound):
+        resourceAdapterFactory.get_resourceadapter_class('stateless')
+
+
+def test_async_delete_nodes():
+    from types import SimpleNamespace
+
+    import gevent
+
+    from tortuga.exceptions.deleteNodeFailed import DeleteNodeFailed
+    from tortuga.exceptions.remoteCommunicationFailed import \
+        RemoteCommunicationFailed
+
+    class DeletingResourceAdapter(ResourceAdapter):
+        __adaptername__ = 'deleting'
+
+        DELETE_RETRY_DELAY = 0.01
+
+        def __init__(self):
+            super().__init__()
+
+            self.running = 0
+            self.max_running = 0
+            self.attempts = {}
+
+        def _delete_node(self, node):
+            self.attempts[node.name] = self.attempts.get(node.name, 0) + 1
+
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+            try:
+                gevent.sleep(0.01)
+
+                if node.name == 'hung':
+                    gevent.sleep(10)
+                elif node.name == 'flaky' and \
+                        self.attempts[node.name] < 3:
+                    raise RemoteCommunicationFailed('try again')
+                elif node.name == 'broken':
+                    raise ValueError('broken')
+            finally:
+                self.running -= 1
+
+    adapter = DeletingResourceAdapter()
+
+    nodes = [SimpleNamespace(name='node-%02d' % (idx)) for idx in range(10)]
+    nodes += [SimpleNamespace(name=name)
+              for name in ('hung', 'flaky', 'broken')]
+
+    result = adapter._async_delete_nodes(nodes, concurrency=4, timeout=0.5)
+
+    assert adapter.max_running == 4
+
+    assert all(result['node-%02d' % (idx)] is None for idx in range(10))
+
+    assert result['flaky'] is None
+    assert adapter.attempts['flaky'] == 3
+
+    assert isinstance(result['hung'], DeleteNodeFailed)
+
+    # non-transient errors are not retried
+    assert isinstance(result['broken'], ValueError)
+    assert adapter.attempts['broken'] == 1
@@ -0,0 +1,96 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from tortuga.kit.actions import registry
+from tortuga.softwareprofile import metadataCache
+from tortuga.softwareprofile.softwareProfileManager import \
+    SoftwareProfileManager
+
+
+class CacheableKitInstaller:
+    metadata_volatile = False
+    calls = 0
+
+    def __init__(self):
+        self.session = None
+
+    def action_get_metadata(self, software_profile_name=None):
+        CacheableKitInstaller.calls += 1
+
+        return {'cacheable': software_profile_name}
+
+
+class VolatileKitInstaller(CacheableKitInstaller):
+    metadata_volatile = True
+
+    def action_get_metadata(self, software_profile_name=None):
+        VolatileKitInstaller.calls += 1
+
+        return {'volatile': VolatileKitInstaller.calls}
+
+
+def get_kit_installer(kit_spec):
+    return VolatileKitInstaller if kit_spec[0] == 'base' \
+        else CacheableKitInstaller
+
+
+def test_get_software_profile_metadata(dbm, monkeypatch):
+    monkeypatch.setattr(
+        'tortuga.softwareprofile.softwareProfileManager.get_kit_installer',
+        get_kit_installer)
+
+    metadataCache.invalidate()
+
+    with dbm.session() as session:
+        mgr = SoftwareProfileManager()
+
+        metadata = mgr.get_software_profile_metadata(session, 'compute')
+        assert metadata['cacheable'] == 'compute'
+        assert metadata['volatile'] == 1
+
+        cacheable_calls = CacheableKitInstaller.calls
+
+        # Only volatile metadata is retrieved again
+        metadata = mgr.get_software_profile_metadata(session, 'compute')
+        assert metadata['cacheable'] == 'compute'
+        assert metadata['volatile'] == 2
+        assert CacheableKitInstaller.calls == cacheable_calls
+
+        # Kit and component changes invalidate the cache
+        registry.invalidate()
+
+        mgr.get_software_profile_metadata(session, 'compute')
+        assert CacheableKitInstaller.calls > cacheable_calls
+
+        cacheable_calls = CacheableKitInstaller.calls
+
+        # ...as do software profile changes
+        metadataCache.invalidate()
+
+        mgr.get_software_profile_metadata(session, 'compute')
+        assert CacheableKitInstaller.calls > cacheable_calls
+
+
+def test_invalidate_after_transaction(dbm):
+    with dbm.session() as session:
+        stamp = metadataCache.get_stamp()
+
+        metadataCache.invalidate(session)
+
+        invalidated_stamp = metadataCache.get_stamp()
+        assert invalidated_stamp != stamp
+
+        session.commit()
+
+        assert metadataCache.get_stamp() != invalidated_stamp
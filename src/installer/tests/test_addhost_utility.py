@@ -0,0 +1,85 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from tortuga.addhost.utility import get_pending_node_count
+from tortuga.addhost.utility import validate_addnodes_request
+from tortuga.db.models.nodeRequest import NodeRequest
+from tortuga.db.softwareProfilesDbHandler import SoftwareProfilesDbHandler
+from tortuga.exceptions.operationFailed import OperationFailed
+from .osUtilityMock import get_os_object_factory
+
+
+def test_validate_addnodes_request_max_nodes(dbm):
+    with dbm.session() as session:
+        compute = SoftwareProfilesDbHandler().getSoftwareProfile(
+            session, 'compute')
+
+        compute.maxNodes = 10
+
+        try:
+            with pytest.raises(OperationFailed, match='exceeds'):
+                validate_addnodes_request(session, {
+                    'softwareProfile': 'compute',
+                    'hardwareProfile': 'localiron',
+                    'count': 1,
+                })
+        finally:
+            session.rollback()
+
+
+def test_validate_addnodes_request_max_nodes_pending(dbm, monkeypatch):
+    monkeypatch.setattr('tortuga.os_utility.osUtility.getOsObjectFactory',
+                        get_os_object_factory)
+
+    with dbm.session() as session:
+        compute = SoftwareProfilesDbHandler().getSoftwareProfile(
+            session, 'compute')
+
+        compute.maxNodes = 14
+
+        session.add(NodeRequest(
+            request=json.dumps({'softwareProfile': 'compute', 'count': 3}),
+            action='ADD', state='pending'))
+        session.add(NodeRequest(
+            request=json.dumps({'softwareProfile': 'compute', 'count': 5}),
+            action='ADD', state='error'))
+        session.add(NodeRequest(
+            request=json.dumps({'softwareProfile': 'compute2',
+                                'nodeDetails': [{}, {}]}),
+            action='ADD', state='pending'))
+
+        try:
+            assert get_pending_node_count(session, 'compute') == 3
+            assert get_pending_node_count(session, 'compute2') == 2
+
+            # 10 nodes and 3 pending
+            with pytest.raises(OperationFailed, match='exceeds'):
+                validate_addnodes_request(session, {
+                    'softwareProfile': 'compute',
+                    'hardwareProfile': 'localiron',
+                    'count': 2,
+                })
+
+            validate_addnodes_request(session, {
+                'softwareProfile': 'compute',
+                'hardwareProfile': 'localiron',
+                'count': 1,
+                'nodeDetails': [{'mac': '00:00:00:00:00:01'}],
+            })
+        finally:
+            session.rollback()
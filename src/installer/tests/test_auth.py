@@ -190,3 +190,58 @@ def test_username_password_authentication_method(dbm):
     #
     with pytest.raises(AuthenticationFailed):
         method.authenticate(username='admin', password='invalid')
+
+
+def test_username_password_authentication_cache(dbm):
+    from tortuga.auth.manager import credential_cache
+    from tortuga.auth.methods import UsernamePasswordAuthenticationMethod
+
+    method = UsernamePasswordAuthenticationMethod()
+
+    credential_cache.clear()
+
+    stats = credential_cache.get_stats()
+
+    #
+    # First authentication is a cache miss, second one is a cache hit
+    #
+    assert method.authenticate(username='admin',
+                               password='password') == 'admin'
+
+    assert method.authenticate(username='admin',
+                               password='password') == 'admin'
+
+    assert credential_cache.hits == stats['hits'] + 1
+    assert credential_cache.misses == stats['misses'] + 1
+
+    #
+    # Failed verifications are never cached
+    #
+    with pytest.raises(AuthenticationFailed):
+        method.authenticate(username='admin', password='invalid')
+
+    assert credential_cache.hits == stats['hits'] + 1
+    assert credential_cache.misses == stats['misses'] + 2
+
+
+def test_username_password_authentication_cache_invalidation(dbm):
+    from tortuga.admin.api import AdminApi
+    from tortuga.auth.methods import UsernamePasswordAuthenticationMethod
+
+    method = UsernamePasswordAuthenticationMethod()
+
+    with dbm.session() as session:
+        AdminApi().addAdmin(session, 'cacheduser', 'password')
+
+    assert method.authenticate(username='cacheduser',
+                               password='password') == 'cacheduser'
+
+    #
+    # Deleting the admin must invalidate both the principal registry and
+    # the cached verification
+    #
+    with dbm.session() as session:
+        AdminApi().deleteAdmin(session, 'cacheduser')
+
+    with pytest.raises(AuthenticationFailed):
+        method.authenticate(username='cacheduser', password='password')
@@ -0,0 +1,115 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import mock
+import pytest
+
+import tortuga.os_utility.osUtility
+from tortuga.config.configManager import ConfigManager
+from tortuga.node.nodeApi import NodeApi
+from tortuga.softwareprofile.softwareProfileManager import \
+    SoftwareProfileManager
+from tortuga.utility.configFragments import PendingAction
+from .osUtilityMock import get_os_object_factory
+
+
+KIT_BASE_PATH = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'kits', 'kit-base')
+
+
+@pytest.fixture()
+def dhcpd_component(monkeypatch, dbm, tmpdir):
+    monkeypatch.setattr(tortuga.os_utility.osUtility, 'getOsObjectFactory',
+                        get_os_object_factory)
+    monkeypatch.setattr(SoftwareProfileManager,
+                        'get_software_profile_metadata',
+                        lambda *args, **kwargs: {})
+    monkeypatch.syspath_prepend(KIT_BASE_PATH)
+
+    from tortuga_kits.base_7_0_1.components.dhcpd.component import \
+        ComponentInstaller
+
+    #
+    # The component is not initialized, as it requires an installed kit
+    #
+    component = ComponentInstaller.__new__(ComponentInstaller)
+    component._config = ConfigManager()
+    component._manager = mock.Mock()
+    component._manager.isConfigured.return_value = True
+    component._manager.updateHosts.return_value = True
+    component._provider = mock.Mock()
+    component._provider.pending_restart = PendingAction(
+        str(tmpdir.join('restart-pending')))
+
+    with dbm.session() as session:
+        component.session = session
+
+        yield component
+
+
+def test_action_add_host(dhcpd_component):
+    #
+    # Nodes are passed to add host actions as returned by
+    # AddHostManager.postAddHost()
+    #
+    nodes = NodeApi().getNodesByAddHostSession(
+        dhcpd_component.session, '1234')
+
+    assert nodes
+
+    dhcpd_component.action_add_host('localiron', 'compute', nodes)
+
+    entries = dhcpd_component._manager.updateHosts.call_args[0][0]
+
+    assert sorted(entry['fqdn'] for entry in entries) == sorted(
+        node.getName() for node in nodes)
+
+    entry = [entry for entry in entries
+             if entry['fqdn'] == 'compute-01.private'][0]
+
+    assert entry == {
+        'ip': '10.2.0.101',
+        'mac': 'FF:00:00:00:00:00:65',
+        'fqdn': 'compute-01.private',
+        'hostname': 'compute-01',
+        'unmanaged': False,
+    }
+
+    dhcpd_component._provider.restart_service.assert_called_once_with()
+
+
+def test_action_delete_host(dhcpd_component):
+    dhcpd_component.action_delete_host(
+        'localiron', 'compute', ['compute-01.private', 'compute-02.private'])
+
+    dhcpd_component._manager.updateHosts.assert_called_once_with(
+        [], remove=['compute-01', 'compute-02'])
+
+    dhcpd_component._provider.restart_service.assert_called_once_with()
+
+
+def test_restart_coalesced(dhcpd_component):
+    dhcpd_component._manager.updateHosts.return_value = False
+
+    # A restart requested by a concurrent operation is performed once
+    dhcpd_component._provider.pending_restart.set()
+
+    dhcpd_component.action_delete_host(
+        'localiron', 'compute', ['compute-01.private'])
+    dhcpd_component.action_delete_host(
+        'localiron', 'compute', ['compute-02.private'])
+
+    dhcpd_component._provider.restart_service.assert_called_once_with()
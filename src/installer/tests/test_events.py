@@ -17,9 +17,9 @@ import pytest
 import time
 
 from tortuga.events.types.base import BaseEvent, BaseEventSchema
+from tortuga.events.types.node import NodeStateChanged
 from tortuga.events.manager import EventStoreManager, PubSubManager
-from tortuga.events.store import ObjectStoreEventStore
-from tortuga.objectstore.redis import RedisObjectStore
+from tortuga.events.store import RedisEventStore
 
 
 class ExampleEventSchema(BaseEventSchema):
@@ -42,8 +42,7 @@ class ExampleEvent(BaseEvent):
 
 @pytest.fixture()
 def event_store(redis):
-    object_store = RedisObjectStore(namespace='events', redis_client=redis)
-    store = ObjectStoreEventStore(object_store=object_store)
+    store = RedisEventStore(redis_client=redis)
     #
     # Manually set the store on te store manager so that all calls to get()
     # return the same instance
@@ -104,6 +103,70 @@ def test_event_list_filter(event_store):
     assert integers == [5, 4]
 
 
+def test_event_list_cursor(event_store):
+    from tortuga.events.store import ObjectStoreEventStore
+
+    assert event_store.supports_cursor
+    assert not ObjectStoreEventStore.supports_cursor
+
+    events_in = [
+        ExampleEvent.fire(integer=i, string='testing') for i in range(7)
+    ]
+
+    #
+    # Ensure that paging through the events using a cursor returns every
+    # event exactly once, in timestamp order
+    #
+    for order_desc in [False, True]:
+        events_out = []
+        cursor = None
+        while True:
+            page = list(event_store.list(order_desc=order_desc, limit=3,
+                                         cursor=cursor))
+            events_out.extend(page)
+            if len(page) < 3:
+                break
+            cursor = event_store.get_cursor(page[-1])
+
+        expected = list(reversed(events_in)) if order_desc else events_in
+        assert events_out == expected
+
+
+def test_event_list_indexes(event_store):
+    ExampleEvent.fire(integer=3, string='testing')
+    node_events = [
+        NodeStateChanged.fire(node={'id': 1, 'name': 'node01',
+                                    'state': 'Installed'},
+                              previous_state='Provisioned'),
+        NodeStateChanged.fire(node={'id': 2, 'name': 'node02',
+                                    'state': 'Installed'},
+                              previous_state='Provisioned'),
+    ]
+
+    #
+    # Ensure that events can be listed by name and node id
+    #
+    assert [evt.id for evt in event_store.list(
+        name='node-state-changed')] == [evt.id for evt in node_events]
+    assert [evt.id for evt in event_store.list(node__id='2')] == \
+        [node_events[1].id]
+
+
+def test_event_retention(event_store, redis):
+    old_event = ExampleEvent.fire(integer=3, string='old')
+    new_event = ExampleEvent.fire(integer=4, string='new')
+
+    #
+    # Ensure that events older than the cutoff are removed from the
+    # store and all of the indexes
+    #
+    assert event_store.trim(new_event.timestamp.timestamp()) == 1
+    assert event_store.get(old_event.id) is None
+    assert [evt.id for evt in event_store.list()] == [new_event.id]
+    assert [evt.id for evt in event_store.list(name='example-event')] == \
+        [new_event.id]
+
+
 def test_event_pubsub(event_store):
     pubsub = PubSubManager.get()
     pubsub.subscribe()
@@ -176,3 +239,220 @@ def test_event_listener(event_store, celery_worker):
     assert 'example-listener' in was_run
     assert 'example-all-listener' in was_run
     assert 'example-none-listener' not in was_run
+
+
+def test_node_provisioning_listener_should_run():
+    from tortuga.events.listeners.node import NodeProvisioningListener
+
+    def change(name, state):
+        return NodeStateChanged(node={'name': name, 'state': state},
+                                previous_state='Installing')
+
+    assert NodeProvisioningListener.should_run(
+        change('node-01', 'Provisioned'))
+    assert not NodeProvisioningListener.should_run(
+        change('node-02', 'Installed'))
+    assert not NodeProvisioningListener.should_run(
+        change(None, 'Provisioned'))
+
+
+def test_node_provisioning_listener_run(dbm, monkeypatch):
+    from tortuga.db.models.node import Node
+    from tortuga.events.listeners.node import NodeProvisioningListener
+    from tortuga.node.nodeManager import NodeManager
+    from tortuga.tasks.celery import app
+
+    from .osUtilityMock import get_os_object_factory
+
+    monkeypatch.setattr(app, 'dbm', dbm)
+    monkeypatch.setattr('tortuga.os_utility.osUtility.getOsObjectFactory',
+                        get_os_object_factory)
+
+    calls = []
+
+    def update_nodes_status(self, session, updates):
+        calls.append(updates)
+
+    monkeypatch.setattr(
+        NodeManager, 'updateNodesStatus', update_nodes_status)
+
+    def change(name):
+        return NodeStateChanged(node={'name': name, 'state': 'Provisioned'},
+                                previous_state='Installing')
+
+    def set_state(names, node_state):
+        with dbm.session() as session:
+            for node in session.query(Node).filter(Node.name.in_(names)):
+                node.state = node_state
+
+            session.commit()
+
+    listener = NodeProvisioningListener(app)
+
+    # compute-01.private is installed; compute-99.private does not exist
+    listener.run_batch_if_required([
+        change('compute-01.private'),
+        change('compute-99.private'),
+    ])
+
+    assert not calls
+
+    unresponsive = ['compute-09.private', 'compute-10.private']
+
+    set_state(unresponsive, 'Provisioned')
+
+    try:
+        listener.run_batch_if_required([
+            change(name) for name in ['compute-01.private'] + unresponsive
+        ])
+    finally:
+        set_state(unresponsive, 'Installed')
+
+    # a single update for all unresponsive nodes
+    assert len(calls) == 1
+    assert sorted(update['name'] for update in calls[0]) == unresponsive
+    assert all(update['state'] == 'Unresponsive' for update in calls[0])
+
+
+@pytest.fixture()
+def dispatch_listeners(monkeypatch):
+    """
+    Registers listeners for ExampleEvent, and records the tasks sent to
+    dispatch events instead of sending them to the broker.
+
+    """
+    from tortuga.events import dispatcher
+    from tortuga.events.listeners.base import BaseListener, EVENT_LISTENERS
+    from tortuga.events.tasks import dispatch_events
+
+    was_run = []
+
+    class RecordingListener(BaseListener):
+        event_types = [ExampleEvent]
+
+        def run(self, event):
+            was_run.append((self.name, event.integer))
+
+    class DispatchListener1(RecordingListener):
+        name = 'dispatch-listener-1'
+
+    class DispatchListener2(RecordingListener):
+        name = 'dispatch-listener-2'
+
+    class DispatchFailingListener(RecordingListener):
+        name = 'dispatch-failing-listener'
+
+        def run(self, event):
+            raise Exception('listener failed')
+
+    class DispatchDelayedListener(RecordingListener):
+        name = 'dispatch-delayed-listener'
+        countdown = 600
+
+    listener_classes = [
+        DispatchListener1, DispatchListener2, DispatchFailingListener,
+        DispatchDelayedListener,
+    ]
+
+    monkeypatch.setattr(
+        dispatcher, 'get_all_listener_classes', lambda: listener_classes)
+
+    sent = []
+
+    monkeypatch.setattr(
+        dispatch_events, 'apply_async',
+        lambda args, **kwargs: sent.append((args[0], kwargs)))
+
+    yield sent, was_run
+
+    for listener_class in listener_classes + [RecordingListener]:
+        EVENT_LISTENERS.pop(listener_class.name, None)
+
+
+def test_event_dispatch(event_store, dispatch_listeners):
+    from tortuga.events.tasks import dispatch_events
+
+    sent, was_run = dispatch_listeners
+
+    ExampleEvent.fire(integer=1, string='testing')
+
+    #
+    # One task per listener countdown, rather than one per listener
+    #
+    assert len(sent) == 2
+
+    tasks = {kwargs.get('countdown'): items for items, kwargs in sent}
+
+    assert [item['listeners'] for item in tasks[None]] == [[
+        'dispatch-listener-1', 'dispatch-listener-2',
+        'dispatch-failing-listener',
+    ]]
+    assert [item['listeners'] for item in tasks[600]] == [[
+        'dispatch-delayed-listener',
+    ]]
+
+    #
+    # Listener errors do not prevent other listeners from running
+    #
+    dispatch_events(tasks[None])
+
+    assert was_run == [
+        ('dispatch-listener-1', 1), ('dispatch-listener-2', 1),
+    ]
+
+
+def test_event_dispatch_batch(event_store, dispatch_listeners):
+    from tortuga.events import dispatcher
+
+    sent, _ = dispatch_listeners
+
+    num_events = 250
+
+    with dispatcher.batch():
+        for idx in range(num_events):
+            ExampleEvent.fire(integer=idx, string='testing')
+
+        assert not sent
+
+    #
+    # The one-task-per-listener path sends a task for each of the 4
+    # listeners of each event; batches send at most MAX_BATCH_SIZE events
+    # per task for each countdown
+    #
+    batches = -(-num_events // dispatcher.MAX_BATCH_SIZE)
+
+    assert len(sent) == 2 * batches
+    assert len(sent) < num_events * 4 / 100
+
+    assert sum(len(items) for items, _ in sent) == 2 * num_events
+
+
+def test_event_dispatch_run_batch(event_store, dispatch_listeners,
+                                  monkeypatch):
+    from tortuga.events import dispatcher
+    from tortuga.events.tasks import _get_listener, dispatch_events
+
+    sent, was_run = dispatch_listeners
+
+    with dispatcher.batch():
+        ExampleEvent.fire(integer=1, string='testing')
+        ExampleEvent.fire(integer=2, string='testing')
+
+    tasks = {kwargs.get('countdown'): items for items, kwargs in sent}
+
+    batches = []
+
+    monkeypatch.setattr(
+        _get_listener('dispatch-listener-1'), 'run_batch',
+        lambda events: batches.append([event.integer for event in events]))
+
+    dispatch_events(tasks[None])
+
+    #
+    # Each listener is run once for all events in the task
+    #
+    assert batches == [[1, 2]]
+
+    assert was_run == [
+        ('dispatch-listener-2', 1), ('dispatch-listener-2', 2),
+    ]
@@ -15,6 +15,7 @@
 import types
 
 from tortuga.objectstore.base import matches_filters
+from tortuga.objectstore.generation import Generation
 from tortuga.objectstore.redis import RedisObjectStore
 
 
@@ -277,3 +278,177 @@ def test_list_filter(redis):
     for k, v in store.list(order_by='number', age__gt=40):
         numbers.append(v['number'])
     assert numbers == [1, 4]
+
+
+def test_set_get_delete_many(redis):
+    store = RedisObjectStore(namespace='test', redis_client=redis)
+
+    store.set_many({'my_key1': data_1, 'my_key2': data_2})
+
+    assert store.get_many(['my_key1', 'my_key2', 'my_key3']) == {
+        'my_key1': data_1,
+        'my_key2': data_2,
+        'my_key3': None,
+    }
+
+    #
+    # Assert that deleted keys are removed from the index
+    #
+    store.delete_many(['my_key1', 'my_key2'])
+
+    assert store.get_many(['my_key1', 'my_key2']) == {
+        'my_key1': None,
+        'my_key2': None,
+    }
+    assert not redis.smembers(store.get_key_name('INDEX'))
+
+
+def test_set_ttl(redis, monkeypatch):
+    from tortuga.objectstore import redis as redis_objectstore
+
+    store = RedisObjectStore(namespace='test', redis_client=redis)
+
+    store.set('my_key1', data_1, ttl=60)
+    store.set('my_key2', data_2)
+
+    assert redis.ttl(store.get_key_name('my_key1')) == 60
+    assert redis.ttl(store.get_key_name('my_key2')) == -1
+
+    #
+    # Nothing is pruned before the object expires
+    #
+    assert store.prune() == 0
+
+    #
+    # Simulate the expiry of the object
+    #
+    now = redis_objectstore.time.time()
+    monkeypatch.setattr(redis_objectstore.time, 'time', lambda: now + 61)
+    redis.delete(store.get_key_name('my_key1'))
+
+    assert [key for key, _ in store.list()] == ['my_key2']
+    assert redis.smembers(store.get_key_name('INDEX')) == [
+        store.get_key_name('my_key2').encode()]
+
+    #
+    # Saving an object without a TTL removes the TTL
+    #
+    store.set('my_key2', data_2, ttl=60)
+    store.set('my_key2', data_2)
+
+    assert redis.ttl(store.get_key_name('my_key2')) == -1
+
+
+def test_list_pages(redis, monkeypatch):
+    store = RedisObjectStore(namespace='test', redis_client=redis)
+
+    monkeypatch.setattr(store, 'PAGE_SIZE', 2)
+
+    store.set_many({
+        'my_key{}'.format(idx): {'number': idx} for idx in range(1, 6)
+    })
+
+    #
+    # Remove an object without updating the index
+    #
+    redis.delete(store.get_key_name('my_key3'))
+
+    pipelines = []
+    pipeline = redis.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipelines.append(kwargs)
+        return pipeline(*args, **kwargs)
+
+    monkeypatch.setattr(redis, 'pipeline', counting_pipeline)
+
+    numbers = [v['number'] for _, v in store.list(order_by='number')]
+    assert numbers == [1, 2, 4, 5]
+
+    #
+    # One round trip per page of objects
+    #
+    assert len([kwargs for kwargs in pipelines
+                if kwargs.get('transaction') is False]) == 3
+
+    #
+    # The key of the missing object is removed from the index
+    #
+    assert len(redis.smembers(store.get_key_name('INDEX'))) == 4
+
+    assert sorted(k for k, _ in store.list()) == [
+        'my_key1', 'my_key2', 'my_key4', 'my_key5']
+
+
+def test_prune_concurrent_set(redis, monkeypatch):
+    from tortuga.objectstore import redis as redis_objectstore
+
+    store = RedisObjectStore(namespace='test', redis_client=redis)
+
+    store.set_many({'my_key1': data_1, 'my_key2': data_2}, ttl=60)
+
+    now = redis_objectstore.time.time()
+    monkeypatch.setattr(redis_objectstore.time, 'time', lambda: now + 61)
+    redis.delete(store.get_key_name('my_key1'),
+                 store.get_key_name('my_key2'))
+
+    #
+    # Save my_key1 again after its existence was checked, but before its
+    # key is removed from the index
+    #
+    exists = redis.exists
+
+    def exists_then_set(key):
+        result = exists(key)
+
+        if key == store.get_key_name('my_key1') and not result:
+            store.set('my_key1', data_1)
+
+        return result
+
+    monkeypatch.setattr(redis, 'exists', exists_then_set)
+
+    assert store.prune() == 1
+
+    assert redis.smembers(store.get_key_name('INDEX')) == [
+        store.get_key_name('my_key1').encode()]
+
+
+def test_generation(redis, monkeypatch):
+    cleared = []
+
+    generation = Generation('test:generation', 'test data',
+                            on_invalidate=lambda: cleared.append(True))
+
+    stamp = generation.get()
+    assert stamp == generation.get()
+
+    # invalidated in another process
+    redis.incr('test:generation')
+    assert generation.get() != stamp
+    assert not cleared
+
+    stamp = generation.get()
+    generation.invalidate()
+    assert generation.get() != stamp
+    assert cleared == [True]
+
+    #
+    # Invalidating without Redis still changes the generation seen by
+    # this process once Redis is back
+    #
+    stamp = generation.get()
+
+    def fail(*args, **kwargs):
+        raise ConnectionError('Redis is down')
+
+    with monkeypatch.context() as m:
+        m.setattr(redis, 'get', fail)
+        m.setattr(redis, 'incr', fail)
+
+        assert generation.get() is None
+
+        generation.invalidate()
+        assert cleared == [True, True]
+
+    assert generation.get() != stamp
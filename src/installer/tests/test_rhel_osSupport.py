@@ -50,3 +50,71 @@ class TestRhelOSSupport:
 
         with pytest.raises(NodeNotFound):
             osSupport._OSSupport__validate_node(node)
+
+    def test_getKickstartFileContents(self, tmpdir, monkeypatch):
+        from types import SimpleNamespace
+
+        from tortuga.db.models.nic import Nic
+        from tortuga.exceptions.parameterNotFound import ParameterNotFound
+
+        osFamilyInfo = OsFamilyInfo('rhel', '7', 'x86_64')
+
+        osSupport = OSSupport(osFamilyInfo)
+
+        monkeypatch.setattr(
+            osSupport._cm, 'getKitConfigBase', lambda: str(tmpdir))
+
+        def getParameter(session, name):
+            if name == 'Timezone_zone':
+                return SimpleNamespace(getValue=lambda: 'America/Toronto')
+
+            raise ParameterNotFound(name)
+
+        monkeypatch.setattr(
+            osSupport._globalParameterDbApi, 'getParameter', getParameter)
+
+        tmpdir.join('kickstart.tmpl').write(
+            '{{ fqdn }} {{ osfamily }} {{ timezone }}')
+
+        with self.dbm.session() as session:
+            node = NodesDbHandler().getNode(session, 'compute-01.private')
+
+            # hardware profile with installer provisioning nic
+            hardwareprofile = SimpleNamespace(
+                nics=session.query(Nic).filter(Nic.ip == '10.2.0.1').all())
+
+            context = osSupport.get_kickstart_context(
+                session, hardwareprofile, node.softwareprofile)
+
+            assert context['timezone'] == 'America/Toronto'
+
+            assert osSupport.getKickstartFileContents(
+                session, node, hardwareprofile, node.softwareprofile,
+                context=context) == \
+                'compute-01.private rhel America/Toronto'
+
+            assert osSupport.getKickstartFileContents(
+                session, node, hardwareprofile, node.softwareprofile) == \
+                'compute-01.private rhel America/Toronto'
+
+
+def test_get_template(tmpdir):
+    import os
+
+    from tortuga.os.osSupportBase import get_template
+
+    path = tmpdir.join('kickstart.tmpl')
+    path.write('{{ value }}')
+
+    template = get_template(str(path))
+
+    assert template.render(value=1) == '1'
+
+    # compiled template is cached
+    assert get_template(str(path)) is template
+
+    # and recompiled when the file is modified
+    path.write('value: {{ value }}')
+    os.utime(str(path), (0, 0))
+
+    assert get_template(str(path)).render(value=1) == 'value: 1'
@@ -0,0 +1,69 @@
+# Copyright 2008-2018 Univa Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+
+import pytest
+
+from tortuga.web_service.websocket.broadcaster import EventBroadcaster
+from tortuga.web_service.websocket.state import State
+from .test_events import ExampleEvent, event_store  # noqa pylint: disable=unused-import
+
+
+@pytest.fixture()
+def broadcaster(event_store):  # pylint: disable=redefined-outer-name
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    broadcaster = EventBroadcaster(loop)
+    broadcaster.start()
+
+    yield broadcaster
+
+    broadcaster.stop()
+    loop.close()
+    asyncio.set_event_loop(None)
+
+
+def test_event_broadcast_latency(broadcaster):  # pylint: disable=redefined-outer-name
+    #
+    # Ensure that a fired event is pushed to every subscribed session,
+    # well within the interval the sessions used to poll for events
+    #
+    loop = asyncio.get_event_loop()
+
+    states = [State(broadcaster=broadcaster) for _ in range(500)]
+    for state in states:
+        state.subscribe()
+
+    unsubscribed = State(broadcaster=broadcaster)
+    unsubscribed.subscribe()
+    unsubscribed.unsubscribe()
+
+    async def receive(state: State, fired: float):
+        msg = await state.next_message(timeout=5)
+        return msg, time.monotonic() - fired
+
+    fired = time.monotonic()
+    event = ExampleEvent.fire(integer=1, string='latency')
+
+    results = loop.run_until_complete(
+        asyncio.gather(*[receive(state, fired) for state in states]))
+
+    assert all(msg.id == event.id for msg, _ in results)
+    assert max(latency for _, latency in results) < 0.5
+
+    with pytest.raises(asyncio.TimeoutError):
+        loop.run_until_complete(unsubscribed.next_message(timeout=0.1))
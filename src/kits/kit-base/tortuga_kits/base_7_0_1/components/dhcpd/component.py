@@ -20,16 +20,23 @@ from logging import getLogger
 
 from tortuga.config.configManager import ConfigManager
 from tortuga.db.globalParameterDbApi import GlobalParameterDbApi
+from tortuga.db.models.node import Node
 from tortuga.db.networksDbHandler import NetworksDbHandler
 from tortuga.exceptions.nicNotFound import NicNotFound
 from tortuga.exceptions.parameterNotFound import ParameterNotFound
 from tortuga.kit.installer import ComponentInstallerBase
 from tortuga.os_utility.osUtility import getOsObjectFactory
 from tortuga.node.nodeApi import NodeApi
+from tortuga.utility.configFragments import PendingAction
 
 
 logger = getLogger(__name__)
 
+#
+# Number of node names per query when looking up nodes
+#
+NODE_NAME_BATCH_SIZE = 500
+
 
 class DhcpProvider(object):
     """
@@ -100,6 +107,14 @@ class DhcpdDhcpProvider(DhcpProvider):
         self._service_name = 'dhcpd'
         super().__init__(component_installer)
 
+        #
+        # Restarts requested by concurrent add/delete host operations are
+        # coalesced: whichever operation finishes first restarts dhcpd
+        # for all of them
+        #
+        self.pending_restart = PendingAction(
+            '/var/lib/tortuga/dhcpd/restart-pending')
+
     def write(self):
         """
         :returns: None
@@ -253,22 +268,7 @@ class ComponentInstaller(ComponentInstallerBase):
             else:
                 subnet['gateway'] = network.gateway
 
-            for nic in self._get_local_nics(network.nics):
-                node = nic.node
-                if node.hardwareprofile.location != 'local' \
-                        or node.state == 'Deleted' \
-                        or node.name == self._config.getInstaller():
-                    continue
-
-                node = {
-                    'ip': nic.ip,
-                    'mac': nic.mac,
-                    'fqdn': node.name,
-                    'hostname': node.name.split('.', 1)[0],
-                    'unmanaged': False
-                }
-
-                subnet['nodes'].append(node)
+            subnet['nodes'] = self._get_host_entries(network.nics)
 
             subnet_address = ipaddress.IPv4Network('{}/{}'.format(
                 network.address,
@@ -279,6 +279,53 @@ class ComponentInstaller(ComponentInstallerBase):
 
         return subnets
 
+    def _get_host_entries(self, nics):
+        """
+        DHCP host entries for the local, provisioning nics of nodes.
+
+        :param nics: List nics
+        :returns: List Dictionary
+        """
+        entries = []
+
+        for nic in self._get_local_nics(nics):
+            node = nic.node
+            if node.hardwareprofile.location != 'local' \
+                    or node.state == 'Deleted' \
+                    or node.name == self._config.getInstaller():
+                continue
+
+            entries.append({
+                'ip': nic.ip,
+                'mac': nic.mac,
+                'fqdn': node.name,
+                'hostname': node.name.split('.', 1)[0],
+                'unmanaged': False
+            })
+
+        return entries
+
+    def _get_db_nodes(self, nodes):
+        """
+        Get the database records of nodes.
+
+        :param nodes: List node names, or Node objects
+        :returns: List Node records
+        """
+        names = [
+            node if isinstance(node, str) else
+            node.getName() if hasattr(node, 'getName') else node.name
+            for node in nodes
+        ]
+
+        db_nodes = []
+
+        for idx in range(0, len(names), NODE_NAME_BATCH_SIZE):
+            db_nodes.extend(self.session.query(Node).filter(
+                Node.name.in_(names[idx:idx + NODE_NAME_BATCH_SIZE])))
+
+        return db_nodes
+
     @property
     def _get_kit_settings_dictionary(self):
         """
@@ -343,7 +390,7 @@ class ComponentInstaller(ComponentInstallerBase):
 
         installer_node = NodeApi().getInstallerNode(self.session)
 
-        self._manager.configure(
+        return self._manager.configure(
             dhcp_lease_time,
             dns_zone,
             self._get_provisioning_nics_ip(installer_node),
@@ -369,27 +416,67 @@ class ComponentInstaller(ComponentInstallerBase):
         """
         Triggerd at add host.
 
+        Only the host entries of the added nodes are written; dhcpd is
+        restarted if they changed, unless a concurrent operation already
+        restarted it.
+
+        :param nodes: List Node objects
+
         :returns: None
         """
-        self.action_configure(
-            software_profile_name,
-            None,
-            args,
-            kwargs,
-            bUpdateSysconfig=False
-        )
+        if not self._manager.isConfigured():
+            changed = self.action_configure(
+                software_profile_name,
+                None,
+                args,
+                kwargs,
+                bUpdateSysconfig=False
+            )
+        else:
+            changed = self._manager.updateHosts(
+                self._get_host_entries(
+                    [nic
+                     for node in self._get_db_nodes(nodes)
+                     for nic in node.nics
+                     if nic.network and nic.network.type == 'provision']
+                )
+            )
+
+        if changed:
+            self._provider.pending_restart.set()
+
+        self._provider.pending_restart.run(self._provider.restart_service)
 
     def action_delete_host(self, hardware_profile_name, software_profile_name,
                            nodes, *args, **kwargs):
         """
         Triggered delete host.
 
+        Only the host entries of the deleted nodes are removed; dhcpd is
+        restarted if they changed, unless a concurrent operation already
+        restarted it.
+
         :returns: None
         """
-        self.action_configure(
-            software_profile_name,
-            None,
-            args,
-            kwargs,
-            bUpdateSysconfig=False
-        )
+        if not self._manager.isConfigured():
+            changed = self.action_configure(
+                software_profile_name,
+                None,
+                args,
+                kwargs,
+                bUpdateSysconfig=False
+            )
+        else:
+            changed = self._manager.updateHosts(
+                [],
+                remove=[
+                    (node if isinstance(node, str) else node.name).split(
+                        '.', 1)[0]
+                    for node in nodes
+                ]
+            )
+
+        if changed:
+            self._provider.pending_restart.set()
+
+        self._provider.pending_restart.run(self._provider.restart_service)
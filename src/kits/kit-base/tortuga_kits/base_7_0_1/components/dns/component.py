@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 from logging import getLogger
 
 from jinja2 import Template
@@ -22,6 +23,8 @@ from tortuga.os_utility.osUtility import getOsObjectFactory
 from tortuga.db.globalParameterDbApi import GlobalParameterDbApi
 from tortuga.kit.installer import ComponentInstallerBase
 from tortuga.exceptions.parameterNotFound import ParameterNotFound
+from tortuga.utility.configFragments import ConfigFragments, \
+    PendingAction, write_file_atomic
 
 
 logger = getLogger(__name__)
@@ -32,12 +35,10 @@ DNSMASQ_CONFIG_TEMPLATE = """
 
 domain={{ domain }}
 local=/{{ domain }}/
-
-{% for host_record in host_records %}
-host-record={{ host_record.hostname }},{{ host_record.ip }}
-{% endfor %}
 """
 
+DNSMASQ_HOST_RECORD_TEMPLATE = 'host-record={hostname},{ip}\n'
+
 
 class DnsProvider(object):
     """
@@ -84,6 +85,23 @@ class DnsmasqDnsProvider(DnsProvider):
         self._service_handle = getOsObjectFactory().getOsServiceManager()
         self._service_name = 'dnsmasq'
 
+        #
+        # Host records are maintained as one fragment per host name,
+        # included by a separate configuration file, so adding or
+        # removing a host does not require regenerating all records
+        #
+        self._host_records = ConfigFragments(
+            '/var/lib/tortuga/dnsmasq/hosts.d',
+            '/etc/dnsmasq.d/tortuga-dns-hosts.conf',
+            'conf-file={}\n'
+        )
+
+        #
+        # Restarts are deferred until the end of an add host batch
+        #
+        self.pending_restart = PendingAction(
+            '/var/lib/tortuga/dnsmasq/restart-pending')
+
     def _add_a_record(self, name, ip):
         """
         Add A record type.
@@ -150,22 +168,65 @@ class DnsmasqDnsProvider(DnsProvider):
                 'Record type {} is not implemented'.format(record_type)
             )
 
+    def _get_host_record_fragments(self):
+        """
+        Render host records, grouped by host name.
+
+        :returns: Dictionary of host name and rendered records
+        """
+        fragments = {}
+
+        for host_record in self.host_records:
+            fragments[host_record['hostname']] = \
+                fragments.get(host_record['hostname'], '') + \
+                DNSMASQ_HOST_RECORD_TEMPLATE.format(**host_record)
+
+        return fragments
+
+    def is_configured(self):
+        """
+        Check whether the host records have been written before.
+
+        :returns: Boolean
+        """
+        return os.path.exists(self._host_records.path)
+
     def write(self):
         """
         Write the complete config file out.
 
-        :returns: None
+        :returns: Boolean True if the configuration changed
         """
         template = Template(DNSMASQ_CONFIG_TEMPLATE)
 
         context = {
             'domain': self.private_dns_zone,
-            'host_records': self.host_records
         }
 
         rendered = template.render(context)
-        with open('/etc/dnsmasq.d/tortuga-dns.conf', 'w') as fp:
-            fp.write(rendered)
+        changed = write_file_atomic(
+            '/etc/dnsmasq.d/tortuga-dns.conf', rendered)
+
+        changed |= self._host_records.update(
+            self._get_host_record_fragments(), replace_all=True)
+
+        return changed
+
+    def update(self, remove=None):
+        """
+        Write the records added since the last write and remove the
+        records of the specified hosts, leaving all other records as they
+        are.
+
+        :param remove: List of host names
+        :returns: Boolean True if the configuration changed
+        """
+        changed = self._host_records.update(
+            self._get_host_record_fragments(), remove=remove)
+
+        self.host_records = []
+
+        return changed
 
 
 class ComponentInstaller(ComponentInstallerBase):
@@ -346,15 +407,50 @@ class ComponentInstaller(ComponentInstallerBase):
 
         :returns: None
         """
-        self.action_configure(None)
-        self.provider.add_record(hostname, ip)
-        self.provider.write()
-        self.provider.restart_service()
+        if not self.provider.is_configured():
+            self.action_configure(None)
+            self.provider.add_record(hostname, ip)
+            changed = self.provider.write()
+        else:
+            self.provider.add_record(hostname, ip)
+            changed = self.provider.update()
+
+        #
+        # Restart once, after all hosts in the batch have been added
+        #
+        if changed:
+            self.provider.pending_restart.set()
+
+    def action_add_host(self, hardware_profile_name, software_profile_name,
+                        nodes, *args, **kwargs):
+        """
+        Called after hosts are added.
+
+        :param hardware_profile_name: String hardware profile name
+        :param software_profile_name: String software profile name
+        :param nodes: List Objects
+
+        :returns: None
+        """
+        self.provider.pending_restart.run(self.provider.restart_service)
+
+    def action_abort_add_host(self, hardware_profile_name,
+                              software_profile_name, *args, **kwargs):
+        """
+        Called when adding hosts failed, or ended without calling
+        action_add_host().
+
+        :param hardware_profile_name: String hardware profile name
+        :param software_profile_name: String software profile name
+
+        :returns: None
+        """
+        self.provider.pending_restart.run(self.provider.restart_service)
 
     def action_delete_host(self, hardware_profile_name,
                            software_profile_name, nodes, *args, **kwargs):
         """
-        Called before hosts are added.
+        Called after hosts are deleted.
 
         :param hardware_profile_name: String hardware profile name
         :param software_profile_name: String software profile name
@@ -362,6 +458,15 @@ class ComponentInstaller(ComponentInstallerBase):
 
         :returns: None
         """
-        self.action_configure(None)
-        self.provider.write()
-        self.provider.restart_service()
+        if not self.provider.is_configured():
+            self.action_configure(None)
+            changed = self.provider.write()
+        else:
+            changed = self.provider.update(
+                remove=[node if isinstance(node, str) else node.name
+                        for node in nodes])
+
+        if changed:
+            self.provider.pending_restart.set()
+
+        self.provider.pending_restart.run(self.provider.restart_service)
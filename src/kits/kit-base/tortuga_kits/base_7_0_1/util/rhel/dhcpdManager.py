@@ -13,6 +13,7 @@
 # limitations under the License.
 # pylint: disable=no-member
 
+import io
 import os
 import shutil
 import platform
@@ -20,6 +21,8 @@ from jinja2 import Template
 
 from tortuga.os_objects.osObjectManager import OsObjectManager
 from tortuga.os_utility.osUtility import getNativeOsFamilyInfo
+from tortuga.utility.configFragments import ConfigFragments, \
+    write_file_atomic
 
 
 class DhcpdManager(OsObjectManager):
@@ -50,11 +53,48 @@ class DhcpdManager(OsObjectManager):
         # RHEL 6.x
         return '/etc/dhcp/dhcpd.conf'
 
+    def getHostsFileName(self):
+        # Host entries are kept in per-host fragments, included by a
+        # separate file, which is included by the DHCP configuration file
+        return os.path.join(
+            os.path.dirname(self.getConfigFileName()), 'tortuga-hosts.conf')
+
+    def _getHostFragments(self):
+        return ConfigFragments(
+            self.getHostsFileName()[:-len('.conf')] + '.d',
+            self.getHostsFileName(),
+            'include "{}";\n')
+
+    def isConfigured(self):
+        """ Check whether the host entries have been written before. """
+        return os.path.exists(self.getHostsFileName())
+
+    def updateHosts(self, nodes, remove=None, replace_all=False):
+        '''
+        Write the host entries for the specified nodes and remove the
+        entries of the specified host names, leaving all other host
+        entries as they are.
+
+        Returns True if the host entries changed.
+        '''
+
+        fragments = {}
+
+        for node in nodes:
+            fragments[node['hostname']] = \
+                fragments.get(node['hostname'], '') + \
+                self._createDhcpNodeEntry(node)
+
+        return self._getHostFragments().update(
+            fragments, remove=remove, replace_all=replace_all)
+
     def configure(self, leaseTime, dnsDomain, dnsServers, dhcpSubnets,
                   installerNode, bUpdateSysconfig=False,
                   kit_settings=None):
         '''
         Invoked on the Installer Node to (re)configure the component
+
+        Returns True if the configuration changed.
         '''
 
         kit_settings = kit_settings or {}
@@ -72,7 +112,7 @@ class DhcpdManager(OsObjectManager):
 
         self._logger.debug('Writing [%s]' % (filename))
 
-        with open(filename, 'w') as fd:
+        with io.StringIO() as fd:
             # Write the header created from template
             with open('/opt/tortuga/config/dhcpd.conf.tmpl') as fp:
                 tmpl = fp.read()
@@ -116,13 +156,22 @@ subnet %(network)s netmask %(netmask)s {
 
                 fd.write('}\n')
 
-                # Generate host entries for each node in the subnet
-                for node in dhcpSubnet['nodes']:
-                    fd.write(self._createDhcpNodeEntry(node))
+            fd.write('\ninclude "%s";\n' % (self.getHostsFileName()))
+
+            # Generate host entries for all nodes
+            changed = self.updateHosts(
+                [node
+                 for dhcpSubnet in dhcpSubnets.values()
+                 for node in dhcpSubnet['nodes']],
+                replace_all=True)
+
+            changed |= write_file_atomic(filename, fd.getvalue())
 
         if bUpdateSysconfig:
             self.__updateSysconfig(installerNode)
 
+        return changed
+
     def _getDnsServerForNetwork(self, network, dnsServers): \
             # pylint: disable=no-self-use
         for dnsServer in dnsServers: